@@ -50,6 +50,13 @@ IF %ERRORLEVEL% NEQ 0 (
     exit /b %ERRORLEVEL%
 )
 
+REM Install pandas (for TTX_Log_Analyzer.py)
+pip install pandas
+IF %ERRORLEVEL% NEQ 0 (
+    echo Failed to install pandas
+    exit /b %ERRORLEVEL%
+)
+
 REM Find the Python installation path
 FOR /F "tokens=2 delims=:" %%I IN ('pip show pyserial ^| findstr "Location"') DO SET PyLocation=%%I
 SET PyLocation=%PyLocation:~1%
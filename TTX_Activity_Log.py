@@ -0,0 +1,109 @@
+import collections
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+from TTX_Telemetry import DEFAULT_LOG_DIR, safe_file_name
+
+_logger_ids = itertools.count()
+
+
+def activity_log_path(log_dir=DEFAULT_LOG_DIR, chamber_name=None):
+    """Build the logs/activity[_<chamber>].log path, creating the directory if needed"""
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+    if chamber_name:
+        return os.path.join(log_dir, f"activity_{safe_file_name(chamber_name)}.log")
+    return os.path.join(log_dir, "activity.log")
+
+
+class ActivityLog:
+    """Activity Log lines with flat memory and redraw cost however long a run lasts
+
+    add() may be called from any thread. The newest max_lines lines are kept
+    in a ring; the text widget is only touched from the Tk thread, which
+    inserts whatever arrived since the last tick as one batch and trims the
+    widget back to max_lines. The full history goes to a rotating file,
+    written by a background listener so callers never wait on the disk.
+    """
+
+    def __init__(self, path=None, max_lines=1000, max_bytes=5 * 1024 * 1024, backup_count=5,
+                 echo=True, echo_prefix=None):
+        self.max_lines = max_lines
+        self.lines = collections.deque(maxlen=max_lines)
+        self.echo = echo
+        self.echo_prefix = echo_prefix  # e.g. "[Oven A] " for console output
+        self._pending = collections.deque(maxlen=max_lines)  # Not yet shown in the widget
+        self._lock = threading.Lock()
+        self._widget = None
+        self._root = None
+        self._interval_ms = 250
+        self._after_id = None
+        self.path = path
+        self._listener = None
+        self._logger = None
+        self._file_handler = None
+        if path:
+            self._file_handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            self._file_handler.setFormatter(logging.Formatter("%(message)s"))
+            log_queue = queue.Queue()
+            self._logger = logging.getLogger(f"TTX.activity.{next(_logger_ids)}")
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+            self._logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            self._listener = logging.handlers.QueueListener(log_queue, self._file_handler)
+            self._listener.start()
+
+    def add(self, line, console_text=None):
+        """Record one line (without trailing newline); console_text overrides what is echoed"""
+        with self._lock:
+            self.lines.append(line)
+            self._pending.append(line)
+        logger = self._logger  # Cleared by close() on another thread
+        if logger is not None:
+            logger.info(line)
+        if self.echo:
+            print(f"{self.echo_prefix or ''}{console_text if console_text is not None else line}")
+
+    def attach(self, root, widget, interval_ms=250):
+        """Start showing lines in a Text widget, refreshed every interval_ms on the Tk thread"""
+        self._root = root
+        self._widget = widget
+        self._interval_ms = interval_ms
+        self._drain()
+
+    def _drain(self):
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if batch:
+            try:
+                self._widget.insert("end", "".join(line + "\n" for line in batch))
+                # The widget always ends with an empty line after the last newline
+                excess = int(self._widget.index("end-1c").split(".")[0]) - 1 - self.max_lines
+                if excess > 0:
+                    self._widget.delete("1.0", f"{excess + 1}.0")
+                self._widget.see("end")
+            except Exception:
+                return  # Widget destroyed while closing
+        self._after_id = self._root.after(self._interval_ms, self._drain)
+
+    def close(self):
+        """Stop the widget refresh and finish writing the history file"""
+        if self._after_id is not None and self._root is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._listener is not None:
+            self._listener.stop()  # Writes out everything still queued
+            self._listener = None
+            for handler in self._logger.handlers[:]:
+                self._logger.removeHandler(handler)
+            self._logger = None
+            self._file_handler.close()
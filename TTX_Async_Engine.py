@@ -0,0 +1,601 @@
+import argparse
+import asyncio
+import signal
+
+try:
+    import pyvisa
+    VISA_ERRORS = (pyvisa.errors.VisaIOError, pyvisa.errors.InvalidSession)
+except ImportError:  # Only the simulated chamber is available without pyvisa
+    pyvisa = None
+    VISA_ERRORS = ()
+
+from TTX_Chamber_Config import DEFAULT_CHAMBER_RESOURCE, load_chamber_configs
+from TTX_Chamber_Sim import SimulatedResourceManager, add_simulation_arguments, resource_manager_from_args
+from TTX_Clock import SystemClock, add_clock_arguments, clock_from_args
+from TTX_Instrument_Bus import InstrumentBus
+from TTX_Pacing import PacingStore
+from TTX_Profile import CycleProfile, ProfileError, RAMP, DWELL, load_profile
+from TTX_Ramp import RampController, add_ramp_arguments, ramp_options_from_args
+from TTX_Registers import REG_PROCESS_VALUE, REG_SETPOINT, REG_DECIMAL, REG_ON_OFF, CHAMBER_MIN_TEMP, CHAMBER_MAX_TEMP
+from TTX_Run_State import RunState
+from TTX_Setpoint_Boost import SetpointBoost, add_boost_arguments, boost_options_from_args
+from TTX_Steady_State import SteadyStateDetector, add_steady_state_arguments, steady_state_options_from_args
+from TTX_Telemetry import TelemetryWriter, add_telemetry_arguments, new_log_path, telemetry_options_from_args
+
+
+class CyclingError(Exception):
+    """Raised when a chamber cannot continue its cycle plan"""
+
+
+class AsyncChamber:
+    """One chamber session driven from the event loop
+
+    VISA calls block, so they never run on the loop: every transaction is
+    queued on the shared InstrumentBus thread (which acts as the I/O executor
+    and keeps the learned pacing) and awaited through asyncio.wrap_future.
+    """
+
+    def __init__(self, name, resource_name, resource_manager, bus, clock, pacing_store,
+                 retry_count=3, gpib_timeout=5000):
+        self.name = name
+        self.resource_name = resource_name
+        self.rm = resource_manager
+        self.bus = bus
+        self.clock = clock
+        self.retry_count = retry_count
+        self.gpib_timeout = gpib_timeout
+        self.session = None
+        self.decimal = 1
+        simulated = isinstance(resource_manager, SimulatedResourceManager)
+        self.pacing_store = pacing_store
+        self.pacing_key = ("SIM:" if simulated else "") + resource_name
+        self.pacer = pacing_store.load(self.pacing_key, clock=clock)
+        self.channel = bus.attach(lambda: self.session, resource_name, self.pacer)
+        self.last_read_time = clock.monotonic()  # Last successful temperature read, for the watchdog
+
+    def log(self, message):
+        print(f"[{self.clock.now().strftime('%H:%M:%S')}] [{self.name}] {message}")
+
+    def _open(self):
+        self.session = self.rm.open_resource(self.resource_name)
+        self.session.timeout = self.gpib_timeout
+        self.session.read_termination = '\n'
+        self.session.write_termination = '\n'
+
+    def _close(self):
+        if self.session is not None:
+            try:
+                self.session.close()
+            except Exception:
+                pass
+            self.session = None
+
+    async def _run(self, future):
+        return await asyncio.wrap_future(future)
+
+    async def connect(self):
+        """Open the session and read the chamber's decimal setting"""
+        await self._run(self.bus.submit(self._open))
+        device_id = await self.query("*IDN?")
+        if not device_id:
+            raise CyclingError(f"No response from {self.resource_name}")
+        self.log(f"Connected to: {device_id}")
+        decimal_response = await self.query(f"R? {REG_DECIMAL}, 1")
+        try:
+            self.decimal = int(decimal_response)
+        except ValueError:
+            self.log("Failed to read decimal configuration. Using default value 1")
+            self.decimal = 1
+
+    async def reconnect(self):
+        """Close and reopen the session through the bus"""
+        self.log("Attempting to reconnect...")
+        await self._run(self.bus.submit(self._close))
+        await self.clock.asleep(3)
+        try:
+            await self.connect()
+        except (CyclingError, OSError) + VISA_ERRORS as e:
+            self.log(f"Reconnection failed: {e}")
+            return False
+        self.log("Reconnected")
+        return True
+
+    async def disconnect(self):
+        await self._run(self.bus.submit(self._close))
+        try:
+            self.pacing_store.save(self.pacing_key, self.pacer)
+        except OSError as e:
+            self.log(f"Could not save pacing profile: {e}")
+
+    async def query(self, cmd, priority=None):
+        """Query with retries; returns the stripped reply or "" """
+        for attempt in range(self.retry_count):
+            try:
+                ret = await self._run(self.channel.query(cmd, priority))
+                if ret is not None and ret.strip() != "":
+                    return ret.strip()
+                if attempt < self.retry_count - 1:
+                    self.log(f"Empty response for '{cmd}', retry {attempt + 1}/{self.retry_count}")
+            except VISA_ERRORS as e:
+                self.log(f"GPIB error for '{cmd}', retry {attempt + 1}/{self.retry_count}: {e}")
+            if attempt < self.retry_count - 1:
+                await self.clock.asleep(self.pacer.retry_delay(attempt))
+        return ""
+
+    async def write(self, cmd, priority=None):
+        """Write with retries; returns True on success"""
+        for attempt in range(self.retry_count):
+            try:
+                await self._run(self.channel.write(cmd, priority))
+                return True
+            except VISA_ERRORS as e:
+                self.log(f"GPIB write error for '{cmd}', retry {attempt + 1}/{self.retry_count}: {e}")
+            if attempt < self.retry_count - 1:
+                await self.clock.asleep(self.pacer.retry_delay(attempt))
+        return False
+
+    async def read_temp(self):
+        response = await self.query(f"R? {REG_PROCESS_VALUE}, 1")
+        try:
+            value = int(response) / (10 ** self.decimal)
+        except ValueError:
+            return None
+        self.last_read_time = self.clock.monotonic()
+        return value
+
+    async def write_temp(self, value):
+        return await self.write(f"W {REG_SETPOINT}, {int(value * (10 ** self.decimal))}")
+
+    async def write_temp_confirmed(self, value):
+        """Write a setpoint and read it back; True when the chamber holds exactly that value"""
+        raw = int(value * (10 ** self.decimal))
+        if not await self.write(f"W {REG_SETPOINT}, {raw}"):
+            return False
+        try:
+            return int(await self.query(f"R? {REG_SETPOINT}, 1")) == raw
+        except ValueError:
+            return False
+
+    async def set_chamber_on(self, on):
+        return await self.write(f"W {REG_ON_OFF}, {1 if on else 0}")
+
+
+class AsyncCycler:
+    """The low/high cycling state machine for one chamber as a coroutine
+
+    This is a separate, limited-scope engine rather than a front end for
+    CycleEngine: it has its own simple versions of the stabilize, boost,
+    ramp and dwell steps, and no checkpoints or resume, sampler, thermal
+    model, finish forecast, metrics, tracing or live telemetry server.
+    CycleEngine is the reference behaviour; changes to its steps are not
+    picked up here. The cycle plan is checked against the chamber limits
+    when the cycler is built (ProfileError). Stopping is plain task
+    cancellation; the chamber is always turned off on
+    the way out, even when the cancel arrives mid-transaction.
+    """
+
+    def __init__(self, chamber, low_temp=32, high_temp=140, hold_seconds=600, tolerance=2.5,
+                 read_interval=5, max_cycles=None, telemetry=None, max_failures=3, stabilization_options=None,
+                 boost_options=None, cycle_profile=None, ramp_options=None, min_temp=CHAMBER_MIN_TEMP,
+                 max_temp=CHAMBER_MAX_TEMP, max_ramp_rate=None):
+        self.chamber = chamber
+        self.clock = chamber.clock
+        self.low_temp = low_temp
+        self.high_temp = high_temp
+        self.hold_seconds = hold_seconds
+        self.tolerance = tolerance
+        self.read_interval = read_interval
+        self.max_cycles = max_cycles
+        self.telemetry = telemetry  # asyncio.Queue of (chamber name, row)
+        self.max_failures = max_failures
+        stabilization_options = stabilization_options or {}
+        self.early_settle = stabilization_options.get("early_settle", False)
+        self.settle_min_hold = stabilization_options.get("min_hold_seconds", 60)
+        self.detector_options = stabilization_options.get("detector", {})
+        boost_options = dict(boost_options or {})
+        self.boost_enabled = boost_options.pop("enabled", False)
+        self.setpoint_boost = SetpointBoost(min_temp=min_temp, max_temp=max_temp, **boost_options)
+        # Without a profile the cycle is a soak at low_temp, then at high_temp
+        self.cycle_profile = cycle_profile or CycleProfile.two_point(low_temp, high_temp)
+        self.cycle_profile.validate(min_temp, max_temp, max_ramp_rate)
+        ramp_options = ramp_options or {}
+        self.ramp_step_seconds = ramp_options.get("step_seconds", 5.0)
+        self.ramp_max_lead = ramp_options.get("max_lead", 20.0)
+        self.ramp_results = []  # (cycle number, RampResult)
+        self.run_state = RunState()
+        self.error = None
+        self.heating_times = []
+        self.cooling_times = []
+
+    def record(self, event=""):
+        if self.telemetry is None:
+            return
+        row = self.run_state.csv_row(self.clock.now().strftime("%Y-%m-%d %H:%M:%S"), event=event)
+        self.telemetry.put_nowait((self.chamber.name, row))
+
+    async def run(self):
+        state = self.run_state
+        state.update(status="Running")
+        try:
+            if not await self.chamber.set_chamber_on(True):
+                raise CyclingError("Failed to turn chamber on")
+            self.record("Chamber On")
+            await self.clock.asleep(2)
+            state.update(current_temp=await self.chamber.read_temp())
+            repeat = self.cycle_profile.repeat
+            while ((self.max_cycles is None or state.cycle_count < self.max_cycles)
+                   and (repeat is None or state.cycle_count < repeat)):
+                for step in self.cycle_profile.steps:
+                    await self.run_step(step)
+                # A full pass through the profile is one cycle
+                state.update(cycle_count=state.cycle_count + 1)
+                self.chamber.log(f"=== COMPLETED CYCLE #{state.cycle_count} ===")
+                self.record(f"Cycle {state.cycle_count} Complete")
+            state.update(status="Completed")
+        except asyncio.CancelledError:
+            state.update(status="Stopped")
+            raise
+        except CyclingError as e:
+            state.update(status="Failed")
+            self.error = str(e)
+            self.chamber.log(f"Cycling failed: {e}")
+        finally:
+            state.update(phase="Idle", hold_elapsed=None)
+            # Shielded so a second cancel cannot skip turning the chamber off
+            off = await asyncio.shield(self.chamber.set_chamber_on(False))
+            self.chamber.log("Chamber turned off." if off else "Warning: Could not confirm chamber was turned off.")
+            self.record("Chamber Off")
+            self.chamber.log(f"Final cycle count: {state.cycle_count}")
+
+    async def run_step(self, step):
+        """Run one profile step"""
+        if step.kind == RAMP:
+            await self.ramp(step.temp, step.rate)
+        elif step.kind == DWELL:
+            await self.dwell(step.temp, step.hold_seconds)
+        else:
+            await self.transition(step.temp, step.hold_seconds)
+
+    async def dwell(self, target, seconds):
+        """Set target and wait a fixed time, reached or not"""
+        self.chamber.log(f"--- Dwelling at {target}°F for {seconds / 60:.1f} minutes ---")
+        if not await self.chamber.write_temp(target):
+            raise CyclingError("Failed to set temperature")
+        self.run_state.update(target=target, phase="Dwell", hold_elapsed=0.0, hold_time=seconds)
+        self.record("Setpoint Change")
+        start = self.clock.time()
+        while self.clock.time() - start < seconds:
+            await self.clock.asleep(min(self.read_interval, seconds - (self.clock.time() - start)))
+            temp = await self.chamber.read_temp()
+            self.run_state.update(hold_elapsed=self.clock.time() - start,
+                                  **({"current_temp": temp} if temp is not None else {}))
+            self.record()
+
+    async def ramp(self, target, rate):
+        """Stream setpoints along a line at rate °F/min, leading it by the chamber's measured lag"""
+        state = self.run_state
+        start_temp = state.current_temp if state.current_temp is not None else state.target
+        if start_temp is None:
+            raise CyclingError("Cannot start ramp without a temperature reading")
+        ramp = RampController(start_temp, target, rate, self.clock.time(), max_lead=self.ramp_max_lead)
+        self.chamber.log(f"--- Ramping from {start_temp:.1f}°F to {target}°F at {rate}°F/min ---")
+        state.update(target=target, phase="Ramp", hold_elapsed=None)
+        setpoint = None  # Last confirmed setpoint
+        failures = 0
+        finish_by = None
+        while True:
+            now = self.clock.time()
+            temp = await self.chamber.read_temp()
+            if temp is not None:
+                state.update(current_temp=temp)
+                ramp.add_sample(now, temp)
+            value = ramp.setpoint(now)
+            if value != setpoint:
+                if await self.chamber.write_temp_confirmed(value):
+                    setpoint = value
+                    failures = 0
+                else:
+                    failures += 1
+                    self.chamber.log(f"Ramp setpoint {value:.1f}°F not confirmed, attempt {failures}/{self.max_failures}")
+                    if failures >= self.max_failures:
+                        raise CyclingError("Ramp setpoint not confirmed")
+            self.record()
+            # Done once the target setpoint is confirmed and the chamber has covered
+            # 90% of the span, or has had as long again as the ramp to get there
+            if ramp.line_complete(now) and setpoint == target:
+                if finish_by is None:
+                    finish_by = now + max(300.0, ramp.duration)
+                if (temp is not None and ramp.progress(temp) >= 0.9) or now >= finish_by:
+                    result = ramp.result(now)
+                    self.ramp_results.append((state.cycle_count + 1, result))
+                    self.chamber.log(f"Ramp complete: {result.describe()}")
+                    self.record(f"Ramp {result.describe()}")
+                    return
+            await self.clock.asleep(self.ramp_step_seconds)
+
+    async def transition(self, target, hold_seconds=None):
+        """Move to target and hold there for hold_seconds (default: the cycler's hold time)"""
+        hold_seconds = self.hold_seconds if hold_seconds is None else hold_seconds
+        self.chamber.log(f"--- Setting Temperature to: {target}°F ---")
+        if not await self.chamber.write_temp(target):
+            raise CyclingError("Failed to set temperature")
+        current = self.run_state.current_temp
+        self.run_state.update(target=target, hold_elapsed=None, hold_time=hold_seconds,
+                              phase="Heating" if current is None or target > current else "Cooling")
+        self.record("Setpoint Change")
+        if self.boost_enabled and current is not None:
+            setpoint = self.setpoint_boost.begin(current, target, self.tolerance)
+            if self.setpoint_boost.active:
+                if await self.chamber.write_temp(setpoint):
+                    self.chamber.log(f"Setpoint boost: driving to {setpoint:.1f}°F on the way to {target:.1f}°F")
+                else:
+                    self.setpoint_boost.release()  # The target is still in the chamber
+        if not await self.wait_for_stabilization(target, hold_seconds):
+            raise CyclingError("Temperature stabilization failed")
+
+    async def wait_for_stabilization(self, target, hold_seconds):
+        state = self.run_state
+        transition_start = self.clock.time()
+        transition_phase = state.phase
+        stabilization_start = None
+        failures = 0
+        detector = SteadyStateDetector(target, self.tolerance, **self.detector_options)
+        while True:
+            temp = await self.chamber.read_temp()
+            if temp is None:
+                failures += 1
+                self.chamber.log(f"Temperature read failure {failures}/{self.max_failures}")
+                if failures >= self.max_failures:
+                    if not await self.chamber.reconnect():
+                        return False
+                    failures = 0
+                await self.clock.asleep(2)
+                continue
+            failures = 0
+            state.update(current_temp=temp)
+            settle = detector.add(self.clock.time(), temp)
+            if self.setpoint_boost.active and (self.setpoint_boost.update(self.clock.time(), temp)
+                                               or abs(temp - target) <= self.tolerance):
+                # Step back to the real target; retried on the next reading if the write fails
+                if await self.chamber.write_temp(target):
+                    self.setpoint_boost.release()
+                    self.chamber.log(f"Setpoint boost released at {temp}°F")
+
+            in_tolerance = abs(temp - target) <= self.tolerance
+            if not in_tolerance and stabilization_start is not None and settle.glitch:
+                self.chamber.log(f"Ignoring outlier reading {temp}°F during hold")
+                in_tolerance = True
+
+            if in_tolerance:
+                if stabilization_start is None:
+                    stabilization_start = self.clock.time()
+                    if transition_start is not None:
+                        # Transition time runs until the chamber first reaches tolerance
+                        times = self.heating_times if transition_phase == "Heating" else self.cooling_times
+                        times.append(stabilization_start - transition_start)
+                        transition_start = None
+                    state.update(phase="Stabilizing", hold_elapsed=0.0)
+                    self.chamber.log(f"Temperature within range at {temp}°F. Starting stabilization timer.")
+                else:
+                    elapsed = self.clock.time() - stabilization_start
+                    state.update(hold_elapsed=elapsed)
+                    if elapsed >= hold_seconds:
+                        self.chamber.log(f"Temperature stabilized at {temp}°F for {hold_seconds / 60:.1f} minutes.")
+                        self.record()
+                        return True
+                    if (self.early_settle and settle.settled
+                            and elapsed >= min(self.settle_min_hold, hold_seconds)):
+                        self.chamber.log(f"Temperature settled at {temp}°F after {elapsed / 60:.1f} minutes "
+                                         f"(trend {settle.slope:+.2f}°F/min, noise {settle.stddev:.2f}°F). Ending hold early.")
+                        self.record(f"Settled early after {elapsed / 60:.1f} min")
+                        return True
+            elif stabilization_start is not None:
+                stabilization_start = None  # Out of range, restart the hold
+                state.update(phase="Heating" if target > temp else "Cooling", hold_elapsed=None)
+            self.record()
+            await self.clock.asleep(self.read_interval)
+
+
+class AsyncOrchestrator:
+    """Runs any number of chambers, a watchdog and the telemetry export on one event loop"""
+
+    def __init__(self, chamber_configs, resource_manager, clock=None, low_temp=32, high_temp=140,
+                 hold_seconds=600, max_cycles=None, read_interval=5, stale_after=120, log_dir=None,
+                 telemetry_options=None, stabilization_options=None, boost_options=None, cycle_profile=None,
+                 ramp_options=None):
+        self.clock = clock if clock is not None else SystemClock()
+        self.rm = resource_manager
+        self.bus = InstrumentBus("GPIB0")
+        self.stale_after = stale_after  # Virtual seconds without a good read before the watchdog steps in
+        self.log_dir = log_dir
+        self.telemetry_options = telemetry_options or {}
+        self.telemetry = asyncio.Queue()
+        self.logs = {}
+        pacing_store = PacingStore()
+        self.cyclers = []
+        for config in chamber_configs:
+            chamber_boost = dict(boost_options or {})
+            if "max_overshoot" in config:
+                chamber_boost["max_overshoot"] = float(config["max_overshoot"])
+            chamber = AsyncChamber(config["name"], config["resource"], resource_manager, self.bus,
+                                   self.clock, pacing_store)
+            max_ramp_rate = config.get("max_ramp_rate")
+            try:
+                self.cyclers.append(AsyncCycler(
+                    chamber,
+                    low_temp=config.get("low_temp", low_temp),
+                    high_temp=config.get("high_temp", high_temp),
+                    hold_seconds=config.get("hold_minutes", hold_seconds / 60) * 60,
+                    read_interval=read_interval,
+                    max_cycles=max_cycles,
+                    telemetry=self.telemetry,
+                    stabilization_options=stabilization_options,
+                    boost_options=chamber_boost,
+                    cycle_profile=config.get("cycle_profile", cycle_profile),
+                    ramp_options=ramp_options,
+                    min_temp=float(config.get("min_temp", CHAMBER_MIN_TEMP)),
+                    max_temp=float(config.get("max_temp", CHAMBER_MAX_TEMP)),
+                    max_ramp_rate=float(max_ramp_rate) if max_ramp_rate is not None else None,
+                ))
+            except ProfileError as e:
+                raise ProfileError(f"{config['name']}: {e}") from e
+        self.tasks = []
+
+    def request_stop(self):
+        """Cancel every chamber; each turns itself off on the way out"""
+        for task in self.tasks:
+            task.cancel()
+
+    async def watchdog(self):
+        """Cancel a chamber whose reads have stalled (e.g. a hung session)"""
+        while True:
+            await self.clock.asleep(self.stale_after / 4)
+            now = self.clock.monotonic()
+            for cycler, task in zip(self.cyclers, self.tasks):
+                age = now - cycler.chamber.last_read_time
+                if not task.done() and age > self.stale_after:
+                    cycler.chamber.log(f"Watchdog: no temperature reading for {age:.0f} s, stopping chamber")
+                    cycler.error = "Watchdog timeout"
+                    task.cancel()
+
+    async def export_telemetry(self):
+        """Hand queued telemetry rows to one background CSV writer per chamber"""
+        while True:
+            name, row = await self.telemetry.get()
+            try:
+                if name not in self.logs:
+                    timestamp = self.clock.now().strftime('%Y%m%d_%H%M%S')
+                    options = {"log_dir": self.log_dir} if self.log_dir else {}
+                    path = new_log_path(timestamp=timestamp, chamber_name=name, **options)
+                    self.logs[name] = TelemetryWriter(
+                        path, clock=self.clock, on_error=lambda e, n=name: print(f"[{n}] CSV logging error: {e}"),
+                        **self.telemetry_options)
+                self.logs[name].write_row(row)
+            except OSError as e:
+                print(f"[{name}] Error writing to CSV: {e}")
+            finally:
+                self.telemetry.task_done()
+
+    async def _connect(self, cycler):
+        try:
+            await cycler.chamber.connect()
+        except (CyclingError, OSError) + VISA_ERRORS as e:
+            cycler.run_state.update(status="Failed")
+            cycler.error = str(e)
+            cycler.chamber.log(f"Error connecting: {e}")
+            return False
+        return True
+
+    async def run(self):
+        self.bus.start()
+        helpers = [asyncio.create_task(self.export_telemetry())]
+        try:
+            connected = await asyncio.gather(*(self._connect(c) for c in self.cyclers))
+            active = [c for c, ok in zip(self.cyclers, connected) if ok]
+            self.cyclers = active
+            self.tasks = [asyncio.create_task(c.run(), name=c.chamber.name) for c in active]
+            if not self.tasks:
+                return self.cyclers
+            helpers.append(asyncio.create_task(self.watchdog()))
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            await self.telemetry.join()
+        finally:
+            for task in self.tasks:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            for helper in helpers:
+                helper.cancel()
+            for cycler in self.cyclers:
+                await cycler.chamber.disconnect()
+            for log in self.logs.values():
+                log.close()  # Drains rows still queued
+            self.bus.stop()
+        return self.cyclers
+
+
+async def _main(args, chamber_configs, rm, clock, cycle_profile=None):
+    orchestrator = AsyncOrchestrator(chamber_configs, rm, clock, low_temp=args.low, high_temp=args.high,
+                                     hold_seconds=args.hold * 60, max_cycles=args.cycles,
+                                     read_interval=args.read_interval,
+                                     telemetry_options=telemetry_options_from_args(args),
+                                     stabilization_options=steady_state_options_from_args(args),
+                                     boost_options=boost_options_from_args(args),
+                                     cycle_profile=cycle_profile,
+                                     ramp_options=ramp_options_from_args(args))
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGINT, orchestrator.request_stop)
+    except (NotImplementedError, RuntimeError):
+        pass  # Windows: Ctrl+C cancels the main task instead
+    cyclers = await orchestrator.run()
+    for cycler in cyclers:
+        detail = f" ({cycler.error})" if cycler.error else ""
+        state = cycler.run_state.snapshot()
+        print(f"{cycler.chamber.name}: {state.status}{detail}, {state.cycle_count} cycles")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temperature cycling of one or more chambers on a single asyncio event loop "
+                                                 "(a limited engine: no resume, forecast, metrics or live server; "
+                                                 "TTX_Temp_test.py has them)")
+    parser.add_argument("--chambers", help="JSON file listing the chambers to run (see chambers.example.json)")
+    parser.add_argument("--count", type=int, default=1,
+                        help="Without --chambers, run this many simulated chambers (GPIB0::4, 5, ...)")
+    parser.add_argument("--low", type=float, default=32, help="Low temperature (°F)")
+    parser.add_argument("--high", type=float, default=140, help="High temperature (°F)")
+    parser.add_argument("--hold", type=float, default=10, help="Hold time at each temperature (minutes)")
+    parser.add_argument("--cycles", type=int, default=None, help="Stop after this many cycles (default: run until Ctrl+C)")
+    parser.add_argument("--read-interval", type=float, default=5, help="Seconds between temperature reads")
+    add_simulation_arguments(parser)
+    add_clock_arguments(parser)
+    add_telemetry_arguments(parser)
+    add_steady_state_arguments(parser)
+    add_boost_arguments(parser)
+    add_ramp_arguments(parser)
+    parser.add_argument("--profile", help="JSON cycling profile to run instead of --low/--high/--hold "
+                                           "(see profile.example.json)")
+    args = parser.parse_args()
+    if args.jump_time:
+        parser.error("--jump-time is not supported by the asyncio engine; use --time-scale")
+    clock = clock_from_args(args)
+    if not args.simulate and not isinstance(clock, SystemClock):
+        parser.error("--time-scale requires --simulate")
+    if not args.simulate and pyvisa is None:
+        parser.error("pyvisa is not installed; install it or use --simulate")
+    if args.count > 1 and not args.simulate and not args.chambers:
+        parser.error("--count requires --simulate; use --chambers for hardware")
+    cycle_profile = None
+    if args.profile:
+        try:
+            cycle_profile = load_profile(args.profile)
+            cycle_profile.validate()
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not load profile {args.profile}: {e}")
+
+    if args.chambers:
+        try:
+            chamber_configs = load_chamber_configs(args.chambers)
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not load {args.chambers}: {e}")
+    elif args.count > 1:
+        chamber_configs = [{"name": f"Chamber {i + 1}", "resource": f"GPIB0::{4 + i}::INSTR"}
+                           for i in range(args.count)]
+    else:
+        chamber_configs = [{"name": "Chamber", "resource": DEFAULT_CHAMBER_RESOURCE}]
+
+    rm = resource_manager_from_args(args, clock)
+    if rm is None:
+        rm = pyvisa.ResourceManager()
+    try:
+        asyncio.run(_main(args, chamber_configs, rm, clock, cycle_profile))
+    except ProfileError as e:
+        # Raised while the chambers are set up, before any setpoint is written
+        parser.error(f"Cannot start cycling: {e}")
+    except KeyboardInterrupt:
+        print("User stop signal received.")
+    finally:
+        rm.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from TTX_Chamber_Sim import SimulatedResourceManager
+from TTX_Clock import SystemClock
+from TTX_Cycle_Engine import CycleEngine
+from TTX_Instrument_Bus import InstrumentBus, PRIORITY_SETPOINT, PRIORITY_TELEMETRY
+from TTX_Log_Index import LogIndex, read_slice
+from TTX_Pacing import AdaptivePacer
+from TTX_Telemetry import CsvTelemetryLog, TelemetryWriter
+
+RESULT_FORMAT_VERSION = 1
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(values, scale=1000.0):
+    """Count/mean/percentiles of a list of seconds, reported in ms by default"""
+    values = sorted(v * scale for v in values)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3),
+        "min": round(values[0], 3),
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "p99": round(percentile(values, 0.99), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def _connect_engine(args, work_dir, **sim_options):
+    """A cycling engine on a fresh simulated chamber and the real clock, keeping its files in work_dir"""
+    options = {"latency": args.latency, "noise": args.noise, "seed": args.seed}
+    options.update(sim_options)
+    rm = SimulatedResourceManager(**options)
+    engine = CycleEngine(rm, SystemClock(), power_supply_resource=None, data_dir=work_dir)
+    engine.activity_log.echo = False  # Keep the JSON report on stdout clean
+    engine.open()
+    return engine, rm.chambers[engine.chamber_resource]
+
+
+def _warm_up(pacer, args):
+    """Let the pacer converge from its default gap; returns the seconds spent"""
+    start = time.perf_counter()
+    for _ in range(args.warmup):
+        pacer.call(lambda: "1")
+    return time.perf_counter() - start
+
+
+def bench_gpib_read(args, work_dir):
+    """Latency and throughput of gpib_rd_with_retry("R? 100, 1")"""
+    engine, _ = _connect_engine(args, work_dir)
+    engine.sampler.stop()  # Measure the transaction alone
+    warmup = _warm_up(engine.pacer, args)
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(args.transactions):
+        t0 = time.perf_counter()
+        engine.gpib_rd_with_retry("R? 100, 1")
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    engine.shutdown()
+    return {
+        "latency_ms": summarize(latencies),
+        "transactions_per_s": round(args.transactions / elapsed, 2),
+        "final_gap_ms": round(engine.pacer.gap * 1000, 3),
+        "pacer_warmup_s": round(warmup, 3),
+    }
+
+
+def bench_read_temp(args, work_dir):
+    """Latency of read_temp_with_retry(100), including conversion"""
+    engine, _ = _connect_engine(args, work_dir)
+    engine.sampler.stop()
+    _warm_up(engine.pacer, args)
+    latencies = []
+    for _ in range(args.transactions):
+        t0 = time.perf_counter()
+        engine.read_temp_with_retry(100)
+        latencies.append(time.perf_counter() - t0)
+    engine.shutdown()
+    return {"latency_ms": summarize(latencies)}
+
+
+def bench_bus_contention(args, work_dir):
+    """Telemetry polling and setpoint writes sharing one InstrumentBus from two threads"""
+    rm = SimulatedResourceManager(latency=args.latency, noise=args.noise, seed=args.seed)
+    session = rm.open_resource("GPIB0::4::INSTR")
+    bus = InstrumentBus("BENCH")
+    bus.start()
+    pacer = AdaptivePacer()
+    _warm_up(pacer, args)
+    channel = bus.attach(lambda: session, "GPIB0::4::INSTR", pacer)
+    read_latencies = []
+    write_latencies = []
+    stop = threading.Event()
+
+    def telemetry():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            channel.query("R? 100, 1", PRIORITY_TELEMETRY).result()
+            read_latencies.append(time.perf_counter() - t0)
+
+    def control():
+        for i in range(args.transactions // 10):
+            t0 = time.perf_counter()
+            channel.write(f"W 300, {700 + i % 10}", PRIORITY_SETPOINT).result()
+            write_latencies.append(time.perf_counter() - t0)
+            time.sleep(args.latency * 5)
+        stop.set()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=telemetry), threading.Thread(target=control)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    bus.stop()
+    return {
+        "telemetry_latency_ms": summarize(read_latencies),
+        "setpoint_latency_ms": summarize(write_latencies),
+        "transactions_per_s": round((len(read_latencies) + len(write_latencies)) / elapsed, 2),
+    }
+
+
+def bench_stabilization(args, work_dir):
+    """Poll jitter and tolerance-detection delay of wait_for_temp_stabilization"""
+    engine, chamber = _connect_engine(args, work_dir, heat_tau=2.0, max_heat_rate=600.0)
+    target = chamber.ambient + 10
+    tolerance = 2.5
+    poll_times = []
+    detection = {}
+    true_crossing = {}
+    original_query = chamber.query
+
+    def recording_query(cmd):
+        reply = original_query(cmd)
+        if cmd.startswith("R? 100"):
+            now = time.perf_counter()
+            poll_times.append(now)
+            try:
+                if "time" not in detection and abs(int(reply) / 10 - target) <= tolerance:
+                    detection["time"] = now
+            except ValueError:
+                pass
+        return reply
+
+    def watch_model():
+        while "time" not in true_crossing:
+            with chamber._lock:
+                chamber._advance()
+                if abs(chamber.temperature - target) <= tolerance:
+                    true_crossing["time"] = time.perf_counter()
+            time.sleep(0.005)
+
+    chamber.query = recording_query
+    engine.gpib_wrt_with_retry("W 2000, 1")
+    engine.write_temp(300, target)
+    watcher = threading.Thread(target=watch_model, daemon=True)
+    watcher.start()
+    start = time.perf_counter()
+    stabilized = engine.wait_for_temp_stabilization(target, tolerance, args.hold_seconds)
+    elapsed = time.perf_counter() - start
+    engine.shutdown()
+    true_crossing.setdefault("time", None)
+
+    intervals = [b - a for a, b in zip(poll_times, poll_times[1:])]
+    mean_interval = sum(intervals) / len(intervals) if intervals else 0
+    deviations = [abs(i - mean_interval) for i in intervals]
+    result = {
+        "stabilized": stabilized,
+        "wall_time_s": round(elapsed, 3),
+        "poll_interval_ms": summarize(intervals),
+        "poll_jitter_ms": summarize(deviations),
+    }
+    if detection.get("time") and true_crossing["time"]:
+        result["tolerance_detection_delay_ms"] = round((detection["time"] - true_crossing["time"]) * 1000, 3)
+    return result
+
+
+def _time_rows(log, rows):
+    latencies = []
+    try:
+        for i in range(rows):
+            row = [datetime.now().strftime("%Y-%m-%d %H:%M:%S"), f"{72 + i % 50:.2f}", "140.0",
+                   i // 100, "Heating", ""]
+            t0 = time.perf_counter()
+            log.write_row(row)
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        t0 = time.perf_counter()
+        log.close()
+        close_time = time.perf_counter() - t0
+    return latencies, close_time
+
+
+def bench_csv_logging(args, work_dir):
+    """Per-row cost seen by the caller: flush-per-row log vs the background TelemetryWriter"""
+    direct, _ = _time_rows(CsvTelemetryLog(os.path.join(work_dir, "bench_log.csv")), args.rows)
+    writer = TelemetryWriter(os.path.join(work_dir, "bench_writer.csv"))
+    queued, drain = _time_rows(writer, args.rows)
+    return {
+        "row_latency_us": summarize(direct, scale=1e6),
+        "writer_row_latency_us": summarize(queued, scale=1e6),
+        "writer_drain_ms": round(drain * 1000, 3),
+        "writer_batches": writer.batches_written,
+    }
+
+
+def bench_log_slice(args, work_dir):
+    """Time to get one cycle out of a long log: scanning the whole file vs seeking through its index"""
+    path = os.path.join(work_dir, "bench_slice.csv")
+    writer = TelemetryWriter(path)
+    start = datetime(2025, 1, 1).timestamp()
+    rows_per_cycle = 400
+    phases = ("Heating", "Stabilizing", "Cooling", "Stabilizing")
+    for i in range(args.slice_rows):
+        timestamp = datetime.fromtimestamp(start + i).strftime("%Y-%m-%d %H:%M:%S")
+        writer.write_row([timestamp, f"{72 + i % 50:.2f}", "140.0", i // rows_per_cycle,
+                          phases[i % rows_per_cycle * len(phases) // rows_per_cycle], ""])
+    writer.close()
+    cycle = args.slice_rows // rows_per_cycle // 2 + 1
+
+    scans = []
+    for _ in range(3):
+        t0 = time.perf_counter()
+        with open(path, newline="") as f:
+            expected = [row for row in csv.reader(f) if row[3] == str(cycle - 1)]
+        scans.append(time.perf_counter() - t0)
+    seeks = []
+    for _ in range(20):
+        t0 = time.perf_counter()
+        rows = read_slice(path, cycle)
+        seeks.append(time.perf_counter() - t0)
+    if rows != expected:
+        raise RuntimeError("Indexed slice differs from a full scan")
+    t0 = time.perf_counter()
+    index = LogIndex.scan(path)
+    backfill = time.perf_counter() - t0
+    return {
+        "log_mb": round(os.path.getsize(path) / 1e6, 2),
+        "index_entries": len(index.entries),
+        "full_scan": summarize(scans),
+        "indexed_slice": summarize(seeks),
+        "backfill_ms": round(backfill * 1000, 3),
+    }
+
+
+BENCHMARKS = {
+    "gpib_read": bench_gpib_read,
+    "read_temp": bench_read_temp,
+    "bus_contention": bench_bus_contention,
+    "stabilization": bench_stabilization,
+    "csv_logging": bench_csv_logging,
+    "log_slice": bench_log_slice,
+}
+
+
+def git_version():
+    """Short description of the checked-out commit, for comparing result files"""
+    try:
+        return subprocess.check_output(
+            ["git", "describe", "--always", "--dirty"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(data, prefix=""):
+    """Flatten nested result dicts into dotted keys with numeric values"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def print_comparison(baseline, current):
+    """Print metric-by-metric change against an earlier result file"""
+    old = flatten(baseline.get("results", {}))
+    new = flatten(current.get("results", {}))
+    print(f"Comparing {baseline['meta'].get('version')} -> {current['meta'].get('version')}")
+    for key in sorted(set(old) & set(new)):
+        change = ""
+        if old[key]:
+            change = f"{(new[key] - old[key]) / abs(old[key]) * 100:+.1f}%"
+        print(f"  {key:<48} {old[key]:>12} {new[key]:>12} {change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the temperature cycling control loop against the simulated chamber")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS),
+                        help="Run only this benchmark (may be repeated)")
+    parser.add_argument("--transactions", type=int, default=200, help="Transactions per GPIB benchmark")
+    parser.add_argument("--warmup", type=int, default=100,
+                        help="Transactions used to let the pacer converge before measuring")
+    parser.add_argument("--rows", type=int, default=5000, help="Rows written by the CSV benchmark")
+    parser.add_argument("--slice-rows", type=int, default=200000, help="Rows in the log of the slice benchmark")
+    parser.add_argument("--hold-seconds", type=float, default=20.0, help="Hold time for the stabilization benchmark")
+    parser.add_argument("--latency", type=float, default=0.005, help="Simulated per-command latency (s)")
+    parser.add_argument("--noise", type=float, default=0.1, help="Simulated measurement noise (°F)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the simulator")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="Earlier JSON result file to compare against")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in args.only or BENCHMARKS:
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = BENCHMARKS[name](args, work_dir)
+
+    report = {
+        "meta": {
+            "format": RESULT_FORMAT_VERSION,
+            "version": git_version(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import json
+import os
+
+from TTX_Profile import load_profile
+from TTX_Registers import CHAMBER_MIN_TEMP, CHAMBER_MAX_TEMP
+
+DEFAULT_CHAMBER_RESOURCE = "GPIB0::4::INSTR"
+DEFAULT_POWER_SUPPLY_RESOURCE = "USB0::0xF4EC::0x1410::SPD13DCC7R0188::INSTR"
+
+
+def load_chamber_configs(path):
+    """Read the chamber list from a JSON file (see chambers.example.json)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    chambers = data.get("chambers", data) if isinstance(data, dict) else data
+    names = set()
+    for config in chambers:
+        if "name" not in config or "resource" not in config:
+            raise ValueError("Each chamber needs a 'name' and a 'resource'")
+        if config["name"] in names:
+            raise ValueError(f"Duplicate chamber name '{config['name']}'")
+        names.add(config["name"])
+        if config.get("profile_file"):
+            # Relative profile paths are taken from the chamber list's folder
+            profile_path = os.path.join(os.path.dirname(os.path.abspath(path)), config["profile_file"])
+            try:
+                profile = load_profile(profile_path)
+                profile.validate(config.get("min_temp", CHAMBER_MIN_TEMP), config.get("max_temp", CHAMBER_MAX_TEMP),
+                                 config.get("max_ramp_rate"))
+            except (OSError, ValueError) as e:
+                raise ValueError(f"{config['name']}: profile {config['profile_file']}: {e}") from e
+            config["cycle_profile"] = profile
+    return chambers
@@ -0,0 +1,218 @@
+import math
+import random
+import threading
+
+try:
+    from pyvisa.constants import StatusCode
+    from pyvisa.errors import VisaIOError
+except ImportError:  # Simulation does not need a VISA install
+    StatusCode = None
+    VisaIOError = None
+
+from TTX_Clock import SystemClock
+from TTX_Registers import REG_PROCESS_VALUE, REG_SETPOINT, REG_DECIMAL, REG_ON_OFF, CHAMBER_MIN_TEMP, CHAMBER_MAX_TEMP
+
+
+class SimulatedChamber:
+    """In-process stand-in for the ICS-4899A temperature chamber
+
+    Speaks the subset of the protocol the cycling code uses (*IDN?, R? and W on
+    registers 100/300/606/2000) and behaves like a pyvisa message resource.
+    The process value follows a first-order response toward the setpoint while
+    the chamber is on (toward ambient while off), limited to the configured
+    heating and cooling rates, with Gaussian measurement noise on top.
+    """
+
+    def __init__(self, resource_name="GPIB0::4::INSTR", ambient=72.0, initial_temp=None, decimal=1,
+                 heat_tau=300.0, cool_tau=420.0, ambient_tau=1800.0, max_heat_rate=20.0,
+                 max_cool_rate=10.0, noise=0.1, latency=0.01, timeout_rate=0.0,
+                 empty_reply_rate=0.0, seed=None, clock=None):
+        self.resource_name = resource_name
+        self.clock = clock if clock is not None else SystemClock()
+        self.ambient = ambient
+        self.temperature = ambient if initial_temp is None else initial_temp
+        self.setpoint = self.temperature
+        self.decimal = decimal
+        self.chamber_on = False
+        self.powered = True  # Interface power, switched by SimulatedPowerSupply
+        self.heat_tau = heat_tau          # seconds
+        self.cool_tau = cool_tau          # seconds
+        self.ambient_tau = ambient_tau    # seconds, drift while the chamber is off
+        self.max_heat_rate = max_heat_rate  # °F per minute
+        self.max_cool_rate = max_cool_rate  # °F per minute
+        self.noise = noise                # °F standard deviation
+        self.latency = latency            # seconds per command
+        self.timeout_rate = timeout_rate
+        self.empty_reply_rate = empty_reply_rate
+        self.command_count = 0
+
+        # pyvisa resource attributes the cycling code sets
+        self.timeout = 5000
+        self.read_termination = '\n'
+        self.write_termination = '\n'
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._last_update = self.clock.monotonic()
+
+    def _advance(self):
+        """Move the thermal model forward to the current time"""
+        now = self.clock.monotonic()
+        dt = now - self._last_update
+        self._last_update = now
+        if dt <= 0:
+            return
+        if self.chamber_on:
+            target = self.setpoint
+            tau = self.heat_tau if target > self.temperature else self.cool_tau
+        else:
+            target = self.ambient
+            tau = self.ambient_tau
+        step = (target - self.temperature) * (1 - math.exp(-dt / tau))
+        if self.chamber_on:
+            max_step = (self.max_heat_rate if step > 0 else self.max_cool_rate) * dt / 60
+            step = max(-max_step, min(max_step, step))
+        self.temperature += step
+
+    def _register_value(self, addr):
+        scale = 10 ** self.decimal
+        if addr == REG_PROCESS_VALUE:
+            return int(round((self.temperature + self._random.gauss(0, self.noise)) * scale))
+        if addr == REG_SETPOINT:
+            return int(round(self.setpoint * scale))
+        if addr == REG_DECIMAL:
+            return self.decimal
+        if addr == REG_ON_OFF:
+            return int(self.chamber_on)
+        return 0
+
+    def _fail(self):
+        """Return True when this transaction should fail, raising if a timeout is simulated"""
+        if not self.powered or (self.timeout_rate and self._random.random() < self.timeout_rate):
+            if VisaIOError is not None:
+                raise VisaIOError(StatusCode.error_timeout)
+            return True
+        return bool(self.empty_reply_rate and self._random.random() < self.empty_reply_rate)
+
+    def _transaction(self):
+        self.command_count += 1
+        if self.latency:
+            self.clock.sleep(self.latency)
+
+    def query(self, cmd):
+        self._transaction()
+        with self._lock:
+            self._advance()
+            if self._fail():
+                return ""
+            text = cmd.strip()
+            if text == "*IDN?":
+                return "ICS Electronics,4899A,SIMULATED,1.0"
+            if text.upper().startswith("R?"):
+                addr_text, _, count_text = text[2:].partition(",")
+                addr = int(addr_text)
+                count = int(count_text) if count_text.strip() else 1
+                return ", ".join(str(self._register_value(a)) for a in range(addr, addr + count))
+            return ""
+
+    def write(self, cmd):
+        self._transaction()
+        with self._lock:
+            self._advance()
+            if self._fail():
+                return
+            text = cmd.strip()
+            if not text.upper().startswith("W "):
+                return
+            addr_text, _, value_text = text[2:].partition(",")
+            addr = int(addr_text)
+            value = int(value_text)
+            if addr == REG_SETPOINT:
+                setpoint = value / (10 ** self.decimal)
+                self.setpoint = max(CHAMBER_MIN_TEMP, min(CHAMBER_MAX_TEMP, setpoint))
+            elif addr == REG_ON_OFF:
+                self.chamber_on = bool(value)
+            elif addr == REG_DECIMAL:
+                self.decimal = value
+
+    def clear(self):
+        self._transaction()
+
+    def close(self):
+        pass
+
+
+class SimulatedPowerSupply:
+    """Stand-in for the bench supply that powers the chamber's GPIB interface"""
+
+    def __init__(self, chambers, resource_name):
+        self.chambers = chambers
+        self.resource_name = resource_name
+        self.timeout = 5000
+
+    def query(self, cmd):
+        if cmd.strip() == "*IDN?":
+            return "SIMULATED,SPD1305X,0,1.0"
+        return ""
+
+    def write(self, cmd):
+        text = cmd.replace(" ", "").upper()
+        if text.startswith("OUTPUTCH1,"):
+            powered = text.endswith("ON")
+            for chamber in self.chambers():
+                chamber.powered = powered
+
+    def close(self):
+        pass
+
+
+class SimulatedResourceManager:
+    """Drop-in for pyvisa.ResourceManager that hands out simulated instruments
+
+    Chambers are kept per resource name for the life of the manager so their
+    thermal state survives the close/reopen cycles of reconnect_device.
+    """
+
+    def __init__(self, **chamber_options):
+        self.chamber_options = chamber_options
+        self.chambers = {}
+
+    def open_resource(self, resource_name):
+        if resource_name.upper().startswith("GPIB"):
+            if resource_name not in self.chambers:
+                self.chambers[resource_name] = SimulatedChamber(resource_name, **self.chamber_options)
+            return self.chambers[resource_name]
+        return SimulatedPowerSupply(lambda: list(self.chambers.values()), resource_name)
+
+    def list_resources(self):
+        return tuple(self.chambers)
+
+    def close(self):
+        pass
+
+
+def add_simulation_arguments(parser):
+    """Add the --simulate option group to an argparse parser"""
+    group = parser.add_argument_group("simulation")
+    group.add_argument("--simulate", action="store_true",
+                       help="Use an in-process simulated ICS-4899A instead of GPIB hardware")
+    group.add_argument("--sim-heat-rate", type=float, default=20.0, help="Max heating rate (°F/min)")
+    group.add_argument("--sim-cool-rate", type=float, default=10.0, help="Max cooling rate (°F/min)")
+    group.add_argument("--sim-noise", type=float, default=0.1, help="Measurement noise std dev (°F)")
+    group.add_argument("--sim-latency", type=float, default=0.01, help="Per-command latency (s)")
+    group.add_argument("--sim-seed", type=int, default=None, help="Random seed for noise")
+    return group
+
+
+def resource_manager_from_args(args, clock=None):
+    """Return a SimulatedResourceManager when --simulate was given, otherwise None"""
+    if not getattr(args, "simulate", False):
+        return None
+    return SimulatedResourceManager(
+        max_heat_rate=args.sim_heat_rate,
+        max_cool_rate=args.sim_cool_rate,
+        noise=args.sim_noise,
+        latency=args.sim_latency,
+        seed=args.sim_seed,
+        clock=clock,
+    )
@@ -0,0 +1,54 @@
+import json
+import os
+
+from TTX_Telemetry import DEFAULT_LOG_DIR, safe_file_name
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(log_dir=DEFAULT_LOG_DIR, chamber_name=None):
+    """Build the logs/checkpoint[_<chamber>].json path, creating the directory if needed"""
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+    if chamber_name:
+        return os.path.join(log_dir, f"checkpoint_{safe_file_name(chamber_name)}.json")
+    return os.path.join(log_dir, "checkpoint.json")
+
+
+class CheckpointStore:
+    """Last known position of a cycling run, kept on disk so a crash or reboot can resume it
+
+    save() writes a temporary file, syncs it to the disk and renames it over
+    the previous checkpoint, so the file on disk is always either the old
+    checkpoint or the new one, never a torn mix of both.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def save(self, state):
+        data = dict(state, version=CHECKPOINT_VERSION)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        """The saved checkpoint, or None when there is none or it cannot be used"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            return None
+        return data
+
+    def clear(self):
+        for path in (self.path, self.path + ".tmp"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,156 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+
+
+class SystemClock:
+    """Real wall-clock time, used for runs against the physical chamber"""
+
+    rate = 1.0
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def asleep(self, seconds):
+        await asyncio.sleep(max(0, seconds))
+
+    def now(self):
+        return datetime.now()
+
+    # Worker bookkeeping only matters to a jump-mode VirtualClock
+    def add_worker(self, thread):
+        pass
+
+    def set_blocked(self, thread, blocked):
+        pass
+
+    def blocked(self):
+        return contextlib.nullcontext()
+
+
+class VirtualClock:
+    """Accelerated clock for replaying cycle plans against the simulated chamber
+
+    With a rate, virtual time runs rate times faster than real time and every
+    sleep is shortened by the same factor (rate=1000 turns a 5 minute hold
+    into 0.3 s). With rate=None the clock only moves when someone sleeps:
+    once every registered worker thread is asleep, or blocked waiting on
+    another worker (a bus transaction, a join), the earliest sleeper jumps
+    time straight to its wake-up, so a run skips from one scheduled event to
+    the next.
+    """
+
+    def __init__(self, rate=1000.0, start=None):
+        self.rate = rate
+        self._start_wall = time.time() if start is None else start
+        self._start_real = time.monotonic()
+        self._elapsed = 0.0  # Virtual seconds, jump mode only
+        self._wakeups = []
+        self._sequence = itertools.count()
+        self._workers = set()   # Threads that must all be idle before time jumps
+        self._sleepers = set()  # Threads inside sleep()
+        self._blocked = set()   # Workers waiting on another worker
+        self._condition = threading.Condition()
+
+    def monotonic(self):
+        if self.rate:
+            return (time.monotonic() - self._start_real) * self.rate
+        return self._elapsed
+
+    def time(self):
+        return self._start_wall + self.monotonic()
+
+    def now(self):
+        return datetime.fromtimestamp(self.time())
+
+    def add_worker(self, thread):
+        """Hold jumps while thread runs; register before starting it. Finished threads drop out."""
+        with self._condition:
+            self._workers.add(thread)
+
+    def set_blocked(self, thread, blocked):
+        """Mark a worker as waiting on another worker rather than running"""
+        with self._condition:
+            if blocked:
+                self._blocked.add(thread)
+                self._condition.notify_all()
+            else:
+                self._blocked.discard(thread)
+
+    @contextlib.contextmanager
+    def blocked(self):
+        """The calling thread counts as blocked for the duration of the with block"""
+        thread = threading.current_thread()
+        self.set_blocked(thread, True)
+        try:
+            yield
+        finally:
+            self.set_blocked(thread, False)
+
+    def _workers_idle(self):
+        for thread in list(self._workers):
+            if thread.ident is not None and not thread.is_alive():
+                self._workers.discard(thread)
+            elif thread not in self._sleepers and thread not in self._blocked:
+                return False
+        return True
+
+    def sleep(self, seconds):
+        if seconds <= 0:
+            return
+        if self.rate:
+            time.sleep(seconds / self.rate)
+            return
+        thread = threading.current_thread()
+        with self._condition:
+            entry = (self._elapsed + seconds, next(self._sequence))
+            heapq.heappush(self._wakeups, entry)
+            self._sleepers.add(thread)
+            self._condition.notify_all()
+            try:
+                while self._elapsed < entry[0]:
+                    if self._wakeups[0] is entry and self._workers_idle():
+                        self._elapsed = entry[0]
+                        break
+                    # Every state change notifies; the timeout only notices workers that exited
+                    self._condition.wait(0.05)
+            finally:
+                self._sleepers.discard(thread)
+                self._wakeups.remove(entry)
+                heapq.heapify(self._wakeups)
+                self._condition.notify_all()
+
+    async def asleep(self, seconds):
+        if not self.rate:
+            raise RuntimeError("Jump mode cannot drive an asyncio event loop; use a time scale instead")
+        await asyncio.sleep(max(0, seconds) / self.rate)
+
+
+def add_clock_arguments(parser):
+    """Add time-acceleration options to an argparse parser"""
+    group = parser.add_argument_group("virtual clock (simulation only)")
+    group.add_argument("--time-scale", type=float, default=None,
+                       help="Run the virtual clock this many times faster than real time")
+    group.add_argument("--jump-time", action="store_true",
+                       help="Jump the virtual clock straight to the next scheduled event")
+    return group
+
+
+def clock_from_args(args):
+    """Build the clock selected on the command line"""
+    if getattr(args, "jump_time", False):
+        return VirtualClock(rate=None)
+    if getattr(args, "time_scale", None):
+        return VirtualClock(rate=args.time_scale)
+    return SystemClock()
@@ -0,0 +1,1588 @@
+import os
+import threading
+from datetime import timedelta
+try:
+    import pyvisa
+    VISA_ERRORS = (pyvisa.errors.VisaIOError, pyvisa.errors.InvalidSession)
+except ImportError:  # Only the simulated chamber is available without pyvisa
+    pyvisa = None
+    VISA_ERRORS = ()
+from TTX_Instrument_Bus import InstrumentBus, PRIORITY_CONTROL
+from TTX_Pacing import PacingStore, DEFAULT_PACING_FILE
+from TTX_Thermal_Model import ThermalModelStore, DEFAULT_MODEL_FILE
+from TTX_Registers import (ChamberStatus, STATUS_REGISTERS, DEFAULT_MAX_BLOCK, CHAMBER_MIN_TEMP, CHAMBER_MAX_TEMP,
+                           plan_block_reads, block_read_command, parse_block_reply)
+from TTX_Chamber_Sim import SimulatedResourceManager
+from TTX_Clock import SystemClock
+from TTX_Telemetry import TelemetryWriter, new_log_path, DEFAULT_LOG_DIR
+from TTX_Run_State import RunState
+from TTX_Activity_Log import ActivityLog, activity_log_path
+from TTX_Checkpoint import CheckpointStore, checkpoint_path
+from TTX_Metrics import EngineMetrics, MetricsRegistry, gpib_error_class
+from TTX_Tracing import NULL_TRACER, TracingClock, traced
+from TTX_Steady_State import SteadyStateDetector
+from TTX_Sampler import SampleCache, TemperatureSampler
+from TTX_Setpoint_Boost import SetpointBoost
+from TTX_Profile import CycleProfile, ProfileError, RAMP, DWELL, compile_schedule, schedule_seconds
+from TTX_Ramp import RampController
+from TTX_Chamber_Config import DEFAULT_CHAMBER_RESOURCE, DEFAULT_POWER_SUPPLY_RESOURCE
+
+
+class CycleEngine:
+    """Temperature cycling of one chamber without any user interface
+
+    Connection and recovery, the sampler, stabilization, profiles, ramps,
+    setpoint boost, pacing, the thermal model, checkpoints and the CSV and
+    Activity logs all live here. TempCycleGUI is a CycleEngine with Tk
+    widgets on top; TTX_Temp_test.py runs engines headless. A front end
+    overrides the show_*() methods to display progress and update_hold_time()
+    to feed in its own settings; the defaults do nothing. Both are called
+    from the worker thread, so a front end reads its widgets into plain
+    attributes on its own thread beforehand.
+    """
+
+    def __init__(self, resource_manager=None, clock=None, bus=None, chamber_name=None,
+                 resource_name=DEFAULT_CHAMBER_RESOURCE, power_supply_resource=DEFAULT_POWER_SUPPLY_RESOURCE,
+                 profile=None, telemetry_options=None, sampler_options=None, stabilization_options=None,
+                 boost_options=None, cycle_profile=None, ramp_options=None, data_dir=None, hub=None,
+                 metrics=None, tracer=None):
+        self.chamber_name = chamber_name
+        # Logs, checkpoint and learned profiles go here; None keeps them next to the program
+        self.log_dir = data_dir or DEFAULT_LOG_DIR
+        pacing_file = os.path.join(data_dir, "pacing_profiles.json") if data_dir else DEFAULT_PACING_FILE
+        model_file = os.path.join(data_dir, "thermal_models.json") if data_dir else DEFAULT_MODEL_FILE
+
+        # Every timing path goes through this clock so simulated runs can be accelerated
+        self.clock = clock if clock is not None else SystemClock()
+        # Opt-in timeline of transactions, sleeps, retries and UI updates; every sleep is a span
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        if self.tracer.enabled:
+            self.clock = TracingClock(self.clock, self.tracer)
+        self.profile = profile or {}  # Default low/high/hold for this chamber
+        self.telemetry_options = telemetry_options or {}  # TelemetryWriter flush/durability/rotation
+        
+        # Initialize variables
+        # Deferred update state
+        self.editing_temps = False
+        self.pending_update = False
+        self.pending_low_temp = None
+        self.pending_high_temp = None
+        self.current_low_temp = None
+        self.current_high_temp = None
+
+        self.cycling_thread = None
+        self.stop_cycling = False
+        # Resource manager shared by every chamber in this process (simulated or real);
+        # a standalone engine opens its own
+        self.shared_rm = resource_manager
+        self.rm = None
+        self.ics_4899a = None
+        self.decimal = 0
+        self.is_connected = False
+        self.connection_attempts = 0
+        self.max_connection_attempts = 3
+        self.gpib_timeout = 5000  # 5 second timeout
+        self.retry_count = 3
+        self.temp_read_timeout = 10000  # Longer timeout for temperature reads
+        self.max_block_read = DEFAULT_MAX_BLOCK  # Registers per "R? <addr>, <count>" transaction
+        self.last_status = None  # Most recent ChamberStatus snapshot
+        # Engine state read by the UI and the CSV log; never parsed back from labels
+        self.run_state = RunState()
+        # Optional TelemetryHub for remote watchers; fed from the sampler, never from the bus
+        self.hub = hub
+        
+        # All chamber I/O goes through a single owner thread so the monitor
+        # and the cycling worker never share the pyvisa session concurrently.
+        # Inter-command gaps are learned per instrument and kept between runs.
+        # Chambers on the same controller share one bus.
+        self.chamber_resource = resource_name
+        simulated = isinstance(resource_manager, SimulatedResourceManager)
+        self.pacing_key = ("SIM:" if simulated else "") + self.chamber_resource
+        self.pacing_store = PacingStore(pacing_file)
+        self.pacer = self.pacing_store.load(self.pacing_key, clock=self.clock)
+        self.owns_bus = bus is None
+        self.bus = bus if bus is not None else InstrumentBus("GPIB0", tracer=self.tracer, clock=self.clock)
+        self.bus.start()
+        self.chamber = self.bus.attach(lambda: self.ics_4899a, self.chamber_resource, self.pacer)
+        
+        # One sampler owns the process-value register; the status label, the
+        # stabilization check, the CSV log and the health check read its cache
+        sampler_options = dict(sampler_options or {})
+        self.sample_cache = SampleCache(self.clock, max_age=sampler_options.pop("max_age", 15.0))
+        self.sampler = TemperatureSampler(self._sample_temperature, self.sample_cache,
+                                          on_sample=self._on_temperature_sample, **sampler_options)
+        
+        # Transaction latency, retries by error class and recovery, for the /metrics page;
+        # chambers in one process share the registry
+        self.metrics = EngineMetrics(metrics if metrics is not None else MetricsRegistry(), self.hub_name, self)
+        
+        # Transition timing variables
+        self.transition_start_time = None
+        self.transition_start_temp = None
+        self.heating_times = []  # List to store heating transition times
+        self.cooling_times = []  # List to store cooling transition times
+        self.current_transition_type = None  # 'heating' or 'cooling'
+        self.transition_target = None
+        self.transition_samples = []  # (time, °F) pairs of the transition in progress
+        
+        # Heating and cooling model learned from every completed transition and
+        # kept between sessions; drives the transition ETA and finish forecast
+        self.thermal_store = ThermalModelStore(model_file)
+        self.thermal_model = self.thermal_store.load(self.pacing_key)
+        self.active_steps = None  # Steps of the profile pass being run
+        self.current_leg = 0      # Index of the running step
+        
+        # Multi-segment profile; None runs the two-point low/high cycle from the
+        # entries. A profile loaded while running is swapped in at the next
+        # segment boundary.
+        self.cycle_profile = cycle_profile
+        self.pending_profile = None
+        self.profile_pending = False
+        self.min_temp = float(self.profile.get("min_temp", CHAMBER_MIN_TEMP))
+        self.max_temp = float(self.profile.get("max_temp", CHAMBER_MAX_TEMP))
+        max_ramp_rate = self.profile.get("max_ramp_rate")  # °F/min; None leaves ramp rates unchecked
+        self.max_ramp_rate = float(max_ramp_rate) if max_ramp_rate is not None else None
+        self.last_setpoint = None
+        
+        # Ramps stream setpoints on a fixed schedule, leading the requested line
+        # by the chamber's measured lag; each ramp's achieved rate is kept
+        ramp_options = ramp_options or {}
+        self.ramp_step_seconds = ramp_options.get("step_seconds", 5.0)
+        self.ramp_max_lead = ramp_options.get("max_lead", 20.0)
+        self.ramp_results = []  # (cycle number, RampResult)
+        
+        # Hold time configuration (default 5 minutes = 300 seconds)
+        self.hold_time_seconds = int(float(self.profile.get("hold_minutes", 5)) * 60)
+        self.target_cycle_count = self.profile.get("target_cycles")  # For the finish forecast
+        
+        # Steady-state detection: rides out single outlier readings during a hold
+        # and, with early settle on, ends the hold once the chamber has settled
+        stabilization_options = stabilization_options or {}
+        self.early_settle = stabilization_options.get("early_settle", False)
+        self.settle_min_hold = stabilization_options.get("min_hold_seconds", 60)
+        self.detector_options = stabilization_options.get("detector", {})
+        
+        # Setpoint boost: drive past the target during a transition, then step
+        # back before the chamber overshoots; a profile may tighten the overshoot
+        boost_options = dict(boost_options or {})
+        self.boost_enabled = boost_options.pop("enabled", False)
+        if "max_overshoot" in self.profile:
+            boost_options["max_overshoot"] = float(self.profile["max_overshoot"])
+        self.setpoint_boost = SetpointBoost(min_temp=self.min_temp, max_temp=self.max_temp, **boost_options)
+        self.transition_boosted = False
+        
+        # Enhanced error tracking and recovery
+        self.consecutive_comm_failures = 0
+        self.max_comm_failures = 3
+        self.comm_health_timeout = 30  # seconds before considering communication unhealthy
+        
+        # Power supply control for recovery
+        self.power_supply = None
+        self.power_supply_resource = power_supply_resource  # None when the chamber has no supply
+        self.power_cycles_performed = 0
+        
+        # CSV logging
+        self.csv_log = None
+        self.csv_filename = None
+        self.logging_enabled = True
+        
+        # Activity Log: bounded in memory (and in the widget of a GUI), full history on disk
+        try:
+            activity_path = activity_log_path(self.log_dir, chamber_name=chamber_name)
+        except OSError:
+            activity_path = None
+        self.activity_log = ActivityLog(activity_path, echo_prefix=f"[{chamber_name}] " if chamber_name else None)
+        
+        # Position of the run on disk, so a crash or reboot can pick up where it left off
+        try:
+            self.checkpoint_store = CheckpointStore(checkpoint_path(self.log_dir, chamber_name=chamber_name))
+        except OSError:
+            self.checkpoint_store = None
+        self.checkpoint_interval = 30  # Seconds between checkpoints during a hold or dwell
+        self.last_checkpoint = 0.0
+        self.resume_state = None        # Checkpoint the next start picks up from
+        self.profile_passes = 0         # Completed passes of the current profile
+        self.discard_checkpoint = False  # Set by Stop: a deliberate stop is not resumed
+
+    def open(self):
+        """Start the CSV log and connect to the chamber and its power supply"""
+        self.setup_csv_logging()
+        self.connect_to_device()
+        if self.power_supply_resource:
+            self.connect_to_power_supply()
+
+    # ===== Front end hooks: a GUI overrides these, a headless run leaves them as they are =====
+    def show_connection(self, text, connected):
+        """Connection status text; connected is False after a failure"""
+
+    def show_timer(self, text):
+        """Hold timer text"""
+
+    def show_transition_timer(self, text):
+        """Time spent in the current transition"""
+
+    def show_transition_time(self, kind, last, average):
+        """Last and average heating or cooling time in seconds, None after a reset"""
+
+    def show_eta(self, text):
+        """Predicted time left in the current transition"""
+
+    def show_finish(self, text):
+        """Projected finish of the target cycle count"""
+
+    def show_profile(self, text):
+        """Active profile and, while running, the current step"""
+
+    def show_ramp(self, text):
+        """Result of the most recent ramp"""
+
+    def show_temperatures(self, low, high):
+        """Low/high temperatures that just became active at a cycle boundary"""
+
+    def on_cycling_stopped(self):
+        """Called from the worker thread once it has finished and the chamber is off"""
+
+    def update_hold_time(self):
+        """Refresh hold_time_seconds from the front end's setting"""
+
+    def target_cycles(self):
+        """Cycle count to forecast the finish for, or None"""
+        count = self.target_cycle_count
+        return count if isinstance(count, int) and count > 0 else None
+
+    def log_message(self, message):
+        """Add a line to the Activity Log; safe from any thread"""
+        timestamp = self.clock.now().strftime("%H:%M:%S")
+        self.activity_log.add(f"[{timestamp}] {message}", console_text=message)  # Also echoed to the console
+        if self.hub is not None:
+            self.hub.publish(self.hub_name, "log", line=f"[{timestamp}] {message}")
+
+    @property
+    def hub_name(self):
+        return self.chamber_name or self.chamber_resource
+
+    def publish_state(self, sample=None):
+        """Send the run state (and the newest reading) to the telemetry hub, if there is one"""
+        if self.hub is None:
+            return
+        data = {"state": self.run_state.as_dict(), "connected": self.is_connected}
+        if sample is not None:
+            data["sample"] = {"value": sample.value, "timestamp": sample.timestamp, "sequence": sample.sequence}
+        self.hub.publish(self.hub_name, "state", **data)
+
+    def setup_csv_logging(self):
+        """Setup CSV file for logging temperature data"""
+        try:
+            # Create filename with timestamp in the logs directory
+            timestamp = self.clock.now().strftime("%Y%m%d_%H%M%S")
+            self.csv_filename = new_log_path(self.log_dir, timestamp=timestamp, chamber_name=self.chamber_name)
+            
+            # Rows are queued and written in batches by a background thread,
+            # so a slow disk never delays the temperature reads
+            self.csv_log = TelemetryWriter(
+                self.csv_filename, clock=self.clock,
+                on_error=lambda e: self.log_message(f"CSV logging error: {e}"),
+                tracer=self.tracer, **self.telemetry_options)
+            
+            self.log_message(f"CSV logging initialized: {self.csv_filename}")
+            
+        except Exception as e:
+            self.log_message(f"Failed to setup CSV logging: {e}")
+            self.logging_enabled = False
+
+    def log_temperature_to_csv(self, temperature):
+        """Log temperature reading to CSV file"""
+        if not self.logging_enabled or not self.csv_log:
+            return
+        
+        try:
+            timestamp = self.clock.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.csv_log.write_row(self.run_state.csv_row(timestamp, temperature))
+            
+        except Exception as e:
+            self.log_message(f"CSV logging error: {e}")
+
+    def log_event_to_csv(self, event_description):
+        """Log a specific event to CSV file"""
+        if not self.logging_enabled or not self.csv_log:
+            return
+        
+        try:
+            timestamp = self.clock.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.csv_log.write_row(self.run_state.csv_row(timestamp, event=event_description))
+            
+        except Exception as e:
+            self.log_message(f"CSV event logging error: {e}")
+        
+    @traced("io")
+    def save_pacing(self):
+        """Persist the learned inter-command gap for the next start"""
+        try:
+            self.pacing_store.save(self.pacing_key, self.pacer)
+        except OSError as e:
+            self.log_message(f"Could not save pacing profile: {e}")
+
+    @traced("io")
+    def save_thermal_model(self):
+        """Persist the learned heating and cooling model for the next start"""
+        try:
+            self.thermal_store.save(self.pacing_key, self.thermal_model)
+        except OSError as e:
+            self.log_message(f"Could not save thermal model: {e}")
+
+    def profile_text(self, step_index=None):
+        """Profile label text: name and, while running, the current step"""
+        name = self.cycle_profile.name if self.cycle_profile is not None else "Two-point (low/high)"
+        if step_index is not None and self.active_steps:
+            name += f" - step {step_index + 1}/{len(self.active_steps)}: {self.active_steps[step_index].describe()}"
+        return name
+
+    def set_profile(self, profile):
+        name = profile.describe() if profile is not None else "two-point low/high cycle"
+        if self.is_cycling():
+            self.pending_profile = profile
+            self.profile_pending = True
+            self.log_message(f"Profile staged: {name} (will start at the next segment boundary)")
+        else:
+            self.cycle_profile = profile
+            self.show_profile(self.profile_text())
+            self.log_message(f"Profile loaded: {name}")
+
+    def swap_pending_profile(self):
+        """Switch to a staged profile (worker thread, between segments); True if one was swapped in"""
+        if not self.profile_pending:
+            return False
+        self.cycle_profile = self.pending_profile
+        self.pending_profile = None
+        self.profile_pending = False
+        self.log_message(f"Switched to profile {self.profile_text()}")
+        self.log_event_to_csv(f"Profile: {self.profile_text()}")
+        return True
+
+    @property
+    def cycle_count(self):
+        """Total cycles completed, kept in run_state"""
+        return self.run_state.cycle_count
+
+    @cycle_count.setter
+    def cycle_count(self, value):
+        self.run_state.update(cycle_count=value)
+
+    def format_time(self, seconds):
+        """Format seconds into minutes:seconds format"""
+        minutes = int(seconds // 60)
+        seconds = int(seconds % 60)
+        return f"{minutes:02d}:{seconds:02d}"
+
+    def update_timer_display(self, elapsed_time, total_time):
+        """Show hold progress as elapsed/total"""
+        remaining_time = total_time - elapsed_time
+        timer_text = f"{self.format_time(elapsed_time)}/{self.format_time(total_time)}"
+        self.show_timer(timer_text)
+
+    def _create_resource_manager(self):
+        """Open a VISA resource manager, or reuse the shared one when it was supplied"""
+        if self.shared_rm is not None:
+            return self.shared_rm
+        return pyvisa.ResourceManager()
+
+    def connect_to_device(self):
+        try:
+            self.rm = self._create_resource_manager()
+            self.ics_4899a = self.rm.open_resource(self.chamber_resource)
+            
+            # Configure GPIB settings
+            self.ics_4899a.timeout = self.gpib_timeout
+            self.ics_4899a.read_termination = '\n'
+            self.ics_4899a.write_termination = '\n'
+            
+            # Read decimal configuration, temperature, setpoint and on/off state in one snapshot
+            status = self.read_chamber_status()
+            if status is None:
+                raise Exception("Could not read chamber status")
+            self.decimal = status.decimal
+            current_temp = status.process_value
+            
+            # Test connection
+            device_id = self.gpib_rd_with_retry("*IDN?")
+            if not device_id or not device_id.strip():
+                raise Exception("Could not read device ID")
+            
+            self.is_connected = True
+            self.show_connection("Status: Connected", True)
+            self.log_message(f"Connected to: {device_id.strip()}")
+            self.log_message(f"Current chamber temperature: {current_temp}°F "
+                             f"(setpoint {status.setpoint}°F, chamber {'on' if status.chamber_on else 'off'})")
+            
+            # Start temperature monitoring
+            self.monitor_temperature()
+            
+        except Exception as e:
+            self.log_message(f"Connection failed: {e}")
+            self.show_connection("Status: Connection Failed", False)
+    
+    def connect_to_power_supply(self):
+        """Connect to the power supply for automatic power cycling"""
+        try:
+            if not self.rm:
+                self.rm = self._create_resource_manager()
+            
+            self.power_supply = self.rm.open_resource(self.power_supply_resource)
+            self.power_supply.timeout = 5000  # 5 second timeout
+            
+            # Test power supply connection
+            idn_response = self.power_supply.query("*IDN?")
+            if idn_response and idn_response.strip():
+                self.log_message(f"Power supply connected: {idn_response.strip()}")
+                return True
+            else:
+                raise Exception("No response from power supply")
+                
+        except Exception as e:
+            self.log_message(f"Power supply connection failed: {e}")
+            self.power_supply = None
+            return False
+
+    @traced("recovery")
+    def power_cycle_chamber(self):
+        """Cycle power to the chamber using the power supply"""
+        if not self.power_supply:
+            self.log_message("Power supply not available - cannot perform power cycle")
+            return False
+        
+        try:
+            self.power_cycles_performed += 1
+            self.metrics.power_cycle()
+            self.log_message(f"Performing power cycle #{self.power_cycles_performed} - Turning output OFF")
+            
+            # Turn output off
+            self.power_supply.write("OUTPut CH1,OFF")
+            self.clock.sleep(2)  # Wait 2 seconds
+            
+            self.log_message("Power cycle - Turning output ON")
+            
+            # Turn output on
+            self.power_supply.write("OUTPut CH1,ON")
+            self.clock.sleep(2)  # Wait 2 seconds
+            
+            self.log_message("Power cycle completed - waiting for chamber to stabilize")
+            self.clock.sleep(3)  # Additional time for chamber to boot up
+            
+            return True
+            
+        except Exception as e:
+            self.log_message(f"Power cycle failed: {e}")
+            return False
+
+    def check_communication_health(self):
+        """Check if GPIB communication is healthy and force reconnection if needed"""
+        if self.sample_cache.age() > self.comm_health_timeout:
+            self.log_message("Communication health check failed - forcing reconnection")
+            self.is_connected = False
+            return False
+        return True
+        '''  
+    def force_hardware_reset(self):
+        """Force a complete hardware reset of GPIB connection with power cycling"""
+        self.log_message("Performing forced hardware reset...")
+        try:
+            # Close all connections aggressively
+            if self.ics_4899a:
+                try:
+                    self.ics_4899a.clear()
+                    self.ics_4899a.close()
+                except:
+                    pass
+                finally:
+                    self.ics_4899a = None
+            
+            if self.rm:
+                try:
+                    self.rm.close()
+                except:
+                    pass
+                finally:
+                    self.rm = None
+            
+            # Wait longer for hardware to reset
+            time.sleep(5)
+            
+            # Force resource manager refresh
+            pyvisa.ResourceManager.close_if_open()
+            
+            return True
+            
+        except Exception as e:
+            self.log_message(f"Hardware reset failed: {e}")
+            return False
+        '''  
+    @traced("gpib")
+    def gpib_rd_with_retry(self, cmd, retries=None, extended_timeout=False):
+        """GPIB read with retry logic"""
+        if retries is None:
+            retries = self.retry_count
+            
+        # Use extended timeout for temperature reads during stabilization
+        timeout = self.temp_read_timeout if extended_timeout else None
+        
+        for attempt in range(retries):
+            try:
+                # Inter-command pacing is handled by the bus channel's pacer
+                started = self.clock.monotonic()
+                ret = self.chamber.query(cmd, timeout=timeout).result()
+                self.metrics.transaction("query", cmd, self.clock.monotonic() - started)
+                if ret is not None and ret.strip() != "":
+                    return ret.strip()
+                else:
+                    self.record_gpib_error("query", cmd, "empty")
+                    if attempt < retries - 1:
+                        self.log_message(f"Empty response for '{cmd}', retry {attempt + 1}/{retries}")
+                        self.clock.sleep(self.pacer.retry_delay(attempt))
+                        continue
+            except VISA_ERRORS as e:
+                self.record_gpib_error("query", cmd, gpib_error_class(e))
+                error_msg = str(e)
+                if "TMO" in error_msg or "timeout" in error_msg.lower():
+                    self.log_message(f"Timeout for '{cmd}', retry {attempt + 1}/{retries}")
+                elif "I/O" in error_msg:
+                    self.log_message(f"I/O error for '{cmd}', retry {attempt + 1}/{retries}")
+                    # For I/O errors, wait longer and try to reset connection
+                    if attempt == 1:  # On second attempt, try to reset
+                        self.clock.sleep(2)
+                        try:
+                            self.chamber.submit(lambda session: session.clear()).result()  # Clear any pending operations
+                        except:
+                            pass
+                else:
+                    self.log_message(f"GPIB error for '{cmd}', retry {attempt + 1}/{retries}: {e}")
+                
+                if attempt < retries - 1:
+                    self.clock.sleep(self.pacer.retry_delay(attempt))
+                    continue
+                else:
+                    self.log_message(f"GPIB Query failed after {retries} attempts: {e}")
+                    self.is_connected = False
+                    
+        self.metrics.failed("query")
+        return ""
+
+    @traced("gpib")
+    def gpib_wrt_with_retry(self, cmd, retries=None):
+        """Enhanced GPIB write with better error handling"""
+        if retries is None:
+            retries = self.retry_count
+            
+        for attempt in range(retries):
+            try:
+                # Check connection health before critical operations
+                if not self.check_communication_health():
+                    self.is_connected = False
+                    return False
+                
+                # Inter-command pacing is handled by the bus channel's pacer
+                started = self.clock.monotonic()
+                self.chamber.write(cmd).result()
+                self.metrics.transaction("write", cmd, self.clock.monotonic() - started)
+                return True
+                
+            except VISA_ERRORS as e:
+                self.record_gpib_error("write", cmd, gpib_error_class(e))
+                error_msg = str(e)
+                self.consecutive_comm_failures += 1
+                
+                # Handle specific error types
+                if "VI_ERROR_IO" in error_msg or "I/O" in error_msg:
+                    self.log_message(f"I/O error for '{cmd}', attempt {attempt + 1}/{retries}: Hardware communication failure")
+                    if attempt == 0:  # On first I/O error, try immediate recovery
+                        try:
+                            self.chamber.submit(lambda session: session.clear()).result()
+                            self.clock.sleep(2)
+                        except:
+                            pass
+                elif "VI_ERROR_NLISTENERS" in error_msg or "NLISTENERS" in error_msg:
+                    self.log_message(f"No listeners error for '{cmd}', attempt {attempt + 1}/{retries}: Device not responding")
+                    # This is a serious error - device is not responding
+                    if attempt < retries - 1:
+                        self.clock.sleep(3)  # Wait longer for device recovery
+                else:
+                    self.log_message(f"GPIB write error for '{cmd}', attempt {attempt + 1}/{retries}: {e}")
+                
+                if attempt < retries - 1:
+                    self.clock.sleep(self.pacer.retry_delay(attempt))
+                    continue
+                else:
+                    self.log_message(f"GPIB Write failed after {retries} attempts: {e}")
+                    self.is_connected = False
+                    
+        self.metrics.failed("write")
+        return False
+
+    def record_gpib_error(self, op, cmd, error_class):
+        """Count a failed attempt and mark it on the trace"""
+        self.metrics.error(op, error_class)
+        self.tracer.instant("retry", "gpib", op=op, cmd=cmd, error=error_class)
+
+    def read_temp_with_retry(self, addr, extended_timeout=False):
+        """Enhanced temperature reading with better error recovery"""
+        for attempt in range(self.retry_count):
+            try:
+                response = self.gpib_rd_with_retry("R? " + str(addr) + ", 1", extended_timeout=extended_timeout)
+                if not response or response == "":
+                    self.consecutive_comm_failures += 1
+                    if attempt < self.retry_count - 1:
+                        self.log_message(f"Empty temperature response, retry {attempt + 1}/{self.retry_count}")
+                        self.clock.sleep(self.pacer.retry_delay(attempt))
+                        continue
+                    return None
+                
+                temp_raw = int(response)
+                temp_value = float(temp_raw / (10 ** self.decimal))
+                
+                # Temperature read successful - reset failure counters
+                self.consecutive_comm_failures = 0
+                
+                return temp_value
+                
+            except (ValueError, TypeError) as e:
+                self.consecutive_comm_failures += 1
+                if attempt < self.retry_count - 1:
+                    self.log_message(f"Temperature conversion error, retry {attempt + 1}: {e}")
+                    self.clock.sleep(self.pacer.retry_delay(attempt))
+                    continue
+                else:
+                    self.log_message(f"Temperature conversion error after {self.retry_count} attempts: {e}")
+                    return None
+            except Exception as e:
+                self.consecutive_comm_failures += 1
+                if attempt < self.retry_count - 1:
+                    self.log_message(f"Temperature read error, retry {attempt + 1}: {e}")
+                    self.clock.sleep(self.pacer.retry_delay(attempt))
+                    continue
+                else:
+                    self.log_message(f"Temperature read error after {self.retry_count} attempts: {e}")
+                    return None
+        return None
+    def read_registers(self, addresses, extended_timeout=False):
+        """Read raw register values using the fewest block transactions"""
+        values = {}
+        for start, count in plan_block_reads(addresses, self.max_block_read):
+            response = self.gpib_rd_with_retry(block_read_command(start, count), extended_timeout=extended_timeout)
+            if not response:
+                return None
+            for offset, value in enumerate(parse_block_reply(response, count)):
+                values[start + offset] = value
+        return {addr: values[addr] for addr in addresses}
+
+    @traced("gpib")
+    def read_chamber_status(self, extended_timeout=False):
+        """Read process value, setpoint, decimal and on/off state as one ChamberStatus"""
+        try:
+            raw = self.read_registers(STATUS_REGISTERS, extended_timeout)
+            if raw is None:
+                return None
+            status = ChamberStatus.from_registers(raw, self.clock.time())
+        except (ValueError, TypeError) as e:
+            self.log_message(f"Status read conversion error: {e}")
+            return None
+        
+        self.consecutive_comm_failures = 0
+        self.last_status = status
+        self.sample_cache.publish(status.process_value)
+        return status
+
+    def _sample_temperature(self):
+        """Sampler read function (runs on the sampler thread)"""
+        if not self.is_connected:
+            return None
+        return self.read_temp(100, extended_timeout=True)
+
+    @traced("sampler")
+    def _on_temperature_sample(self, sample):
+        self.run_state.update(current_temp=sample.value)
+        self.log_temperature_to_csv(sample.value)
+        self.publish_state(sample)
+
+    def monitor_temperature(self):
+        """Keep the sampler running and recover a lost connection while idle; call every few seconds"""
+        if self.is_connected:
+            self.sampler.start()  # No-op while it is running
+        elif self.sampler.consecutive_failures and not self.is_cycling():
+            # While cycling, the stabilization loop handles reconnection
+            self.log_message("Lost connection during monitoring. Attempting reconnection...")
+            self.sampler.consecutive_failures = 0
+            self.reconnect_device()
+
+    @traced("control")
+    def wait_for_temp_stabilization(self, target_temp, tolerance=2.5, stabilization_time=None, resume_hold=0.0):
+        """Hold within tolerance for stabilization_time; resume_hold credits a hold cut short by a restart"""
+        # Use configured hold time if not specified
+        if stabilization_time is None:
+            self.update_hold_time()  # Update from the front end
+            stabilization_time = self.hold_time_seconds
+            
+        temp_stabilized = False
+        stabilization_start = None
+        consecutive_failures = 0
+        max_failures = 3  # Reduced - force reconnection sooner
+        last_gui_update = self.clock.time()
+        last_transition_update = self.clock.time()
+        temp_read_interval = 5  # Slightly longer interval to reduce communication stress
+        transition_started = False
+        last_comm_check = self.clock.time()
+        detector = SteadyStateDetector(target_temp, tolerance, **self.detector_options)
+        last_sequence = None
+        settle = None  # SteadyStateStatus of the newest sample
+        
+        while not temp_stabilized and not self.stop_cycling:
+            # Check communication health every 30 seconds
+            if self.clock.time() - last_comm_check > 30:
+                if not self.check_communication_health():
+                    self.log_message("Communication health check failed during stabilization")
+                    if not self.reconnect_device():
+                        self.log_message("Failed to restore communication. Stopping cycling.")
+                        return False
+                last_comm_check = self.clock.time()
+            
+            # The sampler owns register 100; use its latest reading while it is fresh
+            sample = self.sample_cache.latest()
+            current_temp = sample.value if sample is not None else None
+            
+            if current_temp is None:
+                consecutive_failures += 1
+                self.log_message(f"Temperature read failure {consecutive_failures}/{max_failures}")
+                
+                if consecutive_failures >= max_failures:
+                    self.log_message("Communication failures detected. Attempting reconnection...")
+                    if self.reconnect_device():
+                        consecutive_failures = 0
+                        self.clock.sleep(3)  # Wait after reconnection
+                        continue
+                    else:
+                        self.log_message("Reconnection failed. Stopping temperature cycling.")
+                        return False
+                        
+                # Wait longer between failed attempts during stabilization
+                self.clock.sleep(8)  # Longer wait to allow system recovery
+                continue
+            else:
+                consecutive_failures = 0
+                
+            # Every reading since the last pass, not just the newest: the sampler runs faster than this loop
+            new_samples = [sample] if last_sequence is None else self.sample_cache.since(last_sequence)
+            for new_sample in new_samples:
+                settle = detector.add(new_sample.timestamp, new_sample.value)
+                if self.transition_start_time is not None:
+                    self.transition_samples.append((new_sample.timestamp, new_sample.value))
+                if self.setpoint_boost.active and self.setpoint_boost.update(new_sample.timestamp, new_sample.value):
+                    self.end_setpoint_boost(current_temp)
+                last_sequence = new_sample.sequence
+                
+            # Start transition timing if not started yet
+            if not transition_started and self.transition_start_time is None:
+                transition_started = True
+                if resume_hold and abs(current_temp - target_temp) <= tolerance:
+                    pass  # Resumed mid-hold and still on target: no transition to time
+                else:
+                    if resume_hold:
+                        self.log_message(f"Chamber left {target_temp}°F while stopped. Restarting the hold.")
+                        resume_hold = 0.0
+                    self.start_transition_timing(current_temp, target_temp)
+                    if self.boost_enabled:
+                        self.begin_setpoint_boost(current_temp, target_temp, tolerance)
+                
+            # Update transition timer every 5 seconds
+            if self.clock.time() - last_transition_update >= 5:
+                self.update_transition_timer()
+                hold_remaining = stabilization_time
+                if stabilization_start is not None:
+                    hold_remaining = max(0.0, stabilization_time - (self.clock.time() - stabilization_start))
+                self.update_forecast(current_temp, target_temp, tolerance, hold_remaining,
+                                     in_transition=stabilization_start is None)
+                last_transition_update = self.clock.time()
+                
+            in_tolerance = abs(current_temp - target_temp) <= tolerance
+            if not in_tolerance and stabilization_start is not None and settle.glitch:
+                # A lone outlier should not throw away the hold so far
+                self.log_message(f"Ignoring outlier reading {current_temp}°F during hold")
+                in_tolerance = True
+                
+            if in_tolerance:
+                if self.setpoint_boost.active:
+                    self.end_setpoint_boost(current_temp)
+                    
+                # Complete transition timing when we first reach target
+                if self.transition_start_time is not None:
+                    self.complete_transition_timing(current_temp)
+                    
+                if stabilization_start is None:
+                    stabilization_start = self.clock.time() - resume_hold
+                    self.run_state.update(hold_elapsed=resume_hold, hold_time=stabilization_time)
+                    if resume_hold:
+                        self.log_message(f"Temperature within range at {current_temp}°F. Resuming hold with "
+                                         f"{self.format_time(resume_hold)} of {self.format_time(stabilization_time)} done.")
+                        resume_hold = 0.0
+                    else:
+                        self.log_message(f"Temperature within range at {current_temp}°F. Starting {stabilization_time/60:.1f} minute hold timer.")
+                    self.show_timer(f"{self.format_time(self.run_state.hold_elapsed)}/{self.format_time(stabilization_time)}")
+                    self.write_checkpoint()
+                else:
+                    elapsed_time = self.clock.time() - stabilization_start
+                    self.run_state.update(hold_elapsed=elapsed_time)
+                    if self.checkpoint_due():
+                        self.write_checkpoint()
+                    
+                    # Update the hold timer every 10 seconds during stabilization
+                    if self.clock.time() - last_gui_update >= 10:
+                        self.update_timer_display(elapsed_time, stabilization_time)
+                        self.log_message(f"Stabilizing at {current_temp}°F - {self.format_time(elapsed_time)}/{self.format_time(stabilization_time)}")
+                        last_gui_update = self.clock.time()
+                    
+                    if elapsed_time >= stabilization_time:
+                        temp_stabilized = True
+                        self.log_message(f"Temperature stabilized at {current_temp}°F for {stabilization_time/60:.1f} minutes. ✓")
+                        self.show_timer("Complete")
+                    elif (self.early_settle and settle.settled
+                          and elapsed_time >= min(self.settle_min_hold, stabilization_time)):
+                        temp_stabilized = True
+                        self.log_message(f"Temperature settled at {current_temp}°F after {self.format_time(elapsed_time)} "
+                                         f"(trend {settle.slope:+.2f}°F/min, noise {settle.stddev:.2f}°F). Ending hold early. ✓")
+                        self.log_event_to_csv(f"Settled early after {elapsed_time / 60:.1f} min")
+                        self.show_timer("Settled")
+            else:
+                self.run_state.update(hold_elapsed=None)
+                if stabilization_start is not None:
+                    stabilization_start = None
+                    self.write_checkpoint()  # A restart must not credit the lost hold
+                self.show_timer("--:--")
+                self.log_message(f"Waiting for temperature to stabilize... Current: {current_temp}°F, Target: {target_temp}°F")
+                last_gui_update = self.clock.time()
+            
+            # Check for stop signal more frequently but read temp less frequently
+            for _ in range(temp_read_interval * 10):  # Check stop signal every 0.1 seconds
+                if self.stop_cycling:
+                    return False
+                self.clock.sleep(0.1)
+                
+        return temp_stabilized
+        
+    def reset_cycle_counter(self):
+        """Reset the cycle counter to zero"""
+        self.cycle_count = 0
+        self.log_message("Cycle counter reset to 0")
+
+    def reset_timing_data(self):
+        """Reset all transition timing data"""
+        self.heating_times = []
+        self.cooling_times = []
+        self.transition_start_time = None
+        self.transition_start_temp = None
+        self.current_transition_type = None
+        
+        # Reset displays
+        self.run_state.update(phase="Idle")
+        self.show_transition_timer("--:--")
+        self.show_transition_time("heating", None, None)
+        self.show_transition_time("cooling", None, None)
+        self.show_eta("--:--")
+        self.show_finish("--")
+        self.ramp_results = []
+        self.show_ramp("--")
+        
+        self.log_message("Transition timing data reset")
+        
+    def start_transition_timing(self, current_temp, target_temp):
+        """Start timing a temperature transition"""
+        self.transition_start_time = self.clock.time()
+        self.transition_start_temp = current_temp
+        self.transition_target = target_temp
+        self.transition_samples = [(self.transition_start_time, current_temp)]
+        self.transition_boosted = False
+        
+        # Determine transition type
+        if target_temp > current_temp:
+            self.current_transition_type = "heating"
+            self.run_state.update(phase="Heating")
+        else:
+            self.current_transition_type = "cooling"
+            self.run_state.update(phase="Cooling")
+            
+        self.show_transition_timer("00:00")
+        self.log_message(f"Started {self.current_transition_type} from {current_temp:.1f}°F to {target_temp:.1f}°F")
+        predicted = self.thermal_model.predict(current_temp, target_temp)
+        if predicted is not None:
+            self.log_message(f"Predicted {self.current_transition_type} time: {self.format_time(predicted)}")
+        
+    def begin_setpoint_boost(self, current_temp, target_temp, tolerance):
+        """Write a setpoint beyond the target to speed up the transition"""
+        setpoint = self.setpoint_boost.begin(current_temp, target_temp, tolerance)
+        if not self.setpoint_boost.active:
+            return
+        if self.write_temp(300, setpoint):
+            self.transition_boosted = True
+            self.log_message(f"Setpoint boost: driving to {setpoint:.1f}°F on the way to {target_temp:.1f}°F")
+        else:
+            self.setpoint_boost.release()  # The target is still in the chamber
+            self.log_message("Setpoint boost skipped: could not write the boosted setpoint")
+
+    def end_setpoint_boost(self, current_temp):
+        """Step the setpoint back to the real target; retried on the next reading if the write fails"""
+        target = self.setpoint_boost.target
+        if self.write_temp(300, target):
+            self.setpoint_boost.release()
+            self.log_message(f"Setpoint boost released at {current_temp:.1f}°F; setpoint back to {target:.1f}°F")
+        else:
+            self.log_message("Failed to step the boosted setpoint back; retrying")
+
+    def update_transition_timer(self):
+        """Update the transition timer display"""
+        if self.transition_start_time:
+            elapsed_time = self.clock.time() - self.transition_start_time
+            self.show_transition_timer(self.format_time(elapsed_time))
+            
+    def complete_transition_timing(self, final_temp):
+        """Complete timing a temperature transition and record the time"""
+        if self.transition_start_time and self.current_transition_type:
+            elapsed_time = self.clock.time() - self.transition_start_time
+            elapsed_minutes = elapsed_time / 60
+            
+            # Record the time
+            if self.current_transition_type == "heating":
+                self.heating_times.append(elapsed_time)
+                self.show_transition_time("heating", elapsed_time, sum(self.heating_times) / len(self.heating_times))
+            else:  # cooling
+                self.cooling_times.append(elapsed_time)
+                self.show_transition_time("cooling", elapsed_time, sum(self.cooling_times) / len(self.cooling_times))
+            
+            strategy = " with setpoint boost" if self.transition_boosted else ""
+            self.log_message(f"Completed {self.current_transition_type}{strategy} in {elapsed_minutes:.1f} minutes "
+                           f"(from {self.transition_start_temp:.1f}°F to {final_temp:.1f}°F)")
+            
+            # Log to CSV
+            self.log_event_to_csv(f"Completed {self.current_transition_type}{strategy}: {self.transition_start_temp:.1f}°F -> {final_temp:.1f}°F in {elapsed_minutes:.1f} min")
+            
+            # Learn the chamber's own response; a boosted transition would skew it
+            if not self.transition_boosted:
+                self.transition_samples.append((self.clock.time(), final_temp))
+                self.thermal_model.add_transition(self.current_transition_type, self.transition_samples,
+                                                  self.transition_target)
+                self.save_thermal_model()
+            
+            # Reset transition tracking
+            self.transition_start_time = None
+            self.transition_start_temp = None
+            self.current_transition_type = None
+            self.transition_target = None
+            self.transition_samples = []
+            self.transition_boosted = False
+            self.run_state.update(phase="Stabilizing")
+            self.show_transition_timer("--:--")
+            self.show_eta("--:--")
+
+    def update_forecast(self, current_temp, target_temp, tolerance, hold_remaining, in_transition):
+        """Show the transition ETA and, with a target cycle count, the projected finish time"""
+        eta = self.thermal_model.predict(current_temp, target_temp, tolerance) if in_transition else 0.0
+        if in_transition:
+            self.show_eta(self.format_time(eta) if eta is not None else "learning…")
+        
+        target_cycles = self.target_cycles()
+        steps = self.active_steps
+        if target_cycles is None or not steps or eta is None:
+            self.show_finish("--")
+            return
+        hold = self.hold_time_seconds
+        # Still to come in this pass: the rest of the current step, then the later steps
+        remaining = eta + hold_remaining
+        later = schedule_seconds(compile_schedule(steps[self.current_leg + 1:], target_temp, self.thermal_model,
+                                                  hold, tolerance))
+        remaining = None if later is None else remaining + later
+        cycles_after = target_cycles - self.cycle_count - 1
+        if remaining is not None and cycles_after > 0:
+            cycle = schedule_seconds(compile_schedule(steps, steps[-1].temp, self.thermal_model, hold, tolerance))
+            remaining = None if cycle is None else remaining + cycles_after * cycle
+        if remaining is None:
+            self.show_finish("learning…")
+        elif cycles_after < 0:
+            self.show_finish("Target reached")
+        else:
+            finish = self.clock.now() + timedelta(seconds=remaining)
+            self.show_finish(f"{finish:%a %H:%M} (cycle {target_cycles}, {remaining / 3600:.1f} h left)")
+
+    def log_schedule(self, profile):
+        """Log the steps of one pass with their planned start times"""
+        self.update_hold_time()
+        sample = self.sample_cache.latest()
+        start_temp = sample.value if sample is not None else profile.steps[0].temp
+        schedule = compile_schedule(profile.steps, start_temp, self.thermal_model, self.hold_time_seconds)
+        self.log_message(f"Running profile {profile.describe()}")
+        for index, planned in enumerate(schedule):
+            at = self.format_time(planned.offset) if planned.offset is not None else "?"
+            self.log_message(f"  {index + 1}. +{at} {planned.step.describe()}")
+        total = schedule_seconds(schedule)
+        if total is not None:
+            self.log_message(f"One pass takes about {total / 3600:.1f} hours")
+
+    @traced("control")
+    def set_target(self, temp):
+        """Write a new setpoint with retries and reconnects; False when it could not be set"""
+        self.log_message(f"Setting Temperature to: {temp}°F")
+        self.run_state.update(target=temp, hold_elapsed=None)
+        self.show_timer("--:--")
+        
+        # Enhanced temperature setting with multiple attempts
+        temp_set_attempts = 0
+        while temp_set_attempts < 3:
+            if self.write_temp(300, temp):
+                self.last_setpoint = temp
+                return True
+            
+            temp_set_attempts += 1
+            self.log_message(f"Failed to set temperature, attempt {temp_set_attempts}/3")
+            
+            if temp_set_attempts < 3:
+                if not self.reconnect_device():
+                    self.log_message("Cannot reconnect. Stopping cycling.")
+                    return False
+                self.clock.sleep(2)
+        
+        self.log_message("Failed to set temperature after 3 attempts. Stopping cycling.")
+        return False
+
+    @traced("control")
+    def run_profile_step(self, step, resume_elapsed=0.0):
+        """Run one profile step; False when cycling should stop
+
+        resume_elapsed is the part of a hold or dwell done before a restart.
+        A ramp is always restarted from the current temperature.
+        """
+        if step.kind == RAMP:
+            self.write_checkpoint()
+            return self.ramp_to(step.temp, step.rate)
+        if not self.set_target(step.temp):
+            return False
+        self.write_checkpoint()
+        if step.kind == DWELL:
+            return self.dwell(step.temp, step.hold_seconds, elapsed=resume_elapsed)
+        return self.wait_for_temp_stabilization(step.temp, stabilization_time=step.hold_seconds,
+                                                resume_hold=resume_elapsed)
+
+    @traced("control")
+    def dwell(self, temp, seconds, elapsed=0.0):
+        """Wait a fixed time at a setpoint, whether or not the chamber gets there"""
+        self.run_state.update(phase="Dwell", hold_elapsed=elapsed, hold_time=seconds)
+        if elapsed:
+            self.log_message(f"Resuming dwell at {temp}°F with {self.format_time(elapsed)} of {self.format_time(seconds)} done")
+        else:
+            self.log_message(f"Dwelling at {temp}°F for {self.format_time(seconds)}")
+        start = self.clock.time() - elapsed
+        last_gui_update = self.clock.time()
+        while not self.stop_cycling:
+            elapsed = self.clock.time() - start
+            self.run_state.update(hold_elapsed=elapsed)
+            if self.checkpoint_due():
+                self.write_checkpoint()
+            if elapsed >= seconds:
+                self.log_message(f"Dwell at {temp}°F complete")
+                self.show_timer("Complete")
+                return True
+            if self.clock.time() - last_gui_update >= 10:
+                self.update_timer_display(elapsed, seconds)
+                sample = self.sample_cache.latest()
+                if sample is not None:
+                    self.update_forecast(sample.value, temp, 2.5, seconds - elapsed, in_transition=False)
+                last_gui_update = self.clock.time()
+            self.clock.sleep(0.1)
+        return False
+
+    @traced("control")
+    def ramp_to(self, temp, rate):
+        """Stream setpoints along a line at rate °F/min, leading it by the chamber's measured lag"""
+        sample = self.sample_cache.latest()
+        start_temp = sample.value if sample is not None else self.last_setpoint
+        if start_temp is None:
+            self.log_message("Cannot start ramp: no temperature reading")
+            return False
+        ramp = RampController(start_temp, temp, rate, self.clock.time(), max_lead=self.ramp_max_lead)
+        self.log_message(f"Ramping from {start_temp:.1f}°F to {temp}°F at {rate}°F/min ({self.format_time(ramp.duration)})")
+        self.run_state.update(phase="Ramp", target=temp, hold_elapsed=None)
+        self.show_timer("--:--")
+        last_sequence = sample.sequence if sample is not None else None
+        pending = None  # Setpoint write waiting for its read-back
+        failures = 0
+        finish_by = None
+        while not self.stop_cycling:
+            now = self.clock.time()
+            sample = self.sample_cache.latest()
+            if sample is not None and sample.sequence != last_sequence:
+                last_sequence = sample.sequence
+                ramp.add_sample(sample.timestamp, sample.value)
+            
+            # Confirm the previous write once the bus has answered; never wait on it here
+            if pending is not None and all(future.done() for future in pending[2:]):
+                if self.setpoint_confirmed(pending):
+                    self.last_setpoint = pending[0]
+                    failures = 0
+                else:
+                    failures += 1
+                    self.consecutive_comm_failures += 1
+                    self.log_message(f"Ramp setpoint {pending[0]:.1f}°F not confirmed, attempt {failures}/3")
+                    if failures >= 3:
+                        if not self.reconnect_device():
+                            self.log_message("Cannot reconnect. Stopping cycling.")
+                            return False
+                        failures = 0
+                pending = None
+            if pending is None:
+                setpoint = ramp.setpoint(now)
+                if setpoint != self.last_setpoint:
+                    pending = self.submit_setpoint(setpoint)
+            
+            # Done once the target setpoint is confirmed and the chamber has covered
+            # 90% of the span, or has had as long again as the ramp to get there
+            if ramp.line_complete(now) and pending is None and self.last_setpoint == temp:
+                if finish_by is None:
+                    finish_by = now + max(300.0, ramp.duration)
+                if (sample is not None and ramp.progress(sample.value) >= 0.9) or now >= finish_by:
+                    self.record_ramp(ramp.result(now))
+                    return True
+            
+            deadline = now + self.ramp_step_seconds
+            while not self.stop_cycling and self.clock.time() < deadline:
+                self.clock.sleep(0.1)
+        return False
+
+    def submit_setpoint(self, value):
+        """Queue a setpoint write and its read-back on the bus without waiting for either"""
+        raw = int(value * (10 ** self.decimal))
+        return (value, raw, self.chamber.write(f"W 300, {raw}"), self.chamber.query("R? 300, 1"))
+
+    def setpoint_confirmed(self, pending):
+        """True when a submitted setpoint was written and reads back unchanged"""
+        value, raw, write, readback = pending
+        try:
+            write.result()
+            return int(readback.result()) == raw
+        except Exception as e:
+            self.log_message(f"Ramp setpoint {value:.1f}°F failed: {e}")
+            return False
+
+    def record_ramp(self, result):
+        """Log and show how closely a finished ramp followed its requested rate"""
+        self.ramp_results.append((self.cycle_count + 1, result))
+        self.log_message(f"Ramp complete in {self.format_time(result.duration)}: {result.describe()}")
+        self.log_event_to_csv(f"Ramp {result.describe()}")
+        deviation = result.deviation_percent
+        if deviation is not None and abs(deviation) > 10:
+            self.log_message(f"Warning: ramp rate off by {deviation:+.0f}% from the requested {result.requested_rate:g}°F/min")
+        self.show_ramp(f"Cycle {self.cycle_count + 1}: {result.describe()}")
+
+    def increment_cycle_counter(self):
+        """Increment the cycle counter and update display"""
+        self.cycle_count += 1
+        self.log_message(f"Completed cycle #{self.cycle_count}")
+
+    @traced("io")
+    def write_checkpoint(self):
+        """Save the run position to disk (worker thread)"""
+        if self.checkpoint_store is None:
+            return
+        state = self.run_state.snapshot()
+        checkpoint = {
+            "saved_at": self.clock.now().isoformat(timespec="seconds"),
+            "chamber": self.chamber_resource,
+            "profile": self.cycle_profile.to_dict() if self.cycle_profile is not None else None,
+            "low_temp": self.current_low_temp,
+            "high_temp": self.current_high_temp,
+            "hold_seconds": self.hold_time_seconds,
+            "cycle_count": state.cycle_count,
+            "passes": self.profile_passes,
+            "step": self.current_leg,
+            "phase": state.phase,
+            "target": state.target,
+            "hold_elapsed": state.hold_elapsed,
+            "heating_times": self.heating_times,
+            "cooling_times": self.cooling_times,
+        }
+        try:
+            self.checkpoint_store.save(checkpoint)
+        except OSError as e:
+            self.log_message(f"Could not save checkpoint: {e}")
+        self.last_checkpoint = self.clock.time()
+
+    def checkpoint_due(self):
+        return self.clock.time() - self.last_checkpoint >= self.checkpoint_interval
+
+    def saved_checkpoint(self):
+        """(checkpoint, position text) of a run that ended without a Stop, or None"""
+        checkpoint = self.checkpoint_store.load() if self.checkpoint_store is not None else None
+        if checkpoint is None or checkpoint.get("chamber") != self.chamber_resource:
+            return None
+        try:
+            profile = CycleProfile.from_dict(checkpoint["profile"]) if checkpoint.get("profile") else None
+            if profile is None:
+                profile = CycleProfile.two_point(float(checkpoint["low_temp"]), float(checkpoint["high_temp"]))
+            step = profile.steps[int(checkpoint["step"])]
+            cycle = int(checkpoint["cycle_count"]) + 1
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            self.log_message(f"Ignoring unreadable checkpoint: {e}")
+            self.checkpoint_store.clear()
+            return None
+        where = f"cycle {cycle}, step {int(checkpoint['step']) + 1} of {len(profile.steps)} ({step.describe()})"
+        held = checkpoint.get("hold_elapsed")
+        if held:
+            where += f", {self.format_time(held)} into the {'dwell' if step.kind == DWELL else 'hold'}"
+        return checkpoint, where
+
+    def resume_run(self, checkpoint):
+        """Restore a checkpoint's counters and profile, then start cycling from its step"""
+        if checkpoint.get("profile"):
+            self.cycle_profile = CycleProfile.from_dict(checkpoint["profile"])
+        else:
+            self.cycle_profile = None
+            self.current_low_temp = float(checkpoint["low_temp"])
+            self.current_high_temp = float(checkpoint["high_temp"])
+        if checkpoint.get("hold_seconds"):
+            self.hold_time_seconds = int(checkpoint["hold_seconds"])
+        self.cycle_count = int(checkpoint["cycle_count"])
+        self.heating_times = [float(t) for t in checkpoint.get("heating_times", [])]
+        self.cooling_times = [float(t) for t in checkpoint.get("cooling_times", [])]
+        self.show_profile(self.profile_text())
+        self.resume_state = checkpoint
+        self.log_message(f"Resuming at cycle {self.cycle_count + 1}, step {int(checkpoint['step']) + 1}")
+        self.log_event_to_csv(f"Resumed from checkpoint saved {checkpoint.get('saved_at', '')}")
+        return self.start_cycling()
+
+    def read_temp(self, addr, extended_timeout=False):
+        """Read temperature wrapper method"""
+        return self.read_temp_with_retry(addr, extended_timeout)
+
+    def write_temp(self, addr, value):
+        """Write temperature setpoint to the chamber"""
+        set_cmd = "W " + str(addr) + ", " + str(int(value * (10 ** self.decimal)))
+        return self.gpib_wrt_with_retry(set_cmd)
+
+    def gpib_rd(self, cmd):
+        """Single attempt GPIB read for backward compatibility"""
+        return self.gpib_rd_with_retry(cmd, 1)
+
+    def gpib_wrt(self, cmd):
+        """Single attempt GPIB write for backward compatibility"""
+        return self.gpib_wrt_with_retry(cmd, 1)
+
+    @traced("recovery")
+    def reconnect_device(self):
+        """Reconnect to the chamber, recording how long it took"""
+        started = self.clock.monotonic()
+        connected = self._reconnect_device()
+        self.metrics.reconnect(self.clock.monotonic() - started, connected)
+        return connected
+
+    def _reconnect_device(self):
+        """Enhanced reconnection with power cycling capability"""
+        self.log_message("Attempting to reconnect to GPIB device...")
+        
+        # If we've had too many consecutive failures, try power cycling
+        if self.consecutive_comm_failures >= self.max_comm_failures:
+            self.log_message("Too many communication failures - attempting power cycle recovery")
+            
+            # Try power cycling first
+            if self.power_cycle_chamber():
+                # Reset failure counter after power cycle
+                self.consecutive_comm_failures = 0
+                # Reconnect to power supply in case we lost it
+                self.connect_to_power_supply()
+            else:
+                self.log_message("Power cycle failed - proceeding with software reset")
+            ''' 
+            # Perform hardware reset regardless
+            if not self.force_hardware_reset():
+                return False
+                '''  
+        try:
+            # Close existing connections on the bus thread so no transaction is in flight
+            self.bus.submit(self._close_sessions, PRIORITY_CONTROL).result()
+            
+            # Wait before reconnecting
+            self.clock.sleep(3)  # Increased wait time
+            
+            # Reinitialize connection with fresh resource manager
+            self.bus.submit(self._open_chamber_session, PRIORITY_CONTROL).result()
+            
+            # Clear any pending operations
+            try:
+                self.chamber.submit(lambda session: session.clear()).result()
+                self.clock.sleep(1)
+            except:
+                pass
+            
+            # Test connection with multiple attempts
+            connection_verified = False
+            for attempt in range(5):  # More attempts
+                try:
+                    self.clock.sleep(2)  # Wait between attempts
+                    test_response = self.chamber.query("*IDN?").result()
+                    if test_response and test_response.strip():
+                        # Verify we can read decimal configuration and temperature
+                        status = self.read_chamber_status()
+                        if status is not None:
+                            self.decimal = status.decimal
+                            connection_verified = True
+                            break
+                    self.clock.sleep(2)  # Wait between attempts
+                except Exception as e:
+                    self.log_message(f"Connection verification attempt {attempt + 1} failed: {e}")
+                    continue
+            
+            if connection_verified:
+                self.is_connected = True
+                self.save_pacing()
+                self.consecutive_comm_failures = 0  # Reset failure counter
+                self.show_connection("Status: Reconnected", True)
+                self.log_message("Successfully reconnected to GPIB device")
+                # Reconnect to power supply if we lost it
+                if not self.power_supply:
+                    self.connect_to_power_supply()
+                return True
+            else:
+                raise Exception("Failed to verify stable connection after multiple attempts")
+                
+        except Exception as e:
+            self.is_connected = False
+            self.consecutive_comm_failures += 1
+            self.show_connection("Status: Connection Failed", False)
+            self.log_message(f"Reconnection failed: {e}")
+            return False
+
+    def _close_sessions(self):
+        """Close the chamber session and resource manager (runs on the bus thread)"""
+        if self.ics_4899a:
+            try:
+                self.ics_4899a.close()
+            except:
+                pass
+        
+        # Other chambers keep using a shared resource manager
+        if self.rm and self.shared_rm is None:
+            try:
+                self.rm.close()
+            except:
+                pass
+
+    def _open_chamber_session(self):
+        """Open a fresh chamber session with conservative settings (runs on the bus thread)"""
+        self.rm = self._create_resource_manager()
+        
+        # Try to open with more robust settings
+        self.ics_4899a = self.rm.open_resource(self.chamber_resource)
+        
+        # Configure with more conservative settings
+        self.ics_4899a.timeout = max(self.gpib_timeout, 10000)  # At least 10 seconds
+        self.ics_4899a.read_termination = '\n'
+        self.ics_4899a.write_termination = '\n'
+
+    def cycling_worker(self):
+        try:
+            low_temp = self.current_low_temp
+            high_temp = self.current_high_temp
+            
+            if self.cycle_profile is None:
+                self.log_message(f"Starting temperature cycling between {low_temp}°F and {high_temp}°F")
+            
+            # Reset communication failure counters at start
+            self.consecutive_comm_failures = 0
+            
+            # Turn chamber on with enhanced error checking
+            chamber_on_attempts = 0
+            while chamber_on_attempts < 3:
+                if self.gpib_wrt_with_retry("W 2000, 1"):
+                    break
+                chamber_on_attempts += 1
+                self.log_message(f"Failed to turn chamber on, attempt {chamber_on_attempts}/3")
+                if chamber_on_attempts < 3:
+                    if not self.reconnect_device():
+                        self.log_message("Cannot establish connection. Stopping...")
+                        return
+                    self.clock.sleep(2)
+                else:
+                    self.log_message("Failed to turn chamber on after 3 attempts. Stopping...")
+                    return
+            
+            self.clock.sleep(3)  # Longer delay after turning on
+            
+            # A resumed run starts its first pass at the checkpoint's step
+            resume = self.resume_state
+            self.resume_state = None
+            self.profile_passes = int(resume.get("passes", 0)) if resume else 0
+            first_step = int(resume["step"]) if resume else 0
+            while not self.stop_cycling:
+                profile = self.cycle_profile or CycleProfile.two_point(low_temp, high_temp)
+                self.active_steps = profile.steps
+                if self.profile_passes == 0 and resume is None:
+                    self.log_schedule(profile)
+                swapped = False
+                for i in range(min(first_step, len(profile.steps) - 1), len(profile.steps)):
+                    step = profile.steps[i]
+                    if self.stop_cycling:
+                        break
+                    # Profiles are only swapped between segments, never mid-hold or mid-ramp
+                    if i > first_step and self.swap_pending_profile():
+                        self.log_message(f"Previous profile stopped after step {i} of pass {self.profile_passes + 1}")
+                        swapped = True
+                        break
+                    self.current_leg = i
+                    self.show_profile(self.profile_text(i))
+                    
+                    # Credit the part of the hold or dwell that was done before the restart
+                    credit = float(resume.get("hold_elapsed") or 0.0) if resume else 0.0
+                    resume = None
+                    if not self.run_profile_step(step, resume_elapsed=credit):
+                        return  # Stop cycling was requested or error occurred
+                        
+                    if not self.stop_cycling:
+                        self.log_message(f"Temperature cycle at {step.temp}°F completed. Moving to next temperature...")
+                
+                first_step = 0
+                if swapped or self.stop_cycling:
+                    self.profile_passes = 0
+                    continue
+                
+                # A full pass through the profile is one cycle
+                self.profile_passes += 1
+                self.increment_cycle_counter()
+                # Apply any pending temp updates at the cycle boundary
+                if self.pending_update:
+                    low_temp = self.pending_low_temp
+                    high_temp = self.pending_high_temp
+                    self.current_low_temp = low_temp
+                    self.current_high_temp = high_temp
+                    self.pending_update = False
+                    self.show_temperatures(low_temp, high_temp)
+                    self.log_message(f"Applied new temperatures for next cycle: Low={low_temp}°F, High={high_temp}°F")
+                if self.swap_pending_profile():
+                    self.profile_passes = 0
+                elif profile.repeat is not None and self.profile_passes >= profile.repeat:
+                    self.log_message(f"Profile {profile.name} complete after {self.profile_passes} passes.")
+                    self.log_event_to_csv(f"Profile complete: {profile.name}")
+                    self.discard_checkpoint = True
+                    break
+                        
+        except Exception as e:
+            self.log_message(f"An error occurred: {e}")
+        finally:
+            # Enhanced chamber shutdown
+            if self.is_connected:
+                shutdown_attempts = 0
+                while shutdown_attempts < 3:
+                    if self.gpib_wrt_with_retry("W 2000, 0"):
+                        self.log_message("Chamber turned off.")
+                        break
+                    shutdown_attempts += 1
+                    if shutdown_attempts < 3:
+                        self.log_message(f"Failed to turn off chamber, attempt {shutdown_attempts}/3")
+                        self.clock.sleep(2)
+                    else:
+                        self.log_message("Warning: Could not confirm chamber was turned off after 3 attempts.")
+            
+            self.save_pacing()
+            
+            # A Stop or a finished profile is not resumed; a failure keeps its checkpoint
+            if self.discard_checkpoint and self.checkpoint_store is not None:
+                self.checkpoint_store.clear()
+            
+            # Reset UI state
+            self.run_state.update(status="Stopped", target=None, phase="Idle", hold_elapsed=None, hold_time=None)
+            self.show_timer("--:--")
+            self.show_transition_timer("--:--")
+            self.show_eta("--:--")
+            self.show_finish("--")
+            self.show_profile(self.profile_text())
+            self.stop_cycling = False
+            self.publish_state()
+            self.on_cycling_stopped()
+
+    def is_cycling(self):
+        return self.cycling_thread is not None and self.cycling_thread.is_alive()
+
+    def start_cycling(self):
+        """Check the plan and start the cycling worker thread; False when it cannot start"""
+        if not self.is_connected:
+            self.log_message("Error: Not connected to device. Attempting reconnection...")
+            if not self.reconnect_device():
+                self.log_message("Cannot start cycling - no device connection")
+                return False
+        
+        if self.current_low_temp is None:
+            self.current_low_temp = float(self.profile.get("low_temp", 32))
+        if self.current_high_temp is None:
+            self.current_high_temp = float(self.profile.get("high_temp", 140))
+        try:
+            # Check the whole plan against the chamber limits before anything moves
+            profile = self.cycle_profile or CycleProfile.two_point(self.current_low_temp, self.current_high_temp)
+            profile.validate(self.min_temp, self.max_temp, self.max_ramp_rate)
+        except ProfileError as e:
+            self.log_message(f"Cannot start cycling: {e}")
+            return False
+        
+        self.stop_cycling = False
+        self.discard_checkpoint = False
+        self.run_state.update(status="Running")
+        self.publish_state()
+        
+        # Start cycling in a separate thread
+        self.cycling_thread = threading.Thread(target=self.cycling_worker, daemon=True)
+        self.clock.add_worker(self.cycling_thread)
+        self.cycling_thread.start()
+        return True
+        
+    def stop_cycling_func(self):
+        """Ask the worker to stop after the current operation; a stopped run is not resumed"""
+        self.stop_cycling = True
+        self.discard_checkpoint = True
+        self.log_message("Stop signal sent. Waiting for current operation to complete...")
+        self.run_state.update(status="Stopping...")
+        self.publish_state()
+
+    def shutdown(self):
+        """Stop cycling, turn the chamber off and release its resources"""
+        self.stop_cycling = True
+        if self.cycling_thread and self.cycling_thread.is_alive():
+            self.log_message("Waiting for cycling to stop...")
+            with self.clock.blocked():
+                self.cycling_thread.join(timeout=5)
+            
+        self.sampler.stop()
+        
+        if self.is_connected and self.ics_4899a:
+            try:
+                self.gpib_wrt("W 2000, 0")  # Turn chamber off
+            except:
+                pass
+        
+        # Let queued transactions finish before the session is closed
+        if self.owns_bus:
+            self.bus.stop()
+        self.save_pacing()
+        
+        if self.csv_log:
+            self.csv_log.close()  # Drains rows still queued
+        
+        # Close power supply connection
+        if self.power_supply:
+            try:
+                self.power_supply.close()
+            except:
+                pass
+                
+        if self.ics_4899a:
+            try:
+                self.chamber.submit(lambda session: session.close()).result()
+            except:
+                pass
+                
+        if self.rm and self.shared_rm is None:
+            try:
+                self.rm.close()
+            except:
+                pass
+        
+        self.activity_log.close()
+
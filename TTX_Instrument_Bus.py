@@ -0,0 +1,216 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+
+from TTX_Clock import SystemClock
+from TTX_Tracing import NULL_TRACER
+
+# Queue priorities - lower numbers are served first
+PRIORITY_SAFETY = 0      # Chamber on/off (register 2000)
+PRIORITY_SETPOINT = 1    # Setpoint and other configuration writes
+PRIORITY_CONTROL = 2     # Connection checks, configuration reads, session housekeeping
+PRIORITY_TELEMETRY = 3   # Periodic temperature polling
+_PRIORITY_SHUTDOWN = 99  # Runs after everything already queued
+
+
+def command_priority(cmd):
+    """Pick the default queue priority for a raw ICS-4899A command"""
+    text = cmd.strip().upper()
+    if text.startswith("W "):
+        addr = text[2:].split(",")[0].strip()
+        if addr == "2000":
+            return PRIORITY_SAFETY
+        return PRIORITY_SETPOINT
+    if text.startswith("R? 100,") or text.startswith("R? 100 "):
+        return PRIORITY_TELEMETRY
+    return PRIORITY_CONTROL
+
+
+class InstrumentBus:
+    """Single owner thread for every transaction on a GPIB controller
+
+    Callers never touch a pyvisa session directly. They submit work and get a
+    concurrent.futures.Future back; the owner thread runs requests one at a
+    time in priority order (FIFO within a priority). On a jump-mode clock the
+    owner thread is a worker while it has work, and callers waiting on a
+    Future count as blocked on it.
+    """
+
+    def __init__(self, name="GPIB0", tracer=None, clock=None):
+        self.name = name
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.clock = clock if clock is not None else SystemClock()
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._thread = None
+        self._running = False   # Accepting work; cleared by stop()
+        self._draining = False  # Owner thread still running queued work, so submit() keeps queueing
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the owner thread"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._draining = True
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-bus", daemon=True)
+            self.clock.add_worker(self._thread)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """Finish the queued work, then stop the owner thread"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put((_PRIORITY_SHUTDOWN, next(self._sequence), None, None))
+            thread = self._thread
+        if thread is not threading.current_thread():
+            with self.clock.blocked():
+                thread.join(timeout=timeout)
+
+    def is_running(self):
+        return self._running
+
+    def submit(self, func, priority=PRIORITY_CONTROL):
+        """Queue func() to run on the owner thread and return its Future"""
+        future = _BusFuture(self.clock)
+        with self._lock:
+            queued = self._draining and threading.current_thread() is not self._thread
+            if queued:
+                self._queue.put((priority, next(self._sequence), future, func))
+                self.clock.set_blocked(self._thread, False)
+        # Re-entrant calls from the owner thread and calls made once it has
+        # exited run inline so that final safety writes are never dropped.
+        if not queued:
+            self._execute(future, func)
+        return future
+
+    def attach(self, session_getter, name=None, pacer=None):
+        """Create a channel for one instrument session on this bus"""
+        return BusChannel(self, session_getter, name, pacer)
+
+    def _execute(self, future, func):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._queue.empty():
+                    self.clock.set_blocked(self._thread, True)  # Idle until submit() queues work
+            _, _, future, func = self._queue.get()
+            if func is None:
+                with self._lock:
+                    if self._queue.empty():
+                        self._draining = False
+                        break
+                # Work was queued while the marker was being taken; run it first
+                self._queue.put((_PRIORITY_SHUTDOWN, next(self._sequence), None, None))
+                continue
+            self._execute(future, func)
+
+
+class _BusFuture(Future):
+    """Future whose waiting threads count as blocked on the bus, not running
+
+    The bus marks them running again before it publishes the outcome, so a
+    jump-mode clock never sees a moment where everyone looks idle in between.
+    """
+
+    def __init__(self, clock):
+        super().__init__()
+        self._clock = clock
+        self._blocked_threads = set()
+        self._blocked_lock = threading.Lock()
+
+    def result(self, timeout=None):
+        thread = threading.current_thread()
+        with self._blocked_lock:
+            waiting = not self.done()
+            if waiting:
+                self._blocked_threads.add(thread)
+                self._clock.set_blocked(thread, True)
+        try:
+            return super().result(timeout)
+        finally:
+            if waiting:
+                with self._blocked_lock:
+                    self._blocked_threads.discard(thread)
+                self._clock.set_blocked(thread, False)
+
+    def _finish(self, outcome, value):
+        with self._blocked_lock:
+            for thread in self._blocked_threads:
+                self._clock.set_blocked(thread, False)
+            outcome(value)
+
+    def set_result(self, result):
+        self._finish(super().set_result, result)
+
+    def set_exception(self, exception):
+        self._finish(super().set_exception, exception)
+
+
+class BusChannel:
+    """Handle used to talk to one instrument through a shared InstrumentBus
+
+    When a pacer is given, every query and write waits out the instrument's
+    learned inter-command gap and reports its turnaround back to the pacer.
+    """
+
+    def __init__(self, bus, session_getter, name=None, pacer=None):
+        self.bus = bus
+        self.session_getter = session_getter
+        self.name = name
+        self.pacer = pacer
+
+    def submit(self, func, priority=PRIORITY_CONTROL):
+        """Run func(session) on the bus thread"""
+        return self.bus.submit(lambda: func(self.session_getter()), priority)
+
+    def _paced(self, func):
+        if self.pacer is None:
+            return func()
+        return self.pacer.call(func)
+
+    def _transaction(self, cmd, op, func):
+        """Run func paced; traced as one span with the instrument I/O nested inside"""
+        tracer = self.bus.tracer
+        if not tracer.enabled:
+            return self._paced(func)
+
+        def io():
+            with tracer.span(op, "visa", cmd=cmd):
+                return func()
+        with tracer.span(cmd.split(",")[0].strip(), "gpib", cmd=cmd, instrument=self.name):
+            return self._paced(io)
+
+    def query(self, cmd, priority=None, timeout=None):
+        """Queue a query; timeout (ms) applies to this transaction only"""
+        if priority is None:
+            priority = command_priority(cmd)
+
+        def transaction(session):
+            if timeout is None:
+                return self._transaction(cmd, "query", lambda: session.query(cmd))
+            original_timeout = session.timeout
+            session.timeout = timeout
+            try:
+                return self._transaction(cmd, "query", lambda: session.query(cmd))
+            finally:
+                session.timeout = original_timeout
+
+        return self.submit(transaction, priority)
+
+    def write(self, cmd, priority=None):
+        """Queue a write"""
+        if priority is None:
+            priority = command_priority(cmd)
+        return self.submit(lambda session: self._transaction(cmd, "write", lambda: session.write(cmd)), priority)
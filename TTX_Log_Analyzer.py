@@ -0,0 +1,271 @@
+import argparse
+import math
+import os
+import sys
+import time
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # Only the analyzer needs pandas; see Python_Installation.bat
+    np = pd = None
+from TTX_Log_Index import TIMESTAMP_FORMAT, detect_encoding, expand_log_args, log_parts, parse_time, read_slice
+
+COLUMNS = ["timestamp", "temperature", "target", "cycle", "phase", "event"]  # CSV_HEADER, by position
+TRANSITION_PHASES = ("Heating", "Cooling", "Ramp")
+HOLD_PHASES = {"Stabilizing": "Soak", "Dwell": "Dwell"}
+
+# Running totals kept per segment and per cycle; each merges across chunk boundaries
+_SUMMED = ("rows", "samples", "temp_sum", "in_tolerance")
+
+
+def _merge(into, later):
+    """Combine the running totals of a segment (or cycle) with the rows that followed it"""
+    for key in _SUMMED:
+        into[key] += later[key]
+    into["end"] = later["end"]
+    into["temp_min"] = float(np.fmin(into["temp_min"], later["temp_min"]))  # fmin/fmax skip NaN
+    into["temp_max"] = float(np.fmax(into["temp_max"], later["temp_max"]))
+    into["max_deviation"] = float(np.fmax(into["max_deviation"], later["max_deviation"]))
+    if math.isnan(into["first_temp"]):
+        into["first_temp"] = later["first_temp"]
+    if not math.isnan(later["last_temp"]):
+        into["last_temp"] = later["last_temp"]
+
+
+class LogAnalyzer:
+    """Per-cycle statistics, transitions and holds rebuilt from temperature-cycle CSV logs
+
+    Logs are read chunk_rows rows at a time. Each chunk is cut into segments
+    (consecutive rows with the same phase, target and cycle count) and
+    summarized with vectorized group-bys; only those per-segment and
+    per-cycle totals are kept, and the segment still running at the end of
+    a chunk is carried into the next one. Memory therefore grows with the
+    number of transitions and holds, never with the number of rows.
+
+    Event rows repeat the last reading, so they mark time but are left out
+    of the temperature statistics. A soak sample is compliant when it is
+    within tolerance of the target.
+    """
+
+    def __init__(self, tolerance=2.5, chunk_rows=100000):
+        self.tolerance = tolerance
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.skipped_rows = 0  # Unparseable timestamps
+        self.segments = []     # Finished segments, oldest first
+        self._open = None      # Segment still running at the end of the last chunk
+        self._cycles = {}      # Cycle count -> running totals
+
+    def feed_file(self, path):
+        encoding = detect_encoding(path)
+        reader = pd.read_csv(path, names=COLUMNS, header=0, usecols=range(len(COLUMNS)), encoding=encoding,
+                             dtype={"phase": "string", "event": "string"}, chunksize=self.chunk_rows,
+                             on_bad_lines="skip")
+        for chunk in reader:
+            self.feed(chunk)
+
+    def feed_rows(self, rows):
+        """Add log rows already read as lists of strings, e.g. one slice from read_slice()"""
+        rows = [row[:len(COLUMNS)] for row in rows if len(row) >= len(COLUMNS)]
+        for start in range(0, len(rows), self.chunk_rows):
+            chunk = pd.DataFrame(rows[start:start + self.chunk_rows], columns=COLUMNS)
+            chunk["event"] = chunk["event"].mask(chunk["event"] == "")  # As read_csv reads an empty field
+            self.feed(chunk)
+
+    def feed(self, chunk):
+        """Add one DataFrame of log rows (COLUMNS) in file order"""
+        self.rows += len(chunk)
+        timestamps = pd.to_datetime(chunk["timestamp"], format=TIMESTAMP_FORMAT, errors="coerce")
+        valid = timestamps.notna()
+        self.skipped_rows += int((~valid).sum())
+        chunk = chunk.loc[valid]
+        if chunk.empty:
+            return
+        temperature = pd.to_numeric(chunk["temperature"], errors="coerce")
+        sample = chunk["event"].isna().to_numpy() & temperature.notna().to_numpy()
+        temperature = temperature.where(sample)
+        target = pd.to_numeric(chunk["target"], errors="coerce")
+        deviation = (temperature - target).abs()
+        frame = pd.DataFrame({
+            "ts": timestamps.loc[valid],
+            "phase": chunk["phase"].fillna("").astype(str),
+            "target": target,
+            "cycle": pd.to_numeric(chunk["cycle"], errors="coerce").fillna(-1).astype(np.int64),
+            "temperature": temperature,
+            "sample": sample.astype(np.int64),
+            "in_tolerance": (deviation <= self.tolerance).astype(np.int64),
+            "deviation": deviation,
+        })
+
+        # A new segment starts wherever the phase, target or cycle count changes
+        key_target = frame["target"].fillna(-math.inf)
+        boundary = ((frame["phase"] != frame["phase"].shift())
+                    | (key_target != key_target.shift())
+                    | (frame["cycle"] != frame["cycle"].shift()))
+        frame["segment"] = boundary.cumsum()
+        groups = frame.groupby("segment", sort=True)
+        summary = groups.agg(
+            phase=("phase", "first"), target=("target", "first"), cycle=("cycle", "first"),
+            start=("ts", "first"), end=("ts", "last"), rows=("ts", "size"), samples=("sample", "sum"),
+            temp_min=("temperature", "min"), temp_max=("temperature", "max"), temp_sum=("temperature", "sum"),
+            first_temp=("temperature", "first"), last_temp=("temperature", "last"),
+            in_tolerance=("in_tolerance", "sum"), max_deviation=("deviation", "max"))
+        self._add_cycles(frame)
+
+        for segment in summary.to_dict("records"):
+            segment["target"] = None if math.isnan(segment["target"]) else segment["target"]
+            if self._open is not None and all(self._open[k] == segment[k] for k in ("phase", "target", "cycle")):
+                _merge(self._open, segment)
+                continue
+            self._close_open(segment["start"])
+            self._open = segment
+
+    def _add_cycles(self, frame):
+        in_soak = (frame["phase"] == "Stabilizing").to_numpy()
+        frame = frame.assign(soak_samples=frame["sample"] * in_soak,
+                             soak_in_tolerance=frame["in_tolerance"] * in_soak,
+                             soak_deviation=frame["deviation"].where(in_soak))
+        summary = frame.groupby("cycle", sort=True).agg(
+            start=("ts", "first"), end=("ts", "last"), rows=("ts", "size"), samples=("sample", "sum"),
+            temp_min=("temperature", "min"), temp_max=("temperature", "max"), temp_sum=("temperature", "sum"),
+            first_temp=("temperature", "first"), last_temp=("temperature", "last"),
+            in_tolerance=("soak_in_tolerance", "sum"), soak_samples=("soak_samples", "sum"),
+            max_deviation=("soak_deviation", "max"))
+        for cycle, totals in summary.to_dict("index").items():
+            existing = self._cycles.get(cycle)
+            if existing is None:
+                self._cycles[cycle] = totals
+            else:
+                existing["soak_samples"] += totals["soak_samples"]
+                _merge(existing, totals)
+
+    def _close_open(self, next_start):
+        if self._open is not None:
+            # A segment lasts until the next one starts, so no time falls between segments
+            self._open["until"] = next_start
+            self.segments.append(self._open)
+            self._open = None
+
+    def finish(self):
+        """Close the last segment; returns (cycles, transitions, holds) DataFrames"""
+        if self._open is not None:
+            self._close_open(self._open["end"])
+        segments = pd.DataFrame(self.segments)
+        if segments.empty:
+            empty = pd.DataFrame()
+            return empty, empty, empty
+        segments["minutes"] = (segments["until"] - segments["start"]).dt.total_seconds() / 60
+        segments["cycle_number"] = segments["cycle"] + 1  # The log holds cycles completed so far
+        measured = segments[segments["samples"] > 0]  # Not just an event row, e.g. "Profile complete"
+
+        transitions = measured[measured["phase"].isin(TRANSITION_PHASES)]
+        transitions = pd.DataFrame({
+            "cycle": transitions["cycle_number"],
+            "kind": transitions["phase"],
+            "target": transitions["target"],
+            "start": transitions["start"],
+            "minutes": transitions["minutes"].round(2),
+            "start_temp": transitions["first_temp"],
+            "end_temp": transitions["last_temp"],
+            "rate_f_per_min": ((transitions["last_temp"] - transitions["first_temp"])
+                               / transitions["minutes"].where(transitions["minutes"] > 0)).round(2),
+        }).reset_index(drop=True)
+
+        holds = measured[measured["phase"].isin(list(HOLD_PHASES))]
+        holds = pd.DataFrame({
+            "cycle": holds["cycle_number"],
+            "kind": holds["phase"].map(HOLD_PHASES),
+            "target": holds["target"],
+            "start": holds["start"],
+            "minutes": holds["minutes"].round(2),
+            "samples": holds["samples"],
+            "min_temp": holds["temp_min"],
+            "max_temp": holds["temp_max"],
+            "mean_temp": (holds["temp_sum"] / holds["samples"].where(holds["samples"] > 0)).round(2),
+            "in_tolerance_pct": (100 * holds["in_tolerance"] / holds["samples"].where(holds["samples"] > 0)).round(1),
+            "max_deviation": holds["max_deviation"].round(2),
+        }).reset_index(drop=True)
+
+        time_in = segments.pivot_table(index="cycle", columns="phase", values="minutes", aggfunc="sum", fill_value=0)
+        counts = measured[measured["phase"].isin(TRANSITION_PHASES)].groupby("cycle").size()
+        last_cycle = max(self._cycles)
+        rows = []
+        for cycle, totals in sorted(self._cycles.items()):
+            if totals["samples"] == 0:
+                continue
+            spent = time_in.loc[cycle] if cycle in time_in.index else pd.Series(dtype=float)
+            soak = totals["soak_samples"]
+            rows.append({
+                "cycle": cycle + 1,
+                "start": totals["start"],
+                "end": totals["end"],
+                "minutes": round((totals["end"] - totals["start"]).total_seconds() / 60, 2),
+                "samples": int(totals["samples"]),
+                "min_temp": totals["temp_min"],
+                "max_temp": totals["temp_max"],
+                "heating_min": round(float(spent.get("Heating", 0)), 2),
+                "cooling_min": round(float(spent.get("Cooling", 0)), 2),
+                "ramp_min": round(float(spent.get("Ramp", 0)), 2),
+                "hold_min": round(float(sum(spent.get(phase, 0) for phase in HOLD_PHASES)), 2),
+                "transitions": int(counts.get(cycle, 0)),
+                "soak_compliance_pct": round(100 * totals["in_tolerance"] / soak, 1) if soak else None,
+                "max_soak_deviation": round(totals["max_deviation"], 2) if soak else None,
+                "complete": cycle != last_cycle,
+            })
+        return pd.DataFrame(rows), transitions, holds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-cycle statistics from temperature cycling CSV logs")
+    parser.add_argument("logs", nargs="+", help="temp_cycle_log_*.csv files; rotated _partNNN files are included")
+    parser.add_argument("--tolerance", type=float, default=2.5, help="Soak tolerance, °F (default 2.5)")
+    parser.add_argument("--chunk-rows", type=int, default=100000, help="Rows read at a time (default 100000)")
+    parser.add_argument("--transitions", action="store_true", help="Also list every transition")
+    parser.add_argument("--holds", action="store_true", help="Also list every soak and dwell")
+    parser.add_argument("--output-dir", help="Write <log>_cycles.csv, _transitions.csv and _holds.csv here")
+    parser.add_argument("--cycle", type=int, help="Analyze only this cycle, found through the log index")
+    parser.add_argument("--since", type=parse_time, help="Analyze only rows from this time (YYYY-MM-DD HH:MM)")
+    parser.add_argument("--until", type=parse_time, help="Analyze only rows up to this time")
+    args = parser.parse_args()
+    if pd is None:
+        parser.error("pandas is not installed; run Python_Installation.bat or pip install pandas")
+
+    sliced = args.cycle is not None or args.since or args.until
+    for path in expand_log_args(args.logs):
+        started = time.perf_counter()
+        analyzer = LogAnalyzer(args.tolerance, args.chunk_rows)
+        try:
+            if sliced:
+                analyzer.feed_rows(read_slice(path, args.cycle, args.since, args.until))
+            else:
+                for part in log_parts(path):
+                    analyzer.feed_file(part)
+        except (OSError, ValueError) as e:
+            print(f"{path}: could not read log: {e}", file=sys.stderr)
+            continue
+        cycles, transitions, holds = analyzer.finish()
+        if sliced and not cycles.empty:
+            cycles = cycles.drop(columns="complete")  # Only the selected rows were read
+        elapsed = time.perf_counter() - started
+        print(f"\n{path}: {analyzer.rows} rows, {len(cycles)} cycles, {len(transitions)} transitions, "
+              f"{len(holds)} holds ({elapsed:.1f} s)")
+        if analyzer.skipped_rows:
+            print(f"Skipped {analyzer.skipped_rows} rows without a valid timestamp")
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            if not cycles.empty:
+                print(cycles.to_string(index=False))
+            if args.transitions and not transitions.empty:
+                print("\nTransitions:")
+                print(transitions.to_string(index=False))
+            if args.holds and not holds.empty:
+                print("\nHolds:")
+                print(holds.to_string(index=False))
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            name = os.path.splitext(os.path.basename(path))[0]
+            for suffix, table in (("cycles", cycles), ("transitions", transitions), ("holds", holds)):
+                table.to_csv(os.path.join(args.output_dir, f"{name}_{suffix}.csv"), index=False, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
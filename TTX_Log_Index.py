@@ -0,0 +1,348 @@
+import argparse
+import csv
+import glob
+import io
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+INDEX_HEADER = ["Offset", "Row", "Timestamp", "Cycle Count", "Phase", "Reason"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIME_STEP_CHARS = 15  # Timestamps agreeing up to "YYYY-MM-DD HH:M" share an entry: one every ten minutes
+
+
+def index_path(log_path):
+    """<name>.idx next to <name>.csv"""
+    return os.path.splitext(log_path)[0] + ".idx"
+
+
+def detect_encoding(path):
+    """utf-8 for logs written on Linux, cp1252 for the °F header Windows writes by default"""
+    with open(path, "rb") as f:
+        header = f.readline()
+    try:
+        header.decode("utf-8")
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+def log_parts(path):
+    """A log followed by its rotated parts (<name>_part002.csv, ...) in order"""
+    root, ext = os.path.splitext(path)
+    return [path] + sorted(glob.glob(glob.escape(root) + "_part[0-9][0-9][0-9]" + ext))
+
+
+def first_part(path):
+    """<name>.csv for a rotated <name>_partNNN.csv, else None"""
+    match = re.match(r"(.*)_part\d{3}(\.\w+)$", path)
+    return match.group(1) + match.group(2) if match else None
+
+
+def expand_log_args(patterns):
+    """Log paths from command line arguments, with wildcards expanded as cmd.exe leaves them to the program
+
+    Rotated parts are left out when their first file is listed, since they
+    are read with it.
+    """
+    paths = [path for pattern in patterns for path in (sorted(glob.glob(pattern)) or [pattern])]
+    return [path for path in paths if first_part(path) not in paths]
+
+
+def parse_time(text):
+    """"YYYY-MM-DD HH:MM[:SS]" in the log's own format, so it compares with log timestamps as text"""
+    for pattern in (TIMESTAMP_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%d %H", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text.strip().replace("T", " "), pattern).strftime(TIMESTAMP_FORMAT)
+        except ValueError:
+            pass
+    raise ValueError(f"'{text}' is not a time like 2025-11-04 12:30")
+
+
+class IndexBuilder:
+    """Picks the rows of a log that get an index entry
+
+    An entry is made for the first row, whenever the cycle count or phase
+    changes, and for the first row of each ten-minute window, so any cycle
+    or time can be found by reading at most ten minutes of rows.
+    """
+
+    def __init__(self, rows=0, last=None):
+        self.rows = rows    # Data rows seen, i.e. the row number of the next one
+        self._last = last   # (cycle, phase, time window) of the previous row
+
+    def add(self, offset, timestamp, cycle, phase):
+        """Index entry for the row starting at byte offset, or None"""
+        row_number = self.rows
+        self.rows += 1
+        if len(timestamp) != len("YYYY-MM-DD HH:MM:SS"):
+            return None  # Not a log row (e.g. a torn last line)
+        key = (cycle, phase, timestamp[:TIME_STEP_CHARS])
+        last, self._last = self._last, key
+        if last is None:
+            reason = "start"
+        elif cycle != last[0]:
+            reason = "cycle"
+        elif phase != last[1]:
+            reason = "phase"
+        elif key[2] != last[2]:
+            reason = "time"
+        else:
+            return None
+        return [offset, row_number, timestamp, cycle, phase, reason]
+
+
+class LogIndexWriter:
+    """Sidecar index kept up to date as TelemetryWriter writes a log file
+
+    The writer passes every row with its size in bytes; offsets are counted
+    here, so the log itself is never asked for its position.
+    """
+
+    def __init__(self, log_path, header_size):
+        self.path = index_path(log_path)
+        self.offset = header_size  # Byte offset of the next row in the log
+        self.builder = IndexBuilder()
+        self.file = open(self.path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(INDEX_HEADER)
+
+    def add(self, row, size):
+        entry = self.builder.add(self.offset, str(row[0]), str(row[3]), str(row[4]))
+        self.offset += size
+        if entry is not None:
+            self.writer.writerow(entry)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        try:
+            self.file.close()
+        except OSError:
+            pass
+
+
+def _scan(f, offset, builder):
+    """Index entries for every row of an open binary log from offset to the end"""
+    f.seek(offset)
+    entries = []
+    for line in f:
+        if not line.endswith(b"\n"):
+            break  # Still being written
+        fields = line.split(b",", 5)  # Timestamp, numbers and phase never contain commas or quotes
+        if len(fields) >= 5:
+            entry = builder.add(offset, fields[0].decode("ascii", "replace"), fields[3].decode("ascii", "replace"),
+                                fields[4].decode("ascii", "replace").rstrip("\r\n"))
+            if entry is not None:
+                entries.append(entry)
+        else:
+            builder.rows += 1
+        offset += len(line)
+    return entries
+
+
+def _row_at(f, offset, timestamp):
+    """True when the log has a row starting at offset with this timestamp"""
+    f.seek(offset)
+    return f.read(len(timestamp) + 1) == (timestamp + ",").encode("ascii")
+
+
+class LogIndex:
+    """Index entries of one log file, for reading one cycle or time window without scanning the file
+
+    Entries are [offset, row, timestamp, cycle count, phase, reason] in file
+    order. Rows written after the last saved entry (a log still being
+    written, or one cut short by a crash) are indexed on load by reading on
+    from that entry.
+    """
+
+    def __init__(self, log_path, entries):
+        self.log_path = log_path
+        self.entries = entries
+
+    @classmethod
+    def scan(cls, log_path):
+        """Index a log by reading it once"""
+        with open(log_path, "rb") as f:
+            header_size = len(f.readline())
+            return cls(log_path, _scan(f, header_size, IndexBuilder()))
+
+    def save(self):
+        """Write the index next to the log, replacing any old one"""
+        path = index_path(self.log_path)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(INDEX_HEADER)
+            writer.writerows(self.entries)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, log_path):
+        """The saved index brought up to date, or None when there is none or it does not match the log"""
+        try:
+            with open(index_path(log_path), "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                if next(reader, None) != INDEX_HEADER:
+                    return None
+                entries = [[int(e[0]), int(e[1]), e[2], e[3], e[4], e[5]] for e in reader if len(e) == 6]
+            with open(log_path, "rb") as f:
+                if entries:
+                    if not (_row_at(f, entries[0][0], entries[0][2]) and _row_at(f, entries[-1][0], entries[-1][2])):
+                        return None
+                    offset, row, timestamp, cycle, phase, _ = entries[-1]
+                    builder = IndexBuilder(row, (cycle, phase, timestamp[:TIME_STEP_CHARS]))
+                else:
+                    offset, builder = len(f.readline()), IndexBuilder()
+                tail = _scan(f, offset, builder)
+        except (OSError, ValueError, IndexError):
+            return None
+        return cls(log_path, entries + tail)
+
+    @classmethod
+    def open(cls, log_path):
+        """The saved index, or a new one (saved if possible) when it is missing or out of date"""
+        index = cls.load(log_path)
+        if index is None:
+            index = cls.scan(log_path)
+            try:
+                index.save()
+            except OSError:
+                pass  # E.g. on Windows while the program writing the log holds the old index open
+        return index
+
+    def cycle_span(self, cycle_count):
+        """(start, end) byte offsets of the first stretch of rows with this cycle count
+
+        end is None for the end of the file; None is returned when the log
+        never reached the count.
+        """
+        cycle_count = str(cycle_count)
+        start = None
+        for entry in self.entries:
+            if start is None:
+                if entry[3] == cycle_count:
+                    start = entry[0]
+            elif entry[3] != cycle_count:
+                return start, entry[0]
+        return None if start is None else (start, None)
+
+    def time_span(self, since=None, until=None):
+        """(start, end) byte offsets covering timestamps since..until (text as in the log; None is open)"""
+        if not self.entries:
+            return None
+        start = self.entries[0][0]
+        for entry in self.entries:
+            if since is not None and entry[2] <= since:
+                start = entry[0]
+            if until is not None and entry[2] > until:
+                return (start, entry[0]) if entry[0] > start else None
+        return start, None
+
+    def rows(self, start, end=None):
+        """Rows (lists of strings) from byte offset start up to end; a partly written last line is left out"""
+        encoding = detect_encoding(self.log_path)
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+
+            def lines():
+                offset = start
+                for line in f:
+                    if (end is not None and offset >= end) or not line.endswith(b"\n"):
+                        return
+                    offset += len(line)
+                    yield line.decode(encoding, errors="replace")
+            yield from csv.reader(lines())
+
+
+def read_slice(log_path, cycle=None, since=None, until=None, limit=None):
+    """Rows of a log and its rotated parts for one cycle and/or a time window, found through their indexes
+
+    Cycles are numbered from 1 as TTX_Log_Analyzer reports them (the rows
+    logged with Cycle Count cycle - 1); since and until are log timestamps.
+    At most limit rows are returned when it is given.
+    """
+    rows = []
+    for part in log_parts(log_path):
+        index = LogIndex.open(part)
+        spans = []
+        if cycle is not None:
+            spans.append(index.cycle_span(cycle - 1))
+        if cycle is None or since is not None or until is not None:
+            spans.append(index.time_span(since, until))
+        if None in spans:
+            continue
+        start = max(span[0] for span in spans)
+        ends = [span[1] for span in spans if span[1] is not None]
+        end = min(ends) if ends else None
+        if end is not None and end <= start:
+            continue
+        for row in index.rows(start, end):
+            if len(row) < 5:
+                continue
+            if cycle is not None and row[3] != str(cycle - 1):
+                continue
+            if (since is not None and row[0] < since) or (until is not None and row[0] > until):
+                continue
+            rows.append(row)
+            if limit is not None and len(rows) >= limit:
+                return rows
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index temperature cycling logs, or print one slice of a log")
+    parser.add_argument("logs", nargs="+", help="temp_cycle_log_*.csv files; rotated _partNNN files are included")
+    parser.add_argument("--rebuild", action="store_true", help="Index again even when an index is up to date")
+    parser.add_argument("--cycle", type=int, help="Print the rows of this cycle (numbered from 1)")
+    parser.add_argument("--since", type=parse_time, help="Print rows from this time (YYYY-MM-DD HH:MM[:SS])")
+    parser.add_argument("--until", type=parse_time, help="Print rows up to this time")
+    parser.add_argument("--output", help="Write the slice to this CSV file instead of the screen")
+    args = parser.parse_args()
+    logs = expand_log_args(args.logs)
+
+    if args.cycle is None and args.since is None and args.until is None:
+        # Backfill: index logs written before logs were indexed as they were written
+        for path in logs:
+            for part in log_parts(path):
+                started = time.perf_counter()
+                try:
+                    index = None if args.rebuild else LogIndex.load(part)
+                    action = "up to date"
+                    if index is None:
+                        index = LogIndex.scan(part)
+                        index.save()
+                        action = "indexed"
+                except OSError as e:
+                    print(f"{part}: could not index: {e}", file=sys.stderr)
+                    continue
+                print(f"{part}: {action}, {len(index.entries)} entries ({time.perf_counter() - started:.2f} s)")
+        return
+
+    if len(logs) != 1:
+        parser.error("--cycle, --since and --until take one log")
+    started = time.perf_counter()
+    try:
+        rows = read_slice(logs[0], args.cycle, args.since, args.until)
+    except OSError as e:
+        parser.error(f"Could not read {logs[0]}: {e}")
+    elapsed = time.perf_counter() - started
+    with open(logs[0], "rb") as f:
+        header = next(csv.reader([f.readline().decode(detect_encoding(logs[0]))]))
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+    else:
+        writer = csv.writer(sys.stdout, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+    print(f"{len(rows)} rows in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
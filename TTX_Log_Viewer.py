@@ -0,0 +1,125 @@
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+from TTX_Log_Index import parse_time, read_slice
+
+MAX_SHOWN_ROWS = 5000  # More rows than this make the table slow to fill and to scroll
+
+
+class LogSliceWindow:
+    """Window showing one cycle or time window of a CSV log, found through the log's index
+
+    The slice is read on a background thread, so a log that has to be
+    indexed first (one written before logs were indexed) never freezes the
+    chamber windows; the result is picked up by polling on the Tk thread.
+    """
+
+    COLUMNS = ("timestamp", "temperature", "target", "cycle", "phase", "event")
+    HEADINGS = ("Time", "Temp (°F)", "Target (°F)", "Cycle Count", "Phase", "Event")
+
+    def __init__(self, root, log_path=None):
+        self.window = tk.Toplevel(root)
+        self.window.title("Log Slice")
+        self.window.geometry("760x480")
+        self.path_var = tk.StringVar(value=log_path or "")
+        self.cycle_var = tk.StringVar()
+        self.since_var = tk.StringVar()
+        self.until_var = tk.StringVar()
+        self.status_var = tk.StringVar(value="Enter a cycle (numbered from 1) and/or a time window, then Show")
+        self._results = queue.SimpleQueue()
+
+        form = ttk.Frame(self.window, padding="10")
+        form.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        ttk.Label(form, text="Log:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Entry(form, textvariable=self.path_var, width=70).grid(row=0, column=1, columnspan=6,
+                                                                  sticky=(tk.W, tk.E), padx=(5, 0))
+        ttk.Button(form, text="Browse…", command=self.choose_log).grid(row=0, column=7, padx=(5, 0))
+        ttk.Label(form, text="Cycle:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Entry(form, textvariable=self.cycle_var, width=8).grid(row=1, column=1, sticky=tk.W,
+                                                                  padx=(5, 10), pady=(5, 0))
+        ttk.Label(form, text="From:").grid(row=1, column=2, sticky=tk.W, pady=(5, 0))
+        ttk.Entry(form, textvariable=self.since_var, width=19).grid(row=1, column=3, padx=(5, 10), pady=(5, 0))
+        ttk.Label(form, text="To:").grid(row=1, column=4, sticky=tk.W, pady=(5, 0))
+        ttk.Entry(form, textvariable=self.until_var, width=19).grid(row=1, column=5, padx=(5, 10), pady=(5, 0))
+        self.show_button = ttk.Button(form, text="Show", command=self.show)
+        self.show_button.grid(row=1, column=6, pady=(5, 0))
+        form.columnconfigure(6, weight=1)
+
+        table = ttk.Frame(self.window, padding=(10, 0, 10, 0))
+        table.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.tree = ttk.Treeview(table, columns=self.COLUMNS, show="headings")
+        for column, heading in zip(self.COLUMNS, self.HEADINGS):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=80 if column != "event" else 220, anchor=tk.W)
+        self.tree.column("timestamp", width=140)
+        scrollbar = ttk.Scrollbar(table, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        table.columnconfigure(0, weight=1)
+        table.rowconfigure(0, weight=1)
+
+        ttk.Label(self.window, textvariable=self.status_var, padding="10").grid(row=2, column=0, sticky=tk.W)
+        self.window.columnconfigure(0, weight=1)
+        self.window.rowconfigure(1, weight=1)
+
+    def choose_log(self):
+        path = filedialog.askopenfilename(parent=self.window, title="Open temperature log",
+                                          initialdir=os.path.dirname(self.path_var.get()) or None,
+                                          filetypes=[("Temperature log", "*.csv"), ("All files", "*.*")])
+        if path:
+            self.path_var.set(path)
+
+    def show(self):
+        """Read the requested slice on a background thread"""
+        path = self.path_var.get().strip()
+        try:
+            cycle = int(self.cycle_var.get()) if self.cycle_var.get().strip() else None
+            since = parse_time(self.since_var.get()) if self.since_var.get().strip() else None
+            until = parse_time(self.until_var.get()) if self.until_var.get().strip() else None
+        except ValueError as e:
+            self.status_var.set(f"Invalid entry: {e}")
+            return
+        if not path:
+            self.status_var.set("Choose a log first")
+            return
+        if cycle is None and since is None and until is None:
+            self.status_var.set("Enter a cycle or a time window; a whole log is too large to show")
+            return
+        self.show_button.config(state="disabled")
+        self.status_var.set("Reading…")
+        threading.Thread(target=self._read, args=(path, cycle, since, until), name="LogSlice",
+                         daemon=True).start()
+        self.window.after(50, self._poll)
+
+    def _read(self, path, cycle, since, until):
+        started = time.perf_counter()
+        try:
+            rows = read_slice(path, cycle, since, until, limit=MAX_SHOWN_ROWS + 1)
+        except (OSError, ValueError) as e:
+            self._results.put((None, f"Could not read {path}: {e}"))
+            return
+        self._results.put((rows, time.perf_counter() - started))
+
+    def _poll(self):
+        try:
+            rows, detail = self._results.get_nowait()
+        except queue.Empty:
+            self.window.after(50, self._poll)
+            return
+        self.show_button.config(state="normal")
+        if rows is None:
+            self.status_var.set(detail)
+            return
+        self.tree.delete(*self.tree.get_children())
+        for row in rows[:MAX_SHOWN_ROWS]:
+            self.tree.insert("", tk.END, values=row[:len(self.COLUMNS)])
+        if len(rows) > MAX_SHOWN_ROWS:
+            self.status_var.set(f"Showing the first {MAX_SHOWN_ROWS} rows (read in {detail * 1000:.0f} ms); "
+                                f"narrow the cycle or time window to see the rest")
+        else:
+            self.status_var.set(f"Showing {len(rows)} rows, read in {detail * 1000:.0f} ms")
@@ -0,0 +1,233 @@
+import math
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"  # Prometheus text exposition format
+
+GPIB_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
+RECONNECT_BUCKETS = (1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)      # Seconds
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._series = {}  # Label values -> value
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}")
+        return tuple(str(value) for value in labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for key, value in series:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value):
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Total that only goes up"""
+    kind = "counter"
+
+    def inc(self, *labels, amount=1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def value(self, *labels):
+        with self._lock:
+            return self._series.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Current value of something, set whenever it is known"""
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = float(value)
+
+    def value(self, *labels):
+        with self._lock:
+            return self._series.get(self._key(labels))
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=GPIB_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels):
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return 0 if series is None else series[2]
+
+    def _render_series(self, key, value):
+        counts, total, count = value
+        names = self.labels + ("le",)
+        lines = [f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {n}"
+                 for bound, n in zip(self.buckets, counts)]
+        lines.append(f"{self.name}_bucket{_format_labels(names, key + ('+Inf',))} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Every metric of the process, rendered in the Prometheus text format
+
+    Counters and histograms are updated where things happen. Collectors are
+    called just before each render to set gauges from state that is already
+    in memory (sample age, connection, cycle count), so a scrape never
+    causes a bus transaction.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._register(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=GPIB_BUCKETS):
+        return self._register(Histogram, name, help_text, labels, buckets)
+
+    def add_collector(self, collect):
+        """Call collect() before every render"""
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self):
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for collect in collectors:
+            try:
+                collect()
+            except Exception:
+                pass  # A failing collector leaves its gauges at their last values
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def command_label(cmd):
+    """Command without its arguments after the address: "R? 100, 1" -> "R? 100", "W 300, 720" -> "W 300" """
+    return cmd.split(",", 1)[0].strip()
+
+
+def gpib_error_class(error):
+    """timeout, nlisteners, io or other, from the text of a VISA error"""
+    text = str(error)
+    if "TMO" in text or "timeout" in text.lower():
+        return "timeout"
+    if "NLISTENERS" in text:
+        return "nlisteners"
+    if "VI_ERROR_IO" in text or "I/O" in text:
+        return "io"
+    return "other"
+
+
+class EngineMetrics:
+    """Bus health of one CycleEngine, recorded into a MetricsRegistry shared by every chamber"""
+
+    def __init__(self, registry, chamber, engine):
+        self.registry = registry
+        self.chamber = chamber
+        self.transaction_seconds = registry.histogram(
+            "ttx_gpib_transaction_seconds",
+            "Time from queueing a GPIB transaction to its reply, including bus queueing and pacing",
+            ("chamber", "op", "command"))
+        self.errors = registry.counter(
+            "ttx_gpib_errors_total", "Failed GPIB attempts (each is retried) by error class",
+            ("chamber", "op", "error"))
+        self.gave_up = registry.counter(
+            "ttx_gpib_gave_up_total", "GPIB transactions that failed on every retry", ("chamber", "op"))
+        self.reconnect_seconds = registry.histogram(
+            "ttx_reconnect_seconds", "Duration of reconnection attempts, power cycle included",
+            ("chamber", "result"), RECONNECT_BUCKETS)
+        self.power_cycles = registry.counter(
+            "ttx_power_cycles_total", "Chamber power cycles performed for recovery", ("chamber",))
+        self.sample_age = registry.gauge(
+            "ttx_sample_age_seconds", "Seconds since the last good temperature reading", ("chamber",))
+        self.connected = registry.gauge("ttx_connected", "1 while connected to the chamber", ("chamber",))
+        self.comm_failures = registry.gauge(
+            "ttx_consecutive_comm_failures", "Communication failures since the last good reading", ("chamber",))
+        self.cycles = registry.gauge("ttx_cycles_completed", "Cycles completed in this run", ("chamber",))
+        self.pacer_gap = registry.gauge(
+            "ttx_pacer_gap_seconds", "Learned gap between commands to the chamber", ("chamber",))
+        registry.add_collector(lambda: self.collect(engine))
+
+    def transaction(self, op, cmd, seconds):
+        self.transaction_seconds.observe(seconds, self.chamber, op, command_label(cmd))
+
+    def error(self, op, error_class):
+        self.errors.inc(self.chamber, op, error_class)
+
+    def failed(self, op):
+        self.gave_up.inc(self.chamber, op)
+
+    def reconnect(self, seconds, succeeded):
+        self.reconnect_seconds.observe(seconds, self.chamber, "success" if succeeded else "failure")
+
+    def power_cycle(self):
+        self.power_cycles.inc(self.chamber)
+
+    def collect(self, engine):
+        self.sample_age.set(engine.sample_cache.age(), self.chamber)
+        self.connected.set(1 if engine.is_connected else 0, self.chamber)
+        self.comm_failures.set(engine.consecutive_comm_failures, self.chamber)
+        self.cycles.set(engine.cycle_count, self.chamber)
+        self.pacer_gap.set(engine.pacer.gap, self.chamber)
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+from TTX_Clock import SystemClock
+
+DEFAULT_PACING_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pacing_profiles.json")
+
+
+class AdaptivePacer:
+    """Learns the smallest inter-command gap an instrument handles reliably
+
+    The gap shrinks a little after every clean transaction and backs off
+    multiplicatively after a timeout, error or empty reply. A failure also
+    raises a floor just above the gap that failed; the floor decays slowly so
+    the pacer re-probes faster gaps over a long run.
+    """
+
+    def __init__(self, gap=0.3, min_gap=0.02, max_gap=3.0, backoff_factor=2.0,
+                 decrease_fraction=0.05, floor_decay=0.995, min_retry_delay=0.25, clock=None):
+        self.clock = clock if clock is not None else SystemClock()
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+        self.gap = min(max(gap, min_gap), max_gap)
+        self.floor = min_gap
+        self.backoff_factor = backoff_factor
+        self.decrease_fraction = decrease_fraction
+        self.floor_decay = floor_decay
+        self.min_retry_delay = min_retry_delay
+        self.turnaround = None  # Smoothed seconds per transaction
+        self.successes = 0
+        self.failures = 0
+        self._last_done = 0.0
+
+    def wait(self):
+        """Sleep until the learned gap since the previous transaction has passed"""
+        remaining = self._last_done + self.gap - self.clock.monotonic()
+        if remaining > 0:
+            self.clock.sleep(remaining)
+
+    def record_success(self, turnaround):
+        """Shrink the gap after a clean transaction"""
+        self.successes += 1
+        if self.turnaround is None:
+            self.turnaround = turnaround
+        else:
+            self.turnaround = 0.9 * self.turnaround + 0.1 * turnaround
+        self.floor = max(self.min_gap, self.floor * self.floor_decay)
+        self.gap = max(self.floor, self.gap * (1 - self.decrease_fraction))
+        self._last_done = self.clock.monotonic()
+
+    def record_failure(self):
+        """Back off after a timeout, error or empty reply"""
+        self.failures += 1
+        self.floor = min(self.max_gap, max(self.floor, self.gap * 1.25))
+        self.gap = min(self.max_gap, max(self.floor, self.gap * self.backoff_factor))
+        self._last_done = self.clock.monotonic()
+
+    def call(self, func):
+        """Run one paced transaction and learn from how it went"""
+        self.wait()
+        start = self.clock.monotonic()
+        try:
+            result = func()
+        except Exception:
+            self.record_failure()
+            raise
+        if isinstance(result, str) and not result.strip():
+            self.record_failure()
+        else:
+            self.record_success(self.clock.monotonic() - start)
+        return result
+
+    def retry_delay(self, attempt):
+        """Wait before retry number attempt (0-based), scaled from the learned gap"""
+        return min(self.max_gap, max(self.gap, self.min_retry_delay) * (2 ** attempt))
+
+    def to_dict(self):
+        return {
+            "gap": round(self.gap, 4),
+            "floor": round(self.floor, 4),
+            "turnaround": round(self.turnaround, 4) if self.turnaround is not None else None,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def load_dict(self, data):
+        """Start from previously learned values"""
+        self.gap = min(max(float(data.get("gap", self.gap)), self.min_gap), self.max_gap)
+        self.floor = min(max(float(data.get("floor", self.min_gap)), self.min_gap), self.gap)
+        if data.get("turnaround") is not None:
+            self.turnaround = float(data["turnaround"])
+
+
+class PacingStore:
+    """JSON file holding the learned pacing of each instrument, keyed by resource name"""
+
+    # Shared by every store so chambers in one process never interleave read-modify-write
+    _lock = threading.Lock()
+
+    def __init__(self, path=DEFAULT_PACING_FILE):
+        self.path = path
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, resource_name, **pacer_options):
+        """Create a pacer for resource_name, seeded from the last saved session"""
+        pacer = AdaptivePacer(**pacer_options)
+        with self._lock:
+            data = self._read().get(resource_name)
+        if data:
+            try:
+                pacer.load_dict(data)
+            except (TypeError, ValueError):
+                pass
+        return pacer
+
+    def save(self, resource_name, pacer):
+        """Store the pacer's learned gap for the next start"""
+        with self._lock:
+            profiles = self._read()
+            profiles[resource_name] = pacer.to_dict()
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(profiles, f, indent=2)
+            os.replace(tmp_path, self.path)
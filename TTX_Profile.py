@@ -0,0 +1,186 @@
+import json
+from dataclasses import dataclass
+
+from TTX_Registers import CHAMBER_MIN_TEMP, CHAMBER_MAX_TEMP
+
+SOAK = "soak"    # Reach the temperature, then hold it in tolerance
+RAMP = "ramp"    # Move the setpoint to the temperature at a fixed rate
+DWELL = "dwell"  # Set the temperature and wait a fixed time, reached or not
+LOOP = "loop"    # Repeat nested segments
+
+
+class ProfileError(ValueError):
+    """Raised when a profile file cannot be run"""
+
+
+@dataclass(frozen=True)
+class ProfileStep:
+    """One segment of a profile with loops expanded"""
+    kind: str
+    temp: float                 # °F
+    hold_seconds: float = None  # Soak and dwell; None on a soak uses the GUI hold time
+    rate: float = None          # Ramp, °F per minute
+    label: str = ""
+
+    def describe(self):
+        text = f"{self.kind} to {self.temp:g}°F"
+        if self.kind == RAMP:
+            text += f" at {self.rate:g}°F/min"
+        elif self.hold_seconds is not None:
+            text += f" for {self.hold_seconds / 60:g} min"
+        return f"{self.label}: {text}" if self.label else text
+
+    def to_dict(self):
+        """Segment as CycleProfile.from_dict reads it"""
+        segment = {"type": self.kind, "temp": self.temp}
+        if self.rate is not None:
+            segment["rate"] = self.rate
+        if self.hold_seconds is not None:
+            segment["minutes"] = self.hold_seconds / 60
+        if self.label:
+            segment["label"] = self.label
+        return segment
+
+
+@dataclass(frozen=True)
+class ScheduledStep:
+    """A step with its planned position in one pass of the profile"""
+    step: ProfileStep
+    start_temp: float
+    offset: float    # Seconds from the start of the pass; None once an earlier step is unknown
+    duration: float  # Seconds; None when the thermal model cannot predict it yet
+
+
+def _number(segment, key, where, required=True):
+    value = segment.get(key)
+    if value is None:
+        if required:
+            raise ProfileError(f"{where}: '{key}' is required")
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ProfileError(f"{where}: '{key}' must be a number")
+    return float(value)
+
+
+def _parse_segments(segments, where, depth=0):
+    if not isinstance(segments, list) or not segments:
+        raise ProfileError(f"{where}: needs a non-empty list of segments")
+    if depth > 4:
+        raise ProfileError(f"{where}: loops nested too deeply")
+    steps = []
+    for index, segment in enumerate(segments):
+        at = f"{where}[{index}]"
+        if not isinstance(segment, dict):
+            raise ProfileError(f"{at}: must be an object")
+        kind = segment.get("type")
+        label = str(segment.get("label", ""))
+        if kind == LOOP:
+            count = segment.get("count")
+            if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+                raise ProfileError(f"{at}: 'count' must be a whole number of at least 1")
+            steps.extend(_parse_segments(segment.get("segments"), f"{at}.segments", depth + 1) * count)
+            continue
+        temp = _number(segment, "temp", at)
+        if kind == RAMP:
+            rate = _number(segment, "rate", at)
+            if rate <= 0:
+                raise ProfileError(f"{at}: 'rate' must be positive")
+            steps.append(ProfileStep(RAMP, temp, rate=rate, label=label))
+        elif kind in (SOAK, DWELL):
+            minutes = _number(segment, "minutes", at, required=kind == DWELL)
+            if minutes is not None and minutes < 0:
+                raise ProfileError(f"{at}: 'minutes' cannot be negative")
+            steps.append(ProfileStep(kind, temp, hold_seconds=None if minutes is None else minutes * 60,
+                                     label=label))
+        else:
+            raise ProfileError(f"{at}: unknown segment type {kind!r} (use soak, ramp, dwell or loop)")
+    return steps
+
+
+class CycleProfile:
+    """A named list of segments, run repeat times (None runs until stopped)
+
+    One pass through the segments counts as one cycle. The classic low/high
+    cycle is the two-point profile: soak at low, then soak at high.
+    """
+
+    def __init__(self, name, steps, repeat=None, source=None):
+        self.name = name
+        self.steps = list(steps)
+        self.repeat = repeat
+        self.source = source  # File the profile was loaded from
+
+    @classmethod
+    def from_dict(cls, data, source=None):
+        if not isinstance(data, dict):
+            raise ProfileError("A profile must be a JSON object")
+        repeat = data.get("repeat")
+        if repeat is not None and (isinstance(repeat, bool) or not isinstance(repeat, int) or repeat < 1):
+            raise ProfileError("'repeat' must be a whole number of at least 1, or null to run until stopped")
+        steps = _parse_segments(data.get("segments"), "segments")
+        return cls(str(data.get("name", "Profile")), steps, repeat, source)
+
+    @classmethod
+    def two_point(cls, low_temp, high_temp, hold_seconds=None):
+        return cls("Two-point", [ProfileStep(SOAK, low_temp, hold_seconds), ProfileStep(SOAK, high_temp, hold_seconds)])
+
+    def validate(self, min_temp=CHAMBER_MIN_TEMP, max_temp=CHAMBER_MAX_TEMP, max_rate=None):
+        """Raise ProfileError unless every step is within the chamber's limits"""
+        for index, step in enumerate(self.steps):
+            if not min_temp <= step.temp <= max_temp:
+                raise ProfileError(f"Step {index + 1} ({step.describe()}) is outside the chamber limits "
+                                   f"of {min_temp:g}°F to {max_temp:g}°F")
+            if step.kind == RAMP and max_rate is not None and step.rate > max_rate:
+                raise ProfileError(f"Step {index + 1} ({step.describe()}) is faster than the chamber's "
+                                   f"{max_rate:g}°F/min")
+
+    def to_dict(self):
+        """Profile as from_dict reads it back, with loops expanded"""
+        return {"name": self.name, "repeat": self.repeat, "segments": [step.to_dict() for step in self.steps]}
+
+    def describe(self):
+        passes = f"{self.repeat} passes" if self.repeat else "repeating until stopped"
+        return f"{self.name}: {len(self.steps)} steps, {passes}"
+
+
+def load_profile(path):
+    """Read a profile from a JSON file (see profile.example.json)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return CycleProfile.from_dict(data, source=path)
+
+
+def step_seconds(step, start_temp, thermal_model=None, default_hold=300, tolerance=2.5):
+    """Planned length of one step, or None when a soak's approach cannot be predicted yet"""
+    if step.kind == RAMP:
+        return abs(step.temp - start_temp) / step.rate * 60
+    hold = step.hold_seconds if step.hold_seconds is not None else default_hold
+    if step.kind == DWELL:
+        return hold
+    if thermal_model is None:
+        return None
+    approach = thermal_model.predict(start_temp, step.temp, tolerance)
+    return None if approach is None else approach + hold
+
+
+def compile_schedule(steps, start_temp, thermal_model=None, default_hold=300, tolerance=2.5):
+    """Lay one pass of steps out in time, starting from start_temp"""
+    schedule = []
+    offset = 0.0
+    temp = start_temp
+    for step in steps:
+        duration = step_seconds(step, temp, thermal_model, default_hold, tolerance)
+        schedule.append(ScheduledStep(step, temp, offset, duration))
+        offset = None if offset is None or duration is None else offset + duration
+        temp = step.temp
+    return schedule
+
+
+def schedule_seconds(schedule):
+    """Total length of a compiled schedule, or None if any step is unknown"""
+    if not schedule:
+        return 0.0
+    last = schedule[-1]
+    if last.offset is None or last.duration is None:
+        return None
+    return last.offset + last.duration
@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RampResult:
+    """How closely one ramp followed its requested slope"""
+    start_temp: float
+    target: float
+    requested_rate: float  # °F per minute
+    achieved_rate: float   # °F per minute over 10-90% of the span, None if too few readings
+    lead_seconds: float    # How far ahead of the line the setpoint had to run at the end
+    duration: float        # Seconds from the first setpoint to the end of the ramp
+
+    @property
+    def deviation_percent(self):
+        if self.achieved_rate is None:
+            return None
+        return (self.achieved_rate - self.requested_rate) / self.requested_rate * 100
+
+    def describe(self):
+        if self.achieved_rate is None:
+            return f"{self.start_temp:.1f}°F -> {self.target:.1f}°F: achieved rate unknown (requested {self.requested_rate:g}°F/min)"
+        return (f"{self.start_temp:.1f}°F -> {self.target:.1f}°F: {self.achieved_rate:.2f}°F/min of "
+                f"{self.requested_rate:g} requested ({self.deviation_percent:+.0f}%), setpoint lead {self.lead_seconds:.0f} s")
+
+
+class RampController:
+    """Setpoint stream for a ramp at a fixed rate, compensated for the chamber's lag
+
+    The requested line runs from start to target at rate °F/min. The process
+    value trails whatever setpoint it is given, so the setpoint runs ahead of
+    the line by a lead that grows while the readings trail the line and
+    shrinks while they are ahead of it (integral action on the tracking
+    error). The lead is capped at max_lead °F and the setpoint never passes
+    the target. The achieved rate is the slope of the readings between 10%
+    and 90% of the span, the usual way a ramp rate is specified.
+    """
+
+    def __init__(self, start, target, rate, start_time, max_lead=20.0, gain=0.2):
+        self.start = start
+        self.target = target
+        self.rate = rate  # °F per minute
+        self.start_time = start_time
+        self.max_lead = max_lead  # °F
+        self.gain = gain          # Fraction of each reading's tracking error added to the lead
+        self.direction = 1 if target >= start else -1
+        self.duration = abs(target - start) / rate * 60
+        self.end_time = start_time + self.duration
+        self.lead = 0.0  # Seconds the setpoint runs ahead of the line
+        self.samples = []
+
+    def line(self, t):
+        """Requested temperature at time t"""
+        if t >= self.end_time:
+            return self.target
+        return self.start + self.direction * self.rate * max(0.0, t - self.start_time) / 60
+
+    def setpoint(self, t):
+        """Setpoint to command at time t"""
+        value = self.line(t) + self.direction * self.rate * self.lead / 60
+        return min(value, self.target) if self.direction > 0 else max(value, self.target)
+
+    def line_complete(self, t):
+        return t >= self.end_time
+
+    def progress(self, value):
+        """Fraction of the span the process value has covered"""
+        span = abs(self.target - self.start)
+        return 1.0 if span == 0 else (value - self.start) * self.direction / span
+
+    def add_sample(self, t, value):
+        """Feed one process-value reading"""
+        self.samples.append((t, value))
+        if self.start_time < t < self.end_time:
+            behind = (self.line(t) - value) * self.direction  # °F, negative when ahead
+            lead = self.lead + self.gain * behind / self.rate * 60
+            self.lead = max(0.0, min(self.max_lead / self.rate * 60, lead))
+
+    def achieved_rate(self):
+        """°F per minute over 10-90% of the span, or None with fewer than 3 readings there"""
+        window = [(t, v) for t, v in self.samples if 0.1 <= self.progress(v) <= 0.9]
+        if len(window) < 3:
+            return None
+        n = len(window)
+        mean_t = sum(t for t, _ in window) / n
+        mean_v = sum(v for _, v in window) / n
+        sxx = sum((t - mean_t) ** 2 for t, _ in window)
+        if sxx == 0:
+            return None
+        slope = sum((t - mean_t) * (v - mean_v) for t, v in window) / sxx
+        return slope * self.direction * 60
+
+    def result(self, end_time):
+        return RampResult(self.start, self.target, self.rate, self.achieved_rate(), self.lead,
+                          end_time - self.start_time)
+
+
+def add_ramp_arguments(parser):
+    """Add ramp options to an argparse parser"""
+    group = parser.add_argument_group("ramps")
+    group.add_argument("--ramp-step", type=float, default=5.0,
+                       help="Seconds between setpoint updates during a ramp (default 5)")
+    group.add_argument("--ramp-max-lead", type=float, default=20.0,
+                       help="Largest lag compensation, °F ahead of the requested line (default 20; 0 disables)")
+    return group
+
+
+def ramp_options_from_args(args):
+    """Ramp keyword arguments from parsed command line options"""
+    return {"step_seconds": args.ramp_step, "max_lead": args.ramp_max_lead}
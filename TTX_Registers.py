@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+
+# ICS-4899A register map used by the cycling code
+REG_PROCESS_VALUE = 100   # Current chamber temperature
+REG_SETPOINT = 300        # Temperature setpoint
+REG_DECIMAL = 606         # Decimal point configuration
+REG_ON_OFF = 2000         # Chamber on (1) / off (0)
+
+STATUS_REGISTERS = (REG_PROCESS_VALUE, REG_SETPOINT, REG_DECIMAL, REG_ON_OFF)
+
+# Hard limits of the ICS-4899A chamber (°F)
+CHAMBER_MIN_TEMP = -40.0
+CHAMBER_MAX_TEMP = 266.0
+
+# Longest block the controller is asked for in one "R? <addr>, <count>"
+DEFAULT_MAX_BLOCK = 32
+
+
+def plan_block_reads(addresses, max_block=DEFAULT_MAX_BLOCK):
+    """Group register addresses into the fewest contiguous block reads
+
+    Returns a list of (start, count) pairs. Sorting the addresses and greedily
+    extending each block while it stays within max_block registers gives the
+    minimum number of transactions for that block limit.
+    """
+    blocks = []
+    for addr in sorted(set(addresses)):
+        if blocks and addr - blocks[-1][0] + 1 <= max_block:
+            blocks[-1][1] = addr - blocks[-1][0] + 1
+        else:
+            blocks.append([addr, 1])
+    return [(start, count) for start, count in blocks]
+
+
+def block_read_command(start, count):
+    """Build the R? command for a contiguous block of registers"""
+    return f"R? {start}, {count}"
+
+
+def parse_block_reply(reply, count):
+    """Split a block read reply into integer register values"""
+    values = [int(v) for v in reply.replace(",", " ").split()]
+    if len(values) != count:
+        raise ValueError(f"Expected {count} register values, got {len(values)}: '{reply}'")
+    return values
+
+
+@dataclass
+class ChamberStatus:
+    """One status snapshot of the chamber, scaled to engineering units"""
+    process_value: float
+    setpoint: float
+    chamber_on: bool
+    decimal: int
+    timestamp: float  # clock.time() of the read, so simulated runs stamp virtual time
+    raw: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_registers(cls, raw, timestamp, decimal=None):
+        """Build a snapshot taken at timestamp from raw register values; decimal falls back to register 606"""
+        if decimal is None:
+            decimal = raw[REG_DECIMAL]
+        scale = 10 ** decimal
+        return cls(
+            process_value=raw[REG_PROCESS_VALUE] / scale,
+            setpoint=raw[REG_SETPOINT] / scale,
+            chamber_on=bool(raw[REG_ON_OFF]),
+            decimal=decimal,
+            timestamp=timestamp,
+            raw=dict(raw),
+        )
@@ -0,0 +1,53 @@
+import threading
+from dataclasses import dataclass, field, fields, replace
+from typing import Optional
+
+
+@dataclass
+class RunState:
+    """What the cycling engine is doing right now, shared between threads
+
+    The engine writes it with update(); the UI and the telemetry writer take
+    a consistent copy with snapshot() instead of parsing label text.
+    """
+
+    status: str = "Stopped"          # Stopped, Running or Stopping...
+    phase: str = "Idle"              # Idle, Heating, Cooling or Stabilizing
+    target: Optional[float] = None   # °F, None when not cycling
+    current_temp: Optional[float] = None  # °F, last good reading
+    cycle_count: int = 0
+    hold_elapsed: Optional[float] = None  # Seconds within tolerance, None outside the hold
+    hold_time: Optional[float] = None     # Seconds required for the current hold
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def update(self, **changes):
+        """Set several fields at once"""
+        with self._lock:
+            for name, value in changes.items():
+                if name.startswith("_") or not hasattr(self, name):
+                    raise AttributeError(f"RunState has no field '{name}'")
+                setattr(self, name, value)
+
+    def snapshot(self):
+        """Consistent copy of every field"""
+        with self._lock:
+            return replace(self)
+
+    def as_dict(self):
+        """Consistent copy of every field as a plain dict, e.g. for JSON"""
+        state = self.snapshot()
+        return {f.name: getattr(state, f.name) for f in fields(state) if not f.name.startswith("_")}
+
+    def csv_row(self, timestamp, temperature=None, event=""):
+        """Telemetry row for CSV_HEADER; temperature defaults to the last reading"""
+        state = self.snapshot()
+        if temperature is None:
+            temperature = state.current_temp
+        return [
+            timestamp,
+            f"{temperature:.2f}" if temperature is not None else "",
+            f"{state.target}" if state.target is not None else "",
+            state.cycle_count,
+            state.phase,
+            event,
+        ]
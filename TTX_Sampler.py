@@ -0,0 +1,133 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from TTX_Clock import SystemClock
+
+
+@dataclass(frozen=True)
+class TemperatureSample:
+    """One process-value reading"""
+    value: float
+    timestamp: float   # clock.time() when read
+    monotonic: float   # clock.monotonic() when read, for age checks
+    sequence: int
+
+
+class SampleCache:
+    """Latest process-value sample, shared by every consumer instead of the bus
+
+    latest() returns None once the newest sample is older than max_age, so
+    a stalled sampler looks the same to consumers as a failed read. The last
+    history samples are kept for consumers that poll more slowly than the
+    sampler but need every reading (see since()).
+    """
+
+    def __init__(self, clock=None, max_age=15.0, history=100):
+        self.clock = clock if clock is not None else SystemClock()
+        self.max_age = max_age
+        self._sample = None
+        self._sequence = 0
+        self._history = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def publish(self, value):
+        with self._lock:
+            self._sequence += 1
+            self._sample = TemperatureSample(value, self.clock.time(), self.clock.monotonic(), self._sequence)
+            self._history.append(self._sample)
+            return self._sample
+
+    def since(self, sequence):
+        """Kept samples published after the one numbered sequence, oldest first"""
+        with self._lock:
+            return [sample for sample in self._history if sample.sequence > sequence]
+
+    def latest(self, max_age=None):
+        """Newest sample, or None when there is none within max_age seconds"""
+        with self._lock:
+            sample = self._sample
+        if sample is None:
+            return None
+        limit = self.max_age if max_age is None else max_age
+        if self.clock.monotonic() - sample.monotonic > limit:
+            return None
+        return sample
+
+    def age(self):
+        """Seconds since the newest sample (infinite before the first one)"""
+        with self._lock:
+            sample = self._sample
+        if sample is None:
+            return float("inf")
+        return self.clock.monotonic() - sample.monotonic
+
+
+class TemperatureSampler:
+    """The only reader of the process value: polls it on a fixed interval into a SampleCache
+
+    read_func returns a temperature or None. on_sample(sample) runs on the
+    sampler thread after every good reading; failed reads are counted in
+    consecutive_failures and leave the cache to go stale.
+    """
+
+    def __init__(self, read_func, cache, interval=3.0, on_sample=None, clock=None):
+        self.read_func = read_func
+        self.cache = cache
+        self.interval = interval
+        self.on_sample = on_sample
+        self.clock = clock if clock is not None else cache.clock
+        self.consecutive_failures = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TemperatureSampler", daemon=True)
+        self.clock.add_worker(self._thread)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            with self.clock.blocked():
+                self._thread.join(timeout)
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            value = self.read_func()
+            if value is None:
+                self.consecutive_failures += 1
+            else:
+                self.consecutive_failures = 0
+                sample = self.cache.publish(value)
+                if self.on_sample is not None:
+                    self.on_sample(sample)
+            # Sleep in slices so stop() does not wait out a whole interval
+            deadline = self.clock.monotonic() + self.interval
+            while not self._stop.is_set():
+                remaining = deadline - self.clock.monotonic()
+                if remaining <= 0:
+                    break
+                self.clock.sleep(min(remaining, 0.5))
+
+
+def add_sampler_arguments(parser):
+    """Add temperature sampling options to an argparse parser"""
+    group = parser.add_argument_group("temperature sampling")
+    group.add_argument("--sample-interval", type=float, default=3.0,
+                       help="Seconds between process-value reads (default 3)")
+    group.add_argument("--sample-max-age", type=float, default=15.0,
+                       help="Seconds after which the last reading counts as stale (default 15)")
+    return group
+
+
+def sampler_options_from_args(args):
+    """Sampling keyword arguments from parsed command line options"""
+    return {"interval": args.sample_interval, "max_age": args.sample_max_age}
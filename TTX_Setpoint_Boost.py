@@ -0,0 +1,97 @@
+import collections
+
+from TTX_Registers import CHAMBER_MIN_TEMP, CHAMBER_MAX_TEMP
+
+
+def clamp_setpoint(value, min_temp=CHAMBER_MIN_TEMP, max_temp=CHAMBER_MAX_TEMP):
+    """Keep a setpoint inside the chamber limits"""
+    return max(min_temp, min(max_temp, value))
+
+
+class SetpointBoost:
+    """Overshoot-assisted transition: drive the setpoint past the target, then step back
+
+    The controller slows down as it nears its setpoint, so most of a passive
+    transition is spent covering the last few degrees. begin() returns a
+    setpoint up to max_overshoot beyond the target, never more than the
+    distance still to travel and never outside the chamber limits. update()
+    tracks the approach rate and reports when the chamber would reach the
+    target within lead_seconds, so the real target goes back in before the
+    chamber's lag can carry it past.
+    """
+
+    def __init__(self, max_overshoot=15.0, lead_seconds=30.0, rate_window=60.0,
+                 min_temp=CHAMBER_MIN_TEMP, max_temp=CHAMBER_MAX_TEMP):
+        self.max_overshoot = max(0.0, max_overshoot)  # °F beyond the target
+        self.lead_seconds = lead_seconds
+        self.rate_window = rate_window  # Seconds of readings the approach rate is taken over
+        self.min_temp = min_temp
+        self.max_temp = max_temp
+        self.target = None
+        self.setpoint = None
+        self.tolerance = 2.5
+        self._direction = 1
+        self._samples = collections.deque()
+
+    @property
+    def active(self):
+        """True while the boosted setpoint is in the chamber"""
+        return self.setpoint is not None and self.setpoint != self.target
+
+    def begin(self, start_temp, target, tolerance=2.5):
+        """Setpoint to write for a transition from start_temp to target"""
+        self.target = target
+        self.tolerance = tolerance
+        self._direction = 1 if target > start_temp else -1
+        self._samples.clear()
+        boost = min(self.max_overshoot, max(0.0, abs(target - start_temp) - tolerance))
+        setpoint = clamp_setpoint(target + self._direction * boost, self.min_temp, self.max_temp)
+        if (setpoint - target) * self._direction < 0:
+            setpoint = target  # Target already outside the limits; leave it alone
+        self.setpoint = setpoint
+        return setpoint
+
+    def rate(self):
+        """°F per second toward the target over the recent readings (0 when not approaching)"""
+        if len(self._samples) < 2:
+            return 0.0
+        (t1, v1), (t2, v2) = self._samples[0], self._samples[-1]
+        if t2 <= t1:
+            return 0.0
+        return max(0.0, (v2 - v1) * self._direction / (t2 - t1))
+
+    def update(self, timestamp, temp):
+        """Feed one reading; True when the setpoint should step back to the target"""
+        if not self.active:
+            return False
+        self._samples.append((timestamp, temp))
+        while len(self._samples) > 2 and timestamp - self._samples[0][0] > self.rate_window:
+            self._samples.popleft()
+        remaining = (self.target - temp) * self._direction
+        return remaining <= self.tolerance + self.rate() * self.lead_seconds
+
+    def release(self):
+        """Record that the target setpoint has been written back"""
+        self.setpoint = self.target
+
+
+def add_boost_arguments(parser):
+    """Add setpoint boost options to an argparse parser"""
+    group = parser.add_argument_group("setpoint boost")
+    group.add_argument("--setpoint-boost", action="store_true",
+                       help="Drive the setpoint past the target during transitions, then step back")
+    group.add_argument("--boost-max-overshoot", type=float, default=15.0,
+                       help="Largest setpoint offset beyond the target, °F (default 15; "
+                            "max_overshoot in a chamber profile overrides it)")
+    group.add_argument("--boost-lead", type=float, default=30.0,
+                       help="Step back when the target is this many seconds away at the current rate (default 30)")
+    return group
+
+
+def boost_options_from_args(args):
+    """Setpoint boost keyword arguments from parsed command line options"""
+    return {
+        "enabled": args.setpoint_boost,
+        "max_overshoot": args.boost_max_overshoot,
+        "lead_seconds": args.boost_lead,
+    }
@@ -0,0 +1,135 @@
+import collections
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SteadyStateStatus:
+    """Result of feeding one sample to a SteadyStateDetector"""
+    settled: bool        # Trend and noise criteria met over a full window, inside the band
+    in_band: bool        # Trend line at the newest sample is within tolerance of the target
+    glitch: bool         # This sample was rejected as a single-sample outlier
+    slope: float         # °F per minute over the window
+    stddev: float        # °F, scatter around the trend line
+    samples: int
+
+
+class SteadyStateDetector:
+    """Streaming steady-state test over a sliding window of temperature samples
+
+    Each accepted sample joins a window of the last window_seconds. A
+    least-squares line through the window gives the trend (slope) and the
+    noise (scatter around the line). The chamber counts as settled once the
+    window is full, |slope| <= max_slope, the scatter <= max_stddev and the
+    trend line sits within tolerance of the target.
+
+    A sample further than glitch_threshold from the trend line is set aside
+    as a glitch. Up to glitch_limit consecutive glitches are ignored; one
+    more means the temperature really moved, and the window restarts from
+    the set-aside samples.
+    """
+
+    def __init__(self, target, tolerance=2.5, window_seconds=120.0, max_slope=0.1, max_stddev=0.3,
+                 glitch_threshold=None, glitch_limit=2, min_samples=5):
+        self.target = target
+        self.tolerance = tolerance
+        self.window_seconds = window_seconds
+        self.max_slope = max_slope      # °F per minute
+        self.max_stddev = max_stddev    # °F
+        self.glitch_threshold = glitch_threshold if glitch_threshold is not None else max(4 * max_stddev, 1.0)
+        self.glitch_limit = glitch_limit
+        self.min_samples = max(3, min_samples)
+        self.glitches = 0  # Total samples rejected
+        self._window = collections.deque()
+        self._outliers = []
+
+    def reset(self, target=None):
+        if target is not None:
+            self.target = target
+        self._window.clear()
+        self._outliers = []
+
+    def _fit(self, window):
+        """Least-squares slope (°F/s), intercept at the first sample and residual std dev"""
+        n = len(window)
+        t0 = window[0][0]
+        mean_t = sum(t - t0 for t, _ in window) / n
+        mean_v = sum(v for _, v in window) / n
+        sxx = sum((t - t0 - mean_t) ** 2 for t, _ in window)
+        slope = 0.0 if sxx == 0 else sum((t - t0 - mean_t) * (v - mean_v) for t, v in window) / sxx
+        intercept = mean_v - slope * mean_t
+        residual = sum((v - (intercept + slope * (t - t0))) ** 2 for t, v in window)
+        stddev = math.sqrt(residual / (n - 2)) if n > 2 else 0.0
+        return slope, intercept, stddev
+
+    def add(self, timestamp, value):
+        """Feed one sample and return the updated SteadyStateStatus"""
+        glitch = False
+        accept = True
+        if len(self._window) >= self.min_samples:
+            slope, intercept, _ = self._fit(self._window)
+            predicted = intercept + slope * (timestamp - self._window[0][0])
+            if abs(value - predicted) > self.glitch_threshold:
+                self._outliers.append((timestamp, value))
+                accept = False
+                if len(self._outliers) <= self.glitch_limit:
+                    self.glitches += 1
+                    glitch = True
+                else:
+                    # Persistent departure: the temperature really moved
+                    self._window = collections.deque(self._outliers)
+                    self._outliers = []
+            else:
+                self._outliers = []
+        if accept:
+            self._window.append((timestamp, value))
+        while self._window and timestamp - self._window[0][0] > self.window_seconds:
+            self._window.popleft()
+        return self.status(glitch)
+
+    def status(self, glitch=False):
+        n = len(self._window)
+        if n < 3:
+            in_band = bool(self._window) and abs(self._window[-1][1] - self.target) <= self.tolerance
+            return SteadyStateStatus(False, in_band, glitch, float("nan"), float("nan"), n)
+        slope, intercept, stddev = self._fit(self._window)
+        span = self._window[-1][0] - self._window[0][0]
+        trend_now = intercept + slope * span
+        in_band = abs(trend_now - self.target) <= self.tolerance
+        # Full when one more sample interval would reach the window length
+        full = n >= self.min_samples and span + span / (n - 1) >= self.window_seconds
+        settled = (full and in_band and abs(slope * 60) <= self.max_slope
+                   and stddev <= self.max_stddev)
+        return SteadyStateStatus(settled, in_band, glitch, slope * 60, stddev, n)
+
+
+def add_steady_state_arguments(parser):
+    """Add steady-state detection options to an argparse parser"""
+    group = parser.add_argument_group("stabilization")
+    group.add_argument("--early-settle", action="store_true",
+                       help="End a hold early once the chamber is statistically settled")
+    group.add_argument("--settle-min-hold", type=float, default=1.0,
+                       help="Minutes in tolerance before an early settle is allowed (default 1)")
+    group.add_argument("--settle-window", type=float, default=120.0,
+                       help="Seconds of samples the slope and noise are fitted over (default 120)")
+    group.add_argument("--settle-max-slope", type=float, default=0.1,
+                       help="Largest trend counted as settled, °F per minute (default 0.1)")
+    group.add_argument("--settle-max-stddev", type=float, default=0.3,
+                       help="Largest scatter around the trend counted as settled, °F (default 0.3)")
+    group.add_argument("--glitch-limit", type=int, default=2,
+                       help="Consecutive outlier readings ignored before the hold restarts (default 2)")
+    return group
+
+
+def steady_state_options_from_args(args):
+    """Stabilization keyword arguments from parsed command line options"""
+    return {
+        "early_settle": args.early_settle,
+        "min_hold_seconds": args.settle_min_hold * 60,
+        "detector": {
+            "window_seconds": args.settle_window,
+            "max_slope": args.settle_max_slope,
+            "max_stddev": args.settle_max_stddev,
+            "glitch_limit": args.glitch_limit,
+        },
+    }
@@ -0,0 +1,246 @@
+import csv
+import io
+import os
+import queue
+import threading
+import time
+
+from TTX_Clock import SystemClock
+from TTX_Log_Index import LogIndexWriter
+from TTX_Tracing import NULL_TRACER
+
+CSV_HEADER = ['Timestamp', 'Temperature (°F)', 'Target Temperature (°F)',
+              'Cycle Count', 'Phase', 'Event']
+
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+
+# What TelemetryWriter does after each batch
+DURABILITY_NONE = "none"    # Leave buffering to Python and the OS
+DURABILITY_FLUSH = "flush"  # Flush Python's buffer to the OS
+DURABILITY_FSYNC = "fsync"  # Flush and fsync to the disk
+DURABILITY_POLICIES = (DURABILITY_NONE, DURABILITY_FLUSH, DURABILITY_FSYNC)
+
+
+def safe_file_name(name):
+    """Chamber name reduced to characters that are safe in a file name"""
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+
+
+def new_log_path(log_dir=DEFAULT_LOG_DIR, timestamp=None, chamber_name=None):
+    """Build a logs/temp_cycle_log_[<chamber>_]<timestamp>.csv path, creating the directory if needed"""
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+    if chamber_name:
+        return os.path.join(log_dir, f"temp_cycle_log_{safe_file_name(chamber_name)}_{timestamp}.csv")
+    return os.path.join(log_dir, f"temp_cycle_log_{timestamp}.csv")
+
+
+class CsvTelemetryLog:
+    """Temperature sample and event CSV written row by row"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(CSV_HEADER)
+        self.file.flush()
+
+    def write_row(self, row):
+        """Append one row and flush it to disk"""
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        try:
+            self.file.close()
+        except OSError:
+            pass
+
+
+class TelemetryWriter:
+    """CSV telemetry written by a background thread so the read path never waits on the disk
+
+    write_row only queues the row. The writer thread takes whatever has
+    queued up, writes it as one batch and applies the durability policy at
+    most every flush_interval seconds. When max_bytes or rotate_seconds is
+    set the log continues in a new part file (<name>_part002.csv, ...) with
+    its own header. Unless index is False each file gets a sidecar index
+    (<name>.idx, see TTX_Log_Index) of the byte offsets where cycles, phases
+    and ten-minute windows start. close() drains the queue before closing
+    the file.
+    """
+
+    def __init__(self, path, flush_interval=1.0, durability=DURABILITY_FLUSH, max_bytes=None,
+                 rotate_seconds=None, batch_size=500, clock=None, on_error=None, tracer=None, index=True):
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"Unknown durability policy '{durability}'")
+        self.base_path = path
+        self.path = path
+        self.paths = []  # Every file written, oldest first
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.batch_size = batch_size
+        self.clock = clock if clock is not None else SystemClock()
+        self.on_error = on_error  # Called on the writer thread with the exception
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.index_enabled = index
+        self.index = None
+        self.rows_written = 0
+        self.batches_written = 0
+        self.file = None
+        self.writer = None
+        self._opened_at = None
+        self._queue = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()  # So no row is queued behind the close sentinel
+        self._open_part()  # Open errors surface in the caller, like CsvTelemetryLog
+        self._thread = threading.Thread(target=self._run, name="TelemetryWriter", daemon=True)
+        self._thread.start()
+
+    def _open_part(self):
+        if self.paths:
+            root, ext = os.path.splitext(self.base_path)
+            self.path = f"{root}_part{len(self.paths) + 1:03d}{ext}"
+        self.file = open(self.path, 'w', newline='')
+        if self.index_enabled:
+            # Rows are formatted here so their sizes in bytes give the offsets for the index
+            self._line = io.StringIO()
+            self.writer = csv.writer(self._line)
+            header, size = self._format_row(CSV_HEADER)
+            self.file.write(header)
+            self.index = LogIndexWriter(self.path, size)
+        else:
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(CSV_HEADER)
+        self.file.flush()
+        self.paths.append(self.path)
+        self._opened_at = self.clock.monotonic()
+
+    def _needs_rotation(self):
+        if self.max_bytes and self.file.tell() >= self.max_bytes:
+            return True
+        return bool(self.rotate_seconds and self.clock.monotonic() - self._opened_at >= self.rotate_seconds)
+
+    def _format_row(self, row):
+        """One CSV line and its size in bytes in the file's encoding"""
+        self._line.seek(0)
+        self._line.truncate()
+        self.writer.writerow(row)
+        line = self._line.getvalue()
+        return line, len(line) if line.isascii() else len(line.encode(self.file.encoding))
+
+    def _write_indexed(self, batch):
+        lines = []
+        for row in batch:
+            line, size = self._format_row(row)
+            self.index.add(row, size)
+            lines.append(line)
+        self.file.write("".join(lines))
+
+    def _close_files(self):
+        try:
+            self.file.close()
+        except OSError:
+            pass
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def _sync(self):
+        if self.durability == DURABILITY_NONE:
+            return
+        self.file.flush()
+        if self.durability == DURABILITY_FSYNC:
+            os.fsync(self.file.fileno())
+        if self.index is not None:
+            self.index.flush()  # After the log, so saved entries never point past its end
+
+    def write_row(self, row):
+        """Queue one row; never blocks on file I/O. Rows written after close() are dropped."""
+        with self._close_lock:
+            if not self._closed:
+                self._queue.put(list(row))
+
+    def pending(self):
+        """Rows queued but not yet written"""
+        return self._queue.qsize()
+
+    def _run(self):
+        last_sync = time.monotonic()  # Flushing is about the disk, so real time even in simulation
+        stopping = False
+        try:
+            while not stopping:
+                batch = []
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                    while len(batch) < self.batch_size:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                for i, row in enumerate(batch):
+                    if row is _CLOSE:  # Queued by close(); nothing after it is written
+                        del batch[i:]
+                        stopping = True
+                        break
+                try:
+                    if batch:
+                        with self.tracer.span("csv write", "io", rows=len(batch)):
+                            if self.index is not None:
+                                self._write_indexed(batch)
+                            else:
+                                self.writer.writerows(batch)
+                        self.rows_written += len(batch)
+                        self.batches_written += 1
+                    if stopping or time.monotonic() - last_sync >= self.flush_interval:
+                        with self.tracer.span("csv sync", "io", durability=self.durability):
+                            self._sync()
+                        last_sync = time.monotonic()
+                    if not stopping and self._needs_rotation():
+                        self._close_files()
+                        self._open_part()
+                except (OSError, ValueError, csv.Error) as e:
+                    if self.on_error:
+                        self.on_error(e)
+        finally:
+            self._close_files()
+
+    def close(self, timeout=10):
+        """Write everything still queued, sync it and close the file"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_CLOSE)
+        self._thread.join(timeout)
+
+
+_CLOSE = object()  # Queue sentinel for TelemetryWriter.close
+
+
+def add_telemetry_arguments(parser):
+    """Add CSV writer options to an argparse parser"""
+    group = parser.add_argument_group("CSV logging")
+    group.add_argument("--csv-flush-interval", type=float, default=1.0,
+                       help="Seconds between flushes of the CSV log (default 1)")
+    group.add_argument("--csv-durability", choices=DURABILITY_POLICIES, default=DURABILITY_FLUSH,
+                       help="After each flush interval: none, flush to the OS, or fsync to disk")
+    group.add_argument("--csv-rotate-mb", type=float, default=None,
+                       help="Start a new CSV part file after this many megabytes")
+    group.add_argument("--csv-rotate-hours", type=float, default=None,
+                       help="Start a new CSV part file after this many hours")
+    group.add_argument("--csv-no-index", action="store_true",
+                       help="Do not write the <log>.idx index used to open one cycle or time window quickly")
+    return group
+
+
+def telemetry_options_from_args(args):
+    """TelemetryWriter keyword arguments from parsed command line options"""
+    return {
+        "flush_interval": args.csv_flush_interval,
+        "durability": args.csv_durability,
+        "max_bytes": int(args.csv_rotate_mb * 1024 * 1024) if args.csv_rotate_mb else None,
+        "rotate_seconds": args.csv_rotate_hours * 3600 if args.csv_rotate_hours else None,
+        "index": not args.csv_no_index,
+    }
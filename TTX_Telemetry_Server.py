@@ -0,0 +1,276 @@
+import base64
+import hashlib
+import json
+import queue
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from TTX_Metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"  # RFC 6455
+KEEPALIVE_SECONDS = 15  # Idle streams send a comment (SSE) or ping (WebSocket) this often
+
+STATUS_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Temperature Cycling</title>
+<style>body{font-family:sans-serif}td,th{padding:4px 12px;text-align:left}#log{font-family:monospace;white-space:pre}</style>
+</head><body>
+<h3>Temperature Cycling</h3>
+<table><thead><tr><th>Chamber</th><th>Status</th><th>Phase</th><th>Temperature</th><th>Target</th><th>Cycles</th></tr></thead>
+<tbody id="chambers"></tbody></table>
+<h4>Activity</h4><div id="log"></div>
+<script>
+const rows = {};
+const log = document.getElementById("log");
+const source = new EventSource("/stream");
+source.onmessage = (event) => {
+  const m = JSON.parse(event.data);
+  if (m.type === "log") {
+    log.textContent = (`[${m.chamber}] ${m.line}\\n` + log.textContent).slice(0, 20000);
+    return;
+  }
+  const s = m.state;
+  if (!rows[m.chamber]) rows[m.chamber] = document.getElementById("chambers").insertRow();
+  const row = rows[m.chamber];
+  row.replaceChildren();
+  // textContent, never innerHTML: chamber names and states are not markup
+  [m.chamber, s.status, s.phase,
+    s.current_temp === null ? "--" : s.current_temp + "°F",
+    s.target === null ? "--" : s.target + "°F", s.cycle_count].forEach((v) => { row.insertCell().textContent = v; });
+};
+</script>
+</body></html>
+"""
+
+
+class TelemetryHub:
+    """Latest state of every chamber in this process, fanned out to any number of subscribers
+
+    Engines publish what they already have (each sampler reading with the
+    RunState, and Activity Log lines); nothing here ever talks to an
+    instrument, so a watcher costs no GPIB traffic. Each subscriber has its
+    own bounded queue, and one too slow to keep up loses its oldest messages
+    instead of holding up the engine or the other subscribers.
+    """
+
+    def __init__(self, queue_size=256):
+        self.queue_size = queue_size
+        self.dropped = 0  # Messages discarded for slow subscribers
+        self._states = {}
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def publish(self, chamber, kind, **data):
+        """Send one message to every subscriber; safe from any thread"""
+        message = dict(data, chamber=chamber, type=kind)
+        with self._lock:
+            if kind == "state":
+                self._states[chamber] = message
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            self._offer(subscriber, message)
+
+    def _offer(self, subscriber, message):
+        while True:
+            try:
+                subscriber.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    subscriber.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def snapshot(self):
+        """Latest state message of every chamber, by chamber name"""
+        with self._lock:
+            return dict(self._states)
+
+    def subscribe(self):
+        """A queue that receives every message from now on, starting with the current states"""
+        subscriber = queue.Queue(self.queue_size)
+        with self._lock:
+            if self._closed:
+                subscriber.put_nowait(None)
+                return subscriber
+            for message in list(self._states.values())[-self.queue_size:]:
+                subscriber.put_nowait(message)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def close(self):
+        """End every subscription (each queue receives None)"""
+        with self._lock:
+            self._closed = True
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for subscriber in subscribers:
+            self._offer(subscriber, None)
+
+
+def websocket_frame(payload, opcode=0x1):
+    """One unmasked, unfragmented server-to-client frame (text by default)"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+class TelemetryRequestHandler(BaseHTTPRequestHandler):
+    """GET / (status page), /state (JSON), /stream (Server-Sent Events), /ws (WebSocket) and /metrics"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/":
+            self._send_body(STATUS_PAGE.encode("utf-8"), "text/html; charset=utf-8")
+        elif path == "/state":
+            body = json.dumps({"chambers": self.server.hub.snapshot()}).encode("utf-8")
+            self._send_body(body, "application/json")
+        elif path == "/stream":
+            self._stream_events()
+        elif path == "/ws":
+            self._stream_websocket()
+        elif path == "/metrics" and self.server.metrics is not None:
+            self._send_body(self.server.metrics.render().encode("utf-8"), METRICS_CONTENT_TYPE)
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass  # Keep request lines out of the console and the Activity Log echo
+
+    def _send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _messages(self):
+        """Messages for this client until the hub closes; None between them when idle"""
+        hub = self.server.hub
+        subscriber = hub.subscribe()
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield None
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            hub.unsubscribe(subscriber)
+
+    def _stream_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for message in self._messages():
+                if message is None:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    self.wfile.write(f"data: {json.dumps(message)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (ConnectionError, OSError):
+            pass  # Client went away
+
+    def _stream_websocket(self):
+        """Server-to-client only: messages the client sends are not read"""
+        key = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or not key:
+            self.send_error(400, "Expected a WebSocket upgrade")
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for message in self._messages():
+                if message is None:
+                    self.wfile.write(websocket_frame(b"", opcode=0x9))  # Ping
+                else:
+                    self.wfile.write(websocket_frame(json.dumps(message).encode("utf-8")))
+                self.wfile.flush()
+            self.wfile.write(websocket_frame(b"", opcode=0x8))  # Close
+            self.wfile.flush()
+        except (ConnectionError, OSError):
+            pass
+
+
+class TelemetryServer:
+    """HTTP server for a TelemetryHub, run on a background thread
+
+    Every page is served from the hub's memory (and /metrics from the
+    MetricsRegistry, if given), so any number of engineers or scrapers can
+    watch a run without adding a single transaction to the bus.
+    """
+
+    def __init__(self, hub, host="127.0.0.1", port=8765, metrics=None):
+        self.hub = hub
+        self._server = ThreadingHTTPServer((host, port), TelemetryRequestHandler)  # Binds now; raises OSError
+        self._server.daemon_threads = True
+        self._server.hub = hub
+        self._server.metrics = metrics
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="TelemetryServer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """End every stream and close the listening socket"""
+        self.hub.close()
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._server.server_close()
+
+
+def add_server_arguments(parser):
+    """Add telemetry server options to an argparse parser"""
+    group = parser.add_argument_group("telemetry server")
+    group.add_argument("--serve-port", type=int, default=None,
+                       help="Serve live state on this port: / (page), /state, /stream (SSE), /ws, /metrics "
+                            "(off by default)")
+    group.add_argument("--serve-host", default="127.0.0.1",
+                       help="Address to listen on (default 127.0.0.1, this PC only; 0.0.0.0 for the whole network)")
+    return group
+
+
+def server_options_from_args(args):
+    """TelemetryServer keyword arguments from parsed command line options, or None when it is off"""
+    if args.serve_port is None:
+        return None
+    return {"host": args.serve_host, "port": args.serve_port}
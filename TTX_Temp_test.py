@@ -1,247 +1,180 @@
-import pyvisa
-import time
-
-# Initialize GPIB connection
-rm = pyvisa.ResourceManager()
-ics_4899a = rm.open_resource("GPIB0::4::INSTR")
-
-# Configuration variables
-gpib_timeout = 5000  # 5 second timeout
-retry_count = 3
-cycle_count = 0  # Track total cycles completed
-
-def configure_gpib():
-    """Configure GPIB settings"""
-    ics_4899a.timeout = gpib_timeout
-    ics_4899a.read_termination = '\n'
-    ics_4899a.write_termination = '\n'
-
-def gpib_rd_with_retry(cmd, retries=None):
-    """GPIB read with retry logic"""
-    if retries is None:
-        retries = retry_count
-        
-    for attempt in range(retries):
-        try:
-            time.sleep(0.2)
-            ret = ics_4899a.query(cmd)
-            if ret is not None and ret.strip() != "":
-                return ret.strip()
-            else:
-                if attempt < retries - 1:
-                    print(f"Empty response for '{cmd}', retry {attempt + 1}/{retries}")
-                    time.sleep(0.5)
-                    continue
-        except (pyvisa.errors.VisaIOError, pyvisa.errors.InvalidSession) as e:
-            if attempt < retries - 1:
-                print(f"GPIB error for '{cmd}', retry {attempt + 1}/{retries}: {e}")
-                time.sleep(1)
-                continue
-            else:
-                print(f"GPIB Query failed after {retries} attempts: {e}")
-                
-    return ""
-
-def format_time(seconds):
-    """Format seconds into minutes:seconds format"""
-    minutes = int(seconds // 60)
-    seconds = int(seconds % 60)
-    return f"{minutes:02d}:{seconds:02d}"
-
-def gpib_wrt_with_retry(cmd, retries=None):
-    """GPIB write with retry logic"""
-    if retries is None:
-        retries = retry_count
-        
-    for attempt in range(retries):
-        try:
-            time.sleep(0.2)
-            ics_4899a.write(cmd)
-            return True
-        except (pyvisa.errors.VisaIOError, pyvisa.errors.InvalidSession) as e:
-            if attempt < retries - 1:
-                print(f"GPIB write error for '{cmd}', retry {attempt + 1}/{retries}: {e}")
-                time.sleep(1)
-                continue
-            else:
-                print(f"GPIB Write failed after {retries} attempts: {e}")
-                
-    return False
-
-def gpib_rd(cmd):  # Queries what the error may be
-    return gpib_rd_with_retry(cmd, 1)  # Single attempt for backward compatibility
-
-def gpib_wrt(cmd): # Writes the error if there is one
-    return gpib_wrt_with_retry(cmd, 1)  # Single attempt for backward compatibility
-
-def read_temp_with_retry(addr):
-    """Read temperature with retry logic"""
-    for attempt in range(retry_count):
-        try:
-            response = gpib_rd_with_retry("R? " + str(addr) + ", 1")
-            if not response or response == "":
-                if attempt < retry_count - 1:
-                    print(f"Empty temperature response, retry {attempt + 1}/{retry_count}")
-                    time.sleep(0.5)
-                    continue
-                return None
-            temp_raw = int(response)
-            return float(temp_raw / (10 ** decimal))
-        except (ValueError, TypeError) as e:
-            if attempt < retry_count - 1:
-                print(f"Temperature conversion error, retry {attempt + 1}/{retry_count}: {e}")
-                time.sleep(0.5)
-                continue
-            else:
-                print(f"Temperature conversion error after {retry_count} attempts: {e}")
-                return None
-        except Exception as e:
-            if attempt < retry_count - 1:
-                print(f"Temperature read error, retry {attempt + 1}/{retry_count}: {e}")
-                time.sleep(0.5)
-                continue
-            else:
-                print(f"Temperature read error after {retry_count} attempts: {e}")
-                return None
-    return None
-
-def read_temp(addr): # function to read the temperature of the oven
-    return read_temp_with_retry(addr)
-
-def write_temp(addr, value): # function to write the temperature of the oven
-    global decimal
-    set_cmd = "W " + str(addr) + ", " + str(int(value * (10 ** decimal)))
-    return gpib_wrt_with_retry(set_cmd)
-
-def wait_for_temp_stabilization(target_temp, tolerance=2.5, stabilization_time=600):
-    """Wait for temperature to stabilize within tolerance for specified time"""
-    temp_stabilized = False
-    stabilization_start = None
-    consecutive_failures = 0
-    max_failures = 3
-    last_status_time = time.time()
-    
-    while not temp_stabilized:
-        current_temp = read_temp(100)
-        
-        if current_temp is None:
-            consecutive_failures += 1
-            print(f"Temperature read failure {consecutive_failures}/{max_failures}")
-            
-            if consecutive_failures >= max_failures:
-                print("Too many consecutive temperature read failures. Exiting...")
-                return False
-            time.sleep(2)
-            continue
-        else:
-            consecutive_failures = 0
-            
-        if abs(current_temp - target_temp) <= tolerance:
-            if stabilization_start is None:
-                stabilization_start = time.time()
-                print(f"Temperature within range at {current_temp}°F. Starting stabilization timer.")
-            else:
-                elapsed_time = time.time() - stabilization_start
-                remaining_time = stabilization_time - elapsed_time
-                
-                # Show progress every 30 seconds or when stabilization completes
-                if time.time() - last_status_time >= 30 or elapsed_time >= stabilization_time:
-                    if elapsed_time >= stabilization_time:
-                        temp_stabilized = True
-                        print(f"Temperature stabilized at {current_temp}°F for {stabilization_time/60:.1f} minutes. ✓")
-                    else:
-                        print(f"Holding at {current_temp}°F - Time: {format_time(elapsed_time)}/{format_time(stabilization_time)} (Remaining: {format_time(remaining_time)})")
-                    last_status_time = time.time()
-        else:
-            stabilization_start = None  # Reset timer if temperature goes out of range
-            print(f"Waiting for temperature to stabilize... Current: {current_temp}°F, Target: {target_temp}°F")
-            last_status_time = time.time()  # Reset status timer
-            
-        time.sleep(2)  # Check every 2 seconds
-
-    return temp_stabilized
-
-def cycle_temperatures():
-    """Main function to cycle between low and high temperatures"""
-    global cycle_count
-    low_temp = 32
-    high_temp = 140
-    
-    print("Starting temperature cycling between 32°F and 140°F")
-    print("Press Ctrl+C to stop the cycling")
-    print(f"Current cycle count: {cycle_count}")
-    
+import argparse
+import signal
+import threading
+try:
+    import pyvisa
+except ImportError:  # Only the simulated chamber is available without pyvisa
+    pyvisa = None
+from TTX_Cycle_Engine import CycleEngine
+from TTX_Instrument_Bus import InstrumentBus
+from TTX_Chamber_Sim import add_simulation_arguments, resource_manager_from_args
+from TTX_Clock import SystemClock, add_clock_arguments, clock_from_args
+from TTX_Telemetry import add_telemetry_arguments, telemetry_options_from_args
+from TTX_Telemetry_Server import TelemetryHub, TelemetryServer, add_server_arguments, server_options_from_args
+from TTX_Metrics import MetricsRegistry
+from TTX_Tracing import add_tracing_arguments, save_trace, tracer_from_args
+from TTX_Steady_State import add_steady_state_arguments, steady_state_options_from_args
+from TTX_Sampler import add_sampler_arguments, sampler_options_from_args
+from TTX_Setpoint_Boost import add_boost_arguments, boost_options_from_args
+from TTX_Profile import load_profile
+from TTX_Ramp import add_ramp_arguments, ramp_options_from_args
+from TTX_Chamber_Config import load_chamber_configs
+
+MONITOR_INTERVAL = 3  # Seconds between connection checks, as in the GUI
+
+
+class Terminated(Exception):
+    """Raised in the main thread when the process is asked to shut down"""
+
+
+def _raise_terminated(signum, frame):
+    raise Terminated()
+
+
+def start_engine(engine, resume=False):
+    """Connect one chamber and start (or resume) its run; False when it cannot start"""
+    engine.open()
+    saved = engine.saved_checkpoint()
+    if saved is not None:
+        checkpoint, where = saved
+        if resume:
+            engine.log_message(f"Resuming interrupted run: {where}")
+            return engine.resume_run(checkpoint)
+        engine.log_message(f"Interrupted run found ({where}); starting over. Use --resume to continue it.")
+    return engine.start_cycling()
+
+
+def run_headless(engines, clock, resume=False, server=None, tracer=None):
+    """Run every engine until all have stopped; returns the process exit status
+
+    Ctrl+C stops the run as the Stop button does, so it is not resumed.
+    SIGTERM (a service manager or a shutdown) leaves the checkpoint in place
+    for --resume, as closing the GUI window does. Further shutdown signals
+    are ignored while the chambers are turned off. A TelemetryServer, if
+    given, serves the run while it lasts; a Tracer is saved at the end.
+    """
+    shutdown_signals = [signal.SIGTERM]
+    if hasattr(signal, "SIGBREAK"):  # Ctrl+Break and console close on Windows
+        shutdown_signals.append(signal.SIGBREAK)
+    previous_handlers = {signum: signal.signal(signum, _raise_terminated) for signum in shutdown_signals}
+    started = False
+    clock.add_worker(threading.current_thread())  # The monitor loop below sleeps on the clock too
+    if server:
+        server.start()
+        print(f"Serving live telemetry at {server.address}")
     try:
-        # Turn chamber on with retry logic
-        if not gpib_wrt_with_retry("W 2000, 1"):
-            print("Failed to turn chamber on. Exiting...")
-            return
-        time.sleep(2)
-        
-        while True:
-            cycle_temps = [low_temp, high_temp]
-            for i, temp in enumerate(cycle_temps):
-                print(f"\n--- Setting Temperature to: {temp}°F ---")
-                
-                # Write temperature with retry logic
-                if not write_temp(300, temp):
-                    print("Failed to set temperature. Exiting...")
-                    return
-                
-                # Wait for temperature stabilization
-                if not wait_for_temp_stabilization(temp):
-                    print("Temperature stabilization failed. Exiting...")
-                    return
-                
-                print(f"Temperature cycle at {temp}°F completed. Moving to next temperature...")
-                
-                # Increment cycle counter after completing high temperature (end of full cycle)
-                if i == 1:  # High temperature is second in the cycle
-                    cycle_count += 1
-                    print(f"=== COMPLETED CYCLE #{cycle_count} ===")
-                
+        for engine in engines:
+            if start_engine(engine, resume):
+                started = True
+        while any(engine.is_cycling() for engine in engines):
+            for engine in engines:
+                engine.monitor_temperature()
+            clock.sleep(MONITOR_INTERVAL)
     except KeyboardInterrupt:
-        print(f"\nUser stop signal received. Stopping temperature cycling...")
-        print(f"Total cycles completed: {cycle_count}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        print(f"Total cycles completed: {cycle_count}")
+        print("\nUser stop signal received. Stopping temperature cycling...")
+        for engine in engines:
+            engine.stop_cycling_func()
+    except Terminated:
+        print("Shutdown requested. The run can be resumed with --resume.")
     finally:
-        # Turn chamber off with retry logic
-        if gpib_wrt_with_retry("W 2000, 0"):
-            print("Chamber turned off. Exiting...")
-            print(f"Final cycle count: {cycle_count}")
-        else:
-            print("Warning: Could not confirm chamber was turned off.")
-            print(f"Final cycle count: {cycle_count}")
-        rm.close()
-
-# Initialize and start cycling
+        # A second SIGTERM (service managers and timeout resend it) must not cut the cleanup short
+        for signum in shutdown_signals:
+            signal.signal(signum, signal.SIG_IGN)
+        for engine in engines:
+            engine.shutdown()
+            prefix = f"[{engine.chamber_name}] " if engine.chamber_name else ""
+            print(f"{prefix}Final cycle count: {engine.cycle_count}")
+        if server:
+            server.stop()
+        save_trace(tracer)
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+    return 0 if started else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temperature cycling without a window (command line)")
+    parser.add_argument("--chambers", help="JSON file listing several chambers to run from this process")
+    parser.add_argument("--low", type=float, default=32.0, help="Low temperature, °F (default 32)")
+    parser.add_argument("--high", type=float, default=140.0, help="High temperature, °F (default 140)")
+    parser.add_argument("--hold-minutes", type=float, default=10.0,
+                        help="Hold time at each temperature (default 10)")
+    parser.add_argument("--profile", help="JSON cycling profile to run instead of the low/high cycle "
+                                           "(see profile.example.json)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its checkpoint instead of starting over")
+    add_simulation_arguments(parser)
+    add_clock_arguments(parser)
+    add_telemetry_arguments(parser)
+    add_sampler_arguments(parser)
+    add_steady_state_arguments(parser)
+    add_boost_arguments(parser)
+    add_ramp_arguments(parser)
+    add_server_arguments(parser)
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    clock = clock_from_args(args)
+    if not args.simulate and not isinstance(clock, SystemClock):
+        parser.error("--time-scale and --jump-time require --simulate")
+    if not args.simulate and pyvisa is None:
+        parser.error("pyvisa is not installed; install it or use --simulate")
+    cycle_profile = None
+    if args.profile:
+        try:
+            cycle_profile = load_profile(args.profile)
+            cycle_profile.validate()
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not load profile {args.profile}: {e}")
+    tracer = tracer_from_args(args)
+    hub = server = metrics = None
+    server_options = server_options_from_args(args)
+    if server_options:
+        hub = TelemetryHub()
+        metrics = MetricsRegistry()
+        try:
+            server = TelemetryServer(hub, metrics=metrics, **server_options)
+        except OSError as e:
+            parser.error(f"Could not start the telemetry server: {e}")
+    defaults = {"low_temp": args.low, "high_temp": args.high, "hold_minutes": args.hold_minutes}
+    options = {
+        "telemetry_options": telemetry_options_from_args(args),
+        "sampler_options": sampler_options_from_args(args),
+        "stabilization_options": steady_state_options_from_args(args),
+        "boost_options": boost_options_from_args(args),
+        "ramp_options": ramp_options_from_args(args),
+        "hub": hub,
+        "metrics": metrics,
+        "tracer": tracer,
+    }
+
+    if args.chambers:
+        try:
+            chamber_configs = load_chamber_configs(args.chambers)
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not load chamber list: {e}")
+        # Chambers on one controller share a resource manager and an instrument bus
+        rm = resource_manager_from_args(args, clock) or pyvisa.ResourceManager()
+        bus = InstrumentBus("GPIB0", tracer=tracer, clock=clock)
+        bus.start()
+        engines = [
+            CycleEngine(rm, clock, bus=bus, chamber_name=config["name"], resource_name=config["resource"],
+                        power_supply_resource=config.get("power_supply"), profile=dict(defaults, **config),
+                        cycle_profile=config.get("cycle_profile", cycle_profile), **options)
+            for config in chamber_configs
+        ]
+        try:
+            return run_headless(engines, clock, args.resume, server, tracer)
+        finally:
+            bus.stop()
+            try:
+                rm.close()
+            except:
+                pass
+
+    engine = CycleEngine(resource_manager_from_args(args, clock), clock, profile=defaults,
+                         cycle_profile=cycle_profile, **options)
+    return run_headless([engine], clock, args.resume, server, tracer)
+
+
 if __name__ == "__main__":
-    # Configure GPIB settings
-    configure_gpib()
-    
-    # Read decimal point configuration with retry
-    decimal_response = gpib_rd_with_retry("R? 606, 1")
-    if decimal_response:
-        decimal = int(decimal_response)
-        print(f"Decimal configuration: {decimal}")
-    else:
-        print("Failed to read decimal configuration. Using default value 1")
-        decimal = 1
-    
-    # Display current chamber info
-    device_id = gpib_rd_with_retry("*IDN?")
-    if device_id:
-        print(f"Connected to: {device_id}")
-    else:
-        print("Warning: Could not read device ID")
-    
-    current_temp = read_temp(100)
-    if current_temp is not None:
-        print(f"Current chamber temperature: {current_temp}°F")
-    else:
-        print("Warning: Could not read current temperature")
-    
-    # Start cycling
-    cycle_temperatures()
+    raise SystemExit(main())
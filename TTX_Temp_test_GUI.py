@@ -1,79 +1,66 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
-import threading
-import pyvisa
-import time
-from datetime import datetime
-import csv
-import os
-
-class TempCycleGUI:
-    def __init__(self, root):
+from tkinter import ttk, scrolledtext, filedialog, messagebox
+import argparse
+try:
+    import pyvisa
+except ImportError:  # Only the simulated chamber is available without pyvisa
+    pyvisa = None
+from TTX_Cycle_Engine import CycleEngine
+from TTX_Instrument_Bus import InstrumentBus
+from TTX_Chamber_Sim import add_simulation_arguments, resource_manager_from_args
+from TTX_Clock import SystemClock, add_clock_arguments, clock_from_args
+from TTX_Telemetry import add_telemetry_arguments, telemetry_options_from_args
+from TTX_Telemetry_Server import TelemetryHub, TelemetryServer, add_server_arguments, server_options_from_args
+from TTX_Metrics import MetricsRegistry
+from TTX_Tracing import add_tracing_arguments, save_trace, tracer_from_args, traced
+from TTX_UI_Channel import UIChannel
+from TTX_Log_Viewer import LogSliceWindow
+from TTX_Steady_State import add_steady_state_arguments, steady_state_options_from_args
+from TTX_Sampler import add_sampler_arguments, sampler_options_from_args
+from TTX_Setpoint_Boost import add_boost_arguments, boost_options_from_args
+from TTX_Profile import CycleProfile, ProfileError, load_profile
+from TTX_Ramp import add_ramp_arguments, ramp_options_from_args
+from TTX_Chamber_Config import DEFAULT_CHAMBER_RESOURCE, DEFAULT_POWER_SUPPLY_RESOURCE, load_chamber_configs
+
+class TempCycleGUI(CycleEngine):
+    """Tk front end for one chamber: the cycling engine plus its widgets"""
+
+    def __init__(self, root, resource_manager=None, clock=None, parent=None, bus=None,
+                 chamber_name=None, resource_name=DEFAULT_CHAMBER_RESOURCE,
+                 power_supply_resource=DEFAULT_POWER_SUPPLY_RESOURCE, profile=None, telemetry_options=None,
+                 sampler_options=None, stabilization_options=None, boost_options=None, cycle_profile=None,
+                 ramp_options=None, hub=None, metrics=None, tracer=None):
         self.root = root
-        self.root.title("Temperature Cycling Control")
-        self.root.geometry("600x600")
-        
-        # Initialize variables
-        # Deferred update state
-        self.editing_temps = False
-        self.pending_update = False
-        self.pending_low_temp = None
-        self.pending_high_temp = None
-        self.current_low_temp = None
-        self.current_high_temp = None
-
-        self.cycling_thread = None
-        self.stop_cycling = False
-        self.rm = None
-        self.ics_4899a = None
-        self.decimal = 0
-        self.is_connected = False
-        self.connection_attempts = 0
-        self.max_connection_attempts = 3
-        self.gpib_timeout = 5000  # 5 second timeout
-        self.retry_count = 3
-        self.temp_read_timeout = 10000  # Longer timeout for temperature reads
-        self.cycle_count = 0  # Track total cycles completed
-        
-        # Transition timing variables
-        self.transition_start_time = None
-        self.transition_start_temp = None
-        self.heating_times = []  # List to store heating transition times
-        self.cooling_times = []  # List to store cooling transition times
-        self.current_transition_type = None  # 'heating' or 'cooling'
+        # A parent frame is given when this chamber is one tab of a MultiChamberApp
+        self.parent = parent if parent is not None else root
+        if parent is None:
+            self.root.title("Temperature Cycling Control")
+            self.root.geometry("600x600")
         
-        # Hold time configuration (default 5 minutes = 300 seconds)
-        self.hold_time_seconds = 300
+        super().__init__(resource_manager, clock, bus, chamber_name, resource_name, power_supply_resource,
+                         profile, telemetry_options, sampler_options, stabilization_options, boost_options,
+                         cycle_profile, ramp_options, hub=hub, metrics=metrics, tracer=tracer)
         
-        # Enhanced error tracking and recovery
-        self.consecutive_comm_failures = 0
-        self.max_comm_failures = 3
-        self.last_successful_temp_read = time.time()
-        self.comm_health_timeout = 30  # seconds before considering communication unhealthy
-        
-        # Power supply control for recovery
-        self.power_supply = None
-        self.power_supply_resource = "USB0::0xF4EC::0x1410::SPD13DCC7R0188::INSTR"
-        self.power_cycles_performed = 0
-        
-        # CSV logging
-        self.csv_file = None
-        self.csv_writer = None
-        self.csv_filename = None
-        self.logging_enabled = True
+        # Widget changes from the worker thread are queued and applied on the Tk thread
+        self.ui = UIChannel(self.root, tracer=self.tracer)
         
         self.setup_gui()
-        self.setup_csv_logging()
-        self.connect_to_device()
-        self.connect_to_power_supply()
+        self.activity_log.attach(self.root, self.log_text)
+        self.ui.start()
+        self.refresh_run_state_labels()
+        self.open()
+        self.root.after(0, self.offer_resume)
 
     def setup_gui(self):
         # Main frame
-        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame = ttk.Frame(self.parent, padding="10")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Title
-        title_label = ttk.Label(main_frame, text="Temperature Cycling Control", 
+        title_text = "Temperature Cycling Control"
+        if self.chamber_name:
+            title_text = f"{self.chamber_name} ({self.chamber_resource})"
+        title_label = ttk.Label(main_frame, text=title_text, 
                                font=("Arial", 16, "bold"))
         title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
         
@@ -87,19 +74,35 @@ class TempCycleGUI:
         temp_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
         
         ttk.Label(temp_frame, text="Low Temperature (°F):").grid(row=0, column=0, sticky=tk.W)
-        self.low_temp_var = tk.StringVar(value="32")
+        self.low_temp_var = tk.StringVar(value=str(self.profile.get("low_temp", 32)))
         self.low_entry = ttk.Entry(temp_frame, textvariable=self.low_temp_var, width=10)
         self.low_entry.grid(row=0, column=1, padx=(5, 0))
         
         ttk.Label(temp_frame, text="High Temperature (°F):").grid(row=1, column=0, sticky=tk.W)
-        self.high_temp_var = tk.StringVar(value="140")
+        self.high_temp_var = tk.StringVar(value=str(self.profile.get("high_temp", 140)))
         self.high_entry = ttk.Entry(temp_frame, textvariable=self.high_temp_var, width=10)
         self.high_entry.grid(row=1, column=1, padx=(5, 0))
         
         ttk.Label(temp_frame, text="Hold Time (minutes):").grid(row=2, column=0, sticky=tk.W)
-        self.hold_time_var = tk.StringVar(value="5")
+        self.hold_time_var = tk.StringVar(value=str(self.profile.get("hold_minutes", 5)))
+        self.hold_time_var.trace_add("write", self.read_hold_time)
+        self.read_hold_time()
         self.hold_entry = ttk.Entry(temp_frame, textvariable=self.hold_time_var, width=10)
         self.hold_entry.grid(row=2, column=1, padx=(5, 0))
+        
+        self.early_settle_var = tk.BooleanVar(value=self.early_settle)
+        ttk.Checkbutton(temp_frame, text="End hold early when settled", variable=self.early_settle_var,
+                        command=self.update_early_settle).grid(row=3, column=0, columnspan=2, sticky=tk.W)
+        
+        self.boost_var = tk.BooleanVar(value=self.boost_enabled)
+        ttk.Checkbutton(temp_frame, text="Boost setpoint during transitions", variable=self.boost_var,
+                        command=self.update_boost).grid(row=5, column=0, columnspan=2, sticky=tk.W)
+        
+        ttk.Label(temp_frame, text="Target Cycles:").grid(row=4, column=0, sticky=tk.W)
+        self.target_cycles_var = tk.StringVar(value=str(self.profile.get("target_cycles", "")))
+        self.target_cycles_var.trace_add("write", self.read_target_cycles)
+        self.read_target_cycles()
+        ttk.Entry(temp_frame, textvariable=self.target_cycles_var, width=10).grid(row=4, column=1, padx=(5, 0))
 
         # Update controls for deferred temperature changes
         self.update_btn = ttk.Button(temp_frame, text="Update…", command=self.begin_temp_update)
@@ -148,6 +151,10 @@ class TempCycleGUI:
         self.cycle_count_label = ttk.Label(status_frame, text="0")
         self.cycle_count_label.grid(row=4, column=1, sticky=tk.W, padx=(5, 0))
         
+        ttk.Label(status_frame, text="Profile:").grid(row=5, column=0, sticky=tk.W)
+        self.profile_label = ttk.Label(status_frame, text=self.profile_text())
+        self.profile_label.grid(row=5, column=1, sticky=tk.W, padx=(5, 0))
+        
         # Transition timing frame
         timing_frame = ttk.LabelFrame(main_frame, text="Transition Timing", padding="10")
         timing_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -176,6 +183,18 @@ class TempCycleGUI:
         self.avg_cooling_time_label = ttk.Label(timing_frame, text="--:--")
         self.avg_cooling_time_label.grid(row=1, column=5, sticky=tk.W, padx=(5, 0))
         
+        ttk.Label(timing_frame, text="Transition ETA:").grid(row=2, column=0, sticky=tk.W)
+        self.transition_eta_label = ttk.Label(timing_frame, text="--:--")
+        self.transition_eta_label.grid(row=2, column=1, sticky=tk.W, padx=(5, 0))
+        
+        ttk.Label(timing_frame, text="Projected Finish:").grid(row=2, column=2, sticky=tk.W, padx=(20, 0))
+        self.projected_finish_label = ttk.Label(timing_frame, text="--")
+        self.projected_finish_label.grid(row=2, column=3, columnspan=3, sticky=tk.W, padx=(5, 0))
+        
+        ttk.Label(timing_frame, text="Last Ramp:").grid(row=3, column=0, sticky=tk.W)
+        self.last_ramp_label = ttk.Label(timing_frame, text="--")
+        self.last_ramp_label.grid(row=3, column=1, columnspan=5, sticky=tk.W, padx=(5, 0))
+        
         # Control buttons
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=5, column=0, columnspan=3, pady=(10, 0))
@@ -194,7 +213,12 @@ class TempCycleGUI:
         
         self.reset_timing_button = ttk.Button(button_frame, text="Reset Timing", 
                                              command=self.reset_timing_data)
-        self.reset_timing_button.grid(row=0, column=3)
+        self.reset_timing_button.grid(row=0, column=3, padx=(0, 10))
+        
+        ttk.Button(button_frame, text="Load Profile…", command=self.choose_profile).grid(row=0, column=4, padx=(0, 10))
+        ttk.Button(button_frame, text="Clear Profile", command=self.clear_profile).grid(row=0, column=5)
+        ttk.Button(button_frame, text="View Log…", command=self.view_log).grid(row=1, column=4, columnspan=2,
+                                                                               pady=(5, 0))
         
         # Log display
         log_frame = ttk.LabelFrame(main_frame, text="Activity Log", padding="10")
@@ -204,106 +228,13 @@ class TempCycleGUI:
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Configure grid weights
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
+        self.parent.columnconfigure(0, weight=1)
+        self.parent.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
         main_frame.rowconfigure(6, weight=1)
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
         
-    def log_message(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        full_message = f"[{timestamp}] {message}\n"
-        self.log_text.insert(tk.END, full_message)
-        self.log_text.see(tk.END)
-        print(message)  # Also print to console
-
-    def setup_csv_logging(self):
-        """Setup CSV file for logging temperature data"""
-        try:
-            # Create logs directory if it doesn't exist
-            log_dir = os.path.join(os.path.dirname(__file__), "logs")
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-            
-            # Create filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.csv_filename = os.path.join(log_dir, f"temp_cycle_log_{timestamp}.csv")
-            
-            # Open CSV file and write header
-            self.csv_file = open(self.csv_filename, 'w', newline='')
-            self.csv_writer = csv.writer(self.csv_file)
-            self.csv_writer.writerow(['Timestamp', 'Temperature (°F)', 'Target Temperature (°F)', 
-                                     'Cycle Count', 'Phase', 'Event'])
-            self.csv_file.flush()
-            
-            self.log_message(f"CSV logging initialized: {self.csv_filename}")
-            
-        except Exception as e:
-            self.log_message(f"Failed to setup CSV logging: {e}")
-            self.logging_enabled = False
-
-    def log_temperature_to_csv(self, temperature):
-        """Log temperature reading to CSV file"""
-        if not self.logging_enabled or not self.csv_writer:
-            return
-        
-        try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            target_temp = self.target_temp_label.cget("text").replace("°F", "").strip()
-            if target_temp == "--":
-                target_temp = ""
-            
-            phase = self.current_phase_label.cget("text")
-            if phase == "--":
-                phase = "Idle"
-            
-            self.csv_writer.writerow([
-                timestamp,
-                f"{temperature:.2f}",
-                target_temp,
-                self.cycle_count,
-                phase,
-                ""
-            ])
-            self.csv_file.flush()
-            
-        except Exception as e:
-            self.log_message(f"CSV logging error: {e}")
-
-    def log_event_to_csv(self, event_description):
-        """Log a specific event to CSV file"""
-        if not self.logging_enabled or not self.csv_writer:
-            return
-        
-        try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            target_temp = self.target_temp_label.cget("text").replace("°F", "").strip()
-            if target_temp == "--":
-                target_temp = ""
-            
-            # Get current temperature if available
-            current_temp_text = self.current_temp_label.cget("text").replace("°F", "").strip()
-            if current_temp_text == "--":
-                current_temp_text = ""
-            
-            phase = self.current_phase_label.cget("text")
-            if phase == "--":
-                phase = "Idle"
-            
-            self.csv_writer.writerow([
-                timestamp,
-                current_temp_text,
-                target_temp,
-                self.cycle_count,
-                phase,
-                event_description
-            ])
-            self.csv_file.flush()
-            
-        except Exception as e:
-            self.log_message(f"CSV event logging error: {e}")
-        
     def update_timeout(self):
         """Update GPIB timeout setting"""
         try:
@@ -313,802 +244,152 @@ class TempCycleGUI:
             self.gpib_timeout = new_timeout
             self.temp_read_timeout = max(new_timeout * 2, 10000)  # Double timeout for temp reads
             if self.ics_4899a:
-                self.ics_4899a.timeout = new_timeout
+                self.chamber.submit(lambda session: setattr(session, "timeout", new_timeout))
             self.log_message(f"GPIB timeout updated to {new_timeout}ms (temp reads: {self.temp_read_timeout}ms)")
         except ValueError:
             self.log_message("Invalid timeout value. Using default 5000ms")
-            self.timeout_var.set("5000")
+            self.ui.set_variable(self.timeout_var, "5000")
             self.gpib_timeout = 5000
             self.temp_read_timeout = 10000
         
-    def update_hold_time(self):
-        """Update hold time from GUI input"""
+    def update_early_settle(self):
+        """Read the early-settle checkbox (Tk thread); the worker only reads the attribute"""
+        self.early_settle = bool(self.early_settle_var.get())
+        self.log_message(f"Early settle {'enabled' if self.early_settle else 'disabled'}")
+
+    def choose_profile(self):
+        """Load a profile file; while cycling it is swapped in at the next segment boundary"""
+        path = filedialog.askopenfilename(title="Load cycling profile",
+                                          filetypes=[("Profile", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
         try:
-            hold_time_minutes = float(self.hold_time_var.get())
-            if hold_time_minutes <= 0:
-                hold_time_minutes = 5  # Default to 5 minutes if invalid
-                self.hold_time_var.set("5")
-            self.hold_time_seconds = int(hold_time_minutes * 60)
-            self.log_message(f"Hold time updated to {hold_time_minutes} minutes ({self.hold_time_seconds} seconds)")
-        except ValueError:
-            self.log_message("Invalid hold time value. Using default 5 minutes")
-            self.hold_time_var.set("5")
-            self.hold_time_seconds = 300
+            profile = load_profile(path)
+            profile.validate(self.min_temp, self.max_temp, self.max_ramp_rate)
+        except (OSError, ValueError) as e:
+            self.log_message(f"Could not load profile {path}: {e}")
+            return
+        self.set_profile(profile)
 
-    def format_time(self, seconds):
-        """Format seconds into minutes:seconds format"""
-        minutes = int(seconds // 60)
-        seconds = int(seconds % 60)
-        return f"{minutes:02d}:{seconds:02d}"
+    def view_log(self):
+        """Open a cycle or time window of this run's log (or any other log) in its own window"""
+        LogSliceWindow(self.root, self.csv_filename)
 
-    def update_timer_display(self, elapsed_time, total_time):
-        """Update the timer display in the GUI"""
-        remaining_time = total_time - elapsed_time
-        timer_text = f"{self.format_time(elapsed_time)}/{self.format_time(total_time)}"
-        self.timer_label.config(text=timer_text)
+    def clear_profile(self):
+        """Go back to the two-point low/high cycle"""
+        self.set_profile(None)
 
-    def reconnect_device(self):
-        """Attempt to reconnect to the GPIB device"""
-        self.log_message("Attempting to reconnect to GPIB device...")
-        try:
-            # Close existing connections
-            if self.ics_4899a:
-                try:
-                    self.ics_4899a.close()
-                except:
-                    pass
-            
-            if self.rm:
-                try:
-                    self.rm.close()
-                except:
-                    pass
-            
-            # Wait before reconnecting
-            time.sleep(2)
-            
-            # Reinitialize connection
-            self.rm = pyvisa.ResourceManager()
-            self.ics_4899a = self.rm.open_resource("GPIB0::4::INSTR")
-            
-            # Configure timeout and other settings
-            self.ics_4899a.timeout = self.gpib_timeout
-            self.ics_4899a.read_termination = '\n'
-            self.ics_4899a.write_termination = '\n'
-            
-            # Test connection with retries
-            for attempt in range(3):
-                try:
-                    test_response = self.ics_4899a.query("*IDN?")
-                    if test_response and test_response.strip():
-                        # Read decimal configuration
-                        decimal_response = self.gpib_rd_with_retry("R? 606, 1")
-                        if decimal_response:
-                            self.decimal = int(decimal_response)
-                            self.is_connected = True
-                            self.connection_label.config(text="Status: Reconnected", foreground="green")
-                            self.log_message("Successfully reconnected to GPIB device")
-                            return True
-                    time.sleep(1)  # Wait between attempts
-                except:
-                    continue
-            
-            raise Exception("Failed to establish stable connection after retries")
-                
-        except Exception as e:
-            self.is_connected = False
-            self.connection_label.config(text="Status: Connection Failed", foreground="red")
-            self.log_message(f"Reconnection failed: {e}")
-            return False
-        
-    def connect_to_device(self):
-        try:
-            self.rm = pyvisa.ResourceManager()
-            self.ics_4899a = self.rm.open_resource("GPIB0::4::INSTR")
-            
-            # Configure GPIB settings
-            self.ics_4899a.timeout = self.gpib_timeout
-            self.ics_4899a.read_termination = '\n'
-            self.ics_4899a.write_termination = '\n'
-            
-            # Read decimal point configuration with validation
-            decimal_response = self.gpib_rd_with_retry("R? 606, 1")
-            if decimal_response and decimal_response.strip():
-                self.decimal = int(decimal_response)
-            else:
-                raise Exception("Could not read decimal configuration")
-            
-            # Test connection
-            device_id = self.gpib_rd_with_retry("*IDN?")
-            if not device_id or not device_id.strip():
-                raise Exception("Could not read device ID")
-                
-            current_temp = self.read_temp_with_retry(100)
-            if current_temp is None:
-                raise Exception("Could not read temperature")
-            
-            self.is_connected = True
-            self.connection_label.config(text="Status: Connected", foreground="green")
-            self.start_button.config(state="normal")
-            self.log_message(f"Connected to: {device_id.strip()}")
-            self.log_message(f"Current chamber temperature: {current_temp}°F")
-            
-            # Start temperature monitoring
-            self.monitor_temperature()
-            
-        except Exception as e:
-            self.log_message(f"Connection failed: {e}")
-            self.connection_label.config(text="Status: Connection Failed", foreground="red")
-    
-    def connect_to_power_supply(self):
-        """Connect to the power supply for automatic power cycling"""
-        try:
-            if not self.rm:
-                self.rm = pyvisa.ResourceManager()
-            
-            self.power_supply = self.rm.open_resource(self.power_supply_resource)
-            self.power_supply.timeout = 5000  # 5 second timeout
-            
-            # Test power supply connection
-            idn_response = self.power_supply.query("*IDN?")
-            if idn_response and idn_response.strip():
-                self.log_message(f"Power supply connected: {idn_response.strip()}")
-                return True
-            else:
-                raise Exception("No response from power supply")
-                
-        except Exception as e:
-            self.log_message(f"Power supply connection failed: {e}")
-            self.power_supply = None
-            return False
+    def update_boost(self):
+        """Read the setpoint boost checkbox (Tk thread); takes effect at the next transition"""
+        self.boost_enabled = bool(self.boost_var.get())
+        self.log_message(f"Setpoint boost {'enabled' if self.boost_enabled else 'disabled'}")
 
-    def power_cycle_chamber(self):
-        """Cycle power to the chamber using the power supply"""
-        if not self.power_supply:
-            self.log_message("Power supply not available - cannot perform power cycle")
-            return False
-        
+    def read_target_cycles(self, *_):
+        """Copy the target cycles entry into target_cycle_count (Tk thread); the forecast only reads the attribute"""
         try:
-            self.power_cycles_performed += 1
-            self.log_message(f"Performing power cycle #{self.power_cycles_performed} - Turning output OFF")
-            
-            # Turn output off
-            self.power_supply.write("OUTPut CH1,OFF")
-            time.sleep(2)  # Wait 2 seconds
-            
-            self.log_message("Power cycle - Turning output ON")
-            
-            # Turn output on
-            self.power_supply.write("OUTPut CH1,ON")
-            time.sleep(2)  # Wait 2 seconds
-            
-            self.log_message("Power cycle completed - waiting for chamber to stabilize")
-            time.sleep(3)  # Additional time for chamber to boot up
-            
-            return True
-            
-        except Exception as e:
-            self.log_message(f"Power cycle failed: {e}")
-            return False
+            count = int(self.target_cycles_var.get())
+        except (ValueError, tk.TclError):
+            count = None
+        self.target_cycle_count = count if count is not None and count > 0 else None
 
-    def check_communication_health(self):
-        """Check if GPIB communication is healthy and force reconnection if needed"""
-        current_time = time.time()
-        if current_time - self.last_successful_temp_read > self.comm_health_timeout:
-            self.log_message("Communication health check failed - forcing reconnection")
-            self.is_connected = False
-            return False
-        return True
-        '''  
-    def force_hardware_reset(self):
-        """Force a complete hardware reset of GPIB connection with power cycling"""
-        self.log_message("Performing forced hardware reset...")
+    def read_hold_time(self, *_):
+        """Copy the hold time entry into hold_minutes (Tk thread); None when it is not a number"""
         try:
-            # Close all connections aggressively
-            if self.ics_4899a:
-                try:
-                    self.ics_4899a.clear()
-                    self.ics_4899a.close()
-                except:
-                    pass
-                finally:
-                    self.ics_4899a = None
-            
-            if self.rm:
-                try:
-                    self.rm.close()
-                except:
-                    pass
-                finally:
-                    self.rm = None
-            
-            # Wait longer for hardware to reset
-            time.sleep(5)
-            
-            # Force resource manager refresh
-            pyvisa.ResourceManager.close_if_open()
-            
-            return True
-            
-        except Exception as e:
-            self.log_message(f"Hardware reset failed: {e}")
-            return False
-        '''  
-    def gpib_rd_with_retry(self, cmd, retries=None, extended_timeout=False):
-        """GPIB read with retry logic"""
-        if retries is None:
-            retries = self.retry_count
-            
-        # Save original timeout
-        original_timeout = self.ics_4899a.timeout if self.ics_4899a else self.gpib_timeout
-        
-        try:
-            # Use extended timeout for temperature reads during stabilization
-            if extended_timeout and self.ics_4899a:
-                self.ics_4899a.timeout = self.temp_read_timeout
-            
-            for attempt in range(retries):
-                try:
-                    time.sleep(0.3)  # Slightly longer delay
-                    ret = self.ics_4899a.query(cmd)
-                    if ret is not None and ret.strip() != "":
-                        return ret.strip()
-                    else:
-                        if attempt < retries - 1:
-                            self.log_message(f"Empty response for '{cmd}', retry {attempt + 1}/{retries}")
-                            time.sleep(1)  # Longer wait between retries
-                            continue
-                except (pyvisa.errors.VisaIOError, pyvisa.errors.InvalidSession) as e:
-                    error_msg = str(e)
-                    if "TMO" in error_msg or "timeout" in error_msg.lower():
-                        self.log_message(f"Timeout for '{cmd}', retry {attempt + 1}/{retries}")
-                    elif "I/O" in error_msg:
-                        self.log_message(f"I/O error for '{cmd}', retry {attempt + 1}/{retries}")
-                        # For I/O errors, wait longer and try to reset connection
-                        if attempt == 1:  # On second attempt, try to reset
-                            time.sleep(2)
-                            try:
-                                self.ics_4899a.clear()  # Clear any pending operations
-                            except:
-                                pass
-                    else:
-                        self.log_message(f"GPIB error for '{cmd}', retry {attempt + 1}/{retries}: {e}")
-                    
-                    if attempt < retries - 1:
-                        time.sleep(2)  # Longer wait between error retries
-                        continue
-                    else:
-                        self.log_message(f"GPIB Query failed after {retries} attempts: {e}")
-                        self.is_connected = False
-                        
-        finally:
-            # Restore original timeout
-            if self.ics_4899a:
-                self.ics_4899a.timeout = original_timeout
-                    
-        return ""
+            self.hold_minutes = float(self.hold_time_var.get())
+        except (ValueError, tk.TclError):
+            self.hold_minutes = None
 
-    def gpib_wrt_with_retry(self, cmd, retries=None):
-        """Enhanced GPIB write with better error handling"""
-        if retries is None:
-            retries = self.retry_count
-            
-        for attempt in range(retries):
-            try:
-                # Check connection health before critical operations
-                if not self.check_communication_health():
-                    self.is_connected = False
-                    return False
-                
-                time.sleep(0.5)  # Longer delay for stability
-                self.ics_4899a.write(cmd)
-                
-                # Verify write was successful by brief delay and connection check
-                time.sleep(0.2)
-                return True
-                
-            except (pyvisa.errors.VisaIOError, pyvisa.errors.InvalidSession) as e:
-                error_msg = str(e)
-                self.consecutive_comm_failures += 1
-                
-                # Handle specific error types
-                if "VI_ERROR_IO" in error_msg or "I/O" in error_msg:
-                    self.log_message(f"I/O error for '{cmd}', attempt {attempt + 1}/{retries}: Hardware communication failure")
-                    if attempt == 0:  # On first I/O error, try immediate recovery
-                        try:
-                            self.ics_4899a.clear()
-                            time.sleep(2)
-                        except:
-                            pass
-                elif "VI_ERROR_NLISTENERS" in error_msg or "NLISTENERS" in error_msg:
-                    self.log_message(f"No listeners error for '{cmd}', attempt {attempt + 1}/{retries}: Device not responding")
-                    # This is a serious error - device is not responding
-                    if attempt < retries - 1:
-                        time.sleep(3)  # Wait longer for device recovery
-                else:
-                    self.log_message(f"GPIB write error for '{cmd}', attempt {attempt + 1}/{retries}: {e}")
-                
-                if attempt < retries - 1:
-                    time.sleep(3)  # Longer wait between error retries
-                    continue
-                else:
-                    self.log_message(f"GPIB Write failed after {retries} attempts: {e}")
-                    self.is_connected = False
-                    
-        return False
-
-    def read_temp_with_retry(self, addr, extended_timeout=False):
-        """Enhanced temperature reading with better error recovery"""
-        for attempt in range(self.retry_count):
-            try:
-                response = self.gpib_rd_with_retry("R? " + str(addr) + ", 1", extended_timeout=extended_timeout)
-                if not response or response == "":
-                    self.consecutive_comm_failures += 1
-                    if attempt < self.retry_count - 1:
-                        self.log_message(f"Empty temperature response, retry {attempt + 1}/{self.retry_count}")
-                        time.sleep(2)  # Longer wait
-                        continue
-                    return None
-                
-                temp_raw = int(response)
-                temp_value = float(temp_raw / (10 ** self.decimal))
-                
-                # Temperature read successful - reset failure counters
-                self.consecutive_comm_failures = 0
-                self.last_successful_temp_read = time.time()
-                
-                # Log temperature to CSV
-                self.log_temperature_to_csv(temp_value)
-                
-                return temp_value
-                
-            except (ValueError, TypeError) as e:
-                self.consecutive_comm_failures += 1
-                if attempt < self.retry_count - 1:
-                    self.log_message(f"Temperature conversion error, retry {attempt + 1}: {e}")
-                    time.sleep(2)
-                    continue
-                else:
-                    self.log_message(f"Temperature conversion error after {self.retry_count} attempts: {e}")
-                    return None
-            except Exception as e:
-                self.consecutive_comm_failures += 1
-                if attempt < self.retry_count - 1:
-                    self.log_message(f"Temperature read error, retry {attempt + 1}: {e}")
-                    time.sleep(2)
-                    continue
-                else:
-                    self.log_message(f"Temperature read error after {self.retry_count} attempts: {e}")
-                    return None
-        return None
+    def update_hold_time(self):
+        """Update hold time from GUI input"""
+        hold_time_minutes = self.hold_minutes
+        if hold_time_minutes is None:
+            self.log_message("Invalid hold time value. Using default 5 minutes")
+            self.ui.set_variable(self.hold_time_var, "5")
+            self.hold_time_seconds = 300
+            return
+        if hold_time_minutes <= 0:
+            hold_time_minutes = 5  # Default to 5 minutes if invalid
+            self.ui.set_variable(self.hold_time_var, "5")
+        self.hold_time_seconds = int(hold_time_minutes * 60)
+        self.log_message(f"Hold time updated to {hold_time_minutes} minutes ({self.hold_time_seconds} seconds)")
+
+    @traced("ui")
+    def refresh_run_state_labels(self):
+        """Publish the run state to the status labels twice a second"""
+        state = self.run_state.snapshot()
+        self.ui.update(self.current_temp_label, text=f"{state.current_temp}°F" if state.current_temp is not None else "--°F")
+        self.ui.update(self.target_temp_label, text=f"{state.target}°F" if state.target is not None else "--°F")
+        self.ui.update(self.cycling_status_label, text=state.status)
+        self.ui.update(self.cycle_count_label, text=str(state.cycle_count))
+        self.ui.update(self.current_phase_label, text=state.phase if state.phase != "Idle" else "--")
+        self.root.after(500, self.refresh_run_state_labels)
+
+    @traced("ui")
     def monitor_temperature(self):
-        if self.is_connected:
-            current_temp = self.read_temp(100)
-            if current_temp is not None:
-                self.current_temp_label.config(text=f"{current_temp}°F")
-            else:
-                self.current_temp_label.config(text="--°F")
-                # Try to reconnect if we lost connection
-                if not self.is_connected:
-                    self.log_message("Lost connection during monitoring. Attempting reconnection...")
-                    self.reconnect_device()
-                
-        # Schedule next update
-        self.root.after(3000, self.monitor_temperature)  # Increased to 3 seconds to reduce load
+        super().monitor_temperature()
+        self.root.after(3000, self.monitor_temperature)
 
-    def wait_for_temp_stabilization(self, target_temp, tolerance=2.5, stabilization_time=None):
-        # Use configured hold time if not specified
-        if stabilization_time is None:
-            self.update_hold_time()  # Update from GUI
-            stabilization_time = self.hold_time_seconds
-            
-        temp_stabilized = False
-        stabilization_start = None
-        consecutive_failures = 0
-        max_failures = 3  # Reduced - force reconnection sooner
-        last_gui_update = time.time()
-        last_transition_update = time.time()
-        temp_read_interval = 5  # Slightly longer interval to reduce communication stress
-        transition_started = False
-        last_comm_check = time.time()
-        
-        while not temp_stabilized and not self.stop_cycling:
-            # Check communication health every 30 seconds
-            if time.time() - last_comm_check > 30:
-                if not self.check_communication_health():
-                    self.log_message("Communication health check failed during stabilization")
-                    if not self.reconnect_device():
-                        self.log_message("Failed to restore communication. Stopping cycling.")
-                        return False
-                last_comm_check = time.time()
-            
-            # Use extended timeout for temperature reads during stabilization
-            current_temp = self.read_temp(100, extended_timeout=True)
-            
-            if current_temp is None:
-                consecutive_failures += 1
-                self.log_message(f"Temperature read failure {consecutive_failures}/{max_failures}")
-                
-                if consecutive_failures >= max_failures:
-                    self.log_message("Communication failures detected. Attempting reconnection...")
-                    if self.reconnect_device():
-                        consecutive_failures = 0
-                        time.sleep(3)  # Wait after reconnection
-                        continue
-                    else:
-                        self.log_message("Reconnection failed. Stopping temperature cycling.")
-                        return False
-                        
-                # Wait longer between failed attempts during stabilization
-                time.sleep(8)  # Longer wait to allow system recovery
-                continue
-            else:
-                consecutive_failures = 0
-                
-            # Start transition timing if not started yet
-            if not transition_started and self.transition_start_time is None:
-                self.start_transition_timing(current_temp, target_temp)
-                transition_started = True
-                
-            # Update transition timer every 5 seconds
-            if time.time() - last_transition_update >= 5:
-                self.update_transition_timer()
-                last_transition_update = time.time()
-                
-            if abs(current_temp - target_temp) <= tolerance:
-                # Complete transition timing when we first reach target
-                if self.transition_start_time is not None:
-                    self.complete_transition_timing(current_temp)
-                    
-                if stabilization_start is None:
-                    stabilization_start = time.time()
-                    self.log_message(f"Temperature within range at {current_temp}°F. Starting {stabilization_time/60:.1f} minute hold timer.")
-                    self.timer_label.config(text=f"00:00/{self.format_time(stabilization_time)}")
-                else:
-                    elapsed_time = time.time() - stabilization_start
-                    
-                    # Update GUI timer every 10 seconds during stabilization
-                    if time.time() - last_gui_update >= 10:
-                        self.update_timer_display(elapsed_time, stabilization_time)
-                        self.log_message(f"Stabilizing at {current_temp}°F - {self.format_time(elapsed_time)}/{self.format_time(stabilization_time)}")
-                        last_gui_update = time.time()
-                    
-                    if elapsed_time >= stabilization_time:
-                        temp_stabilized = True
-                        self.log_message(f"Temperature stabilized at {current_temp}°F for {stabilization_time/60:.1f} minutes. ✓")
-                        self.timer_label.config(text="Complete")
-            else:
-                stabilization_start = None
-                self.timer_label.config(text="--:--")
-                self.log_message(f"Waiting for temperature to stabilize... Current: {current_temp}°F, Target: {target_temp}°F")
-                last_gui_update = time.time()
-            
-            # Check for stop signal more frequently but read temp less frequently
-            for _ in range(temp_read_interval * 10):  # Check stop signal every 0.1 seconds
-                if self.stop_cycling:
-                    return False
-                time.sleep(0.1)
-                
-        return temp_stabilized
-        
-    def reset_cycle_counter(self):
-        """Reset the cycle counter to zero"""
-        self.cycle_count = 0
-        self.cycle_count_label.config(text="0")
-        self.log_message("Cycle counter reset to 0")
+    def show_connection(self, text, connected):
+        self.ui.update(self.connection_label, text=text, foreground="green" if connected else "red")
+        if connected and not self.is_cycling():
+            self.ui.update(self.start_button, state="normal")
 
-    def reset_timing_data(self):
-        """Reset all transition timing data"""
-        self.heating_times = []
-        self.cooling_times = []
-        self.transition_start_time = None
-        self.transition_start_temp = None
-        self.current_transition_type = None
-        
-        # Reset GUI displays
-        self.current_phase_label.config(text="--")
-        self.transition_timer_label.config(text="--:--")
-        self.last_heating_time_label.config(text="--:--")
-        self.last_cooling_time_label.config(text="--:--")
-        self.avg_heating_time_label.config(text="--:--")
-        self.avg_cooling_time_label.config(text="--:--")
-        
-        self.log_message("Transition timing data reset")
-        
-    def start_transition_timing(self, current_temp, target_temp):
-        """Start timing a temperature transition"""
-        self.transition_start_time = time.time()
-        self.transition_start_temp = current_temp
-        
-        # Determine transition type
-        if target_temp > current_temp:
-            self.current_transition_type = "heating"
-            self.current_phase_label.config(text="Heating")
-        else:
-            self.current_transition_type = "cooling"
-            self.current_phase_label.config(text="Cooling")
-            
-        self.transition_timer_label.config(text="00:00")
-        self.log_message(f"Started {self.current_transition_type} from {current_temp:.1f}°F to {target_temp:.1f}°F")
-        
-    def update_transition_timer(self):
-        """Update the transition timer display"""
-        if self.transition_start_time:
-            elapsed_time = time.time() - self.transition_start_time
-            self.transition_timer_label.config(text=self.format_time(elapsed_time))
-            
-    def complete_transition_timing(self, final_temp):
-        """Complete timing a temperature transition and record the time"""
-        if self.transition_start_time and self.current_transition_type:
-            elapsed_time = time.time() - self.transition_start_time
-            elapsed_minutes = elapsed_time / 60
-            
-            # Record the time
-            if self.current_transition_type == "heating":
-                self.heating_times.append(elapsed_time)
-                self.last_heating_time_label.config(text=self.format_time(elapsed_time))
-                # Update average
-                if self.heating_times:
-                    avg_time = sum(self.heating_times) / len(self.heating_times)
-                    self.avg_heating_time_label.config(text=self.format_time(avg_time))
-            else:  # cooling
-                self.cooling_times.append(elapsed_time)
-                self.last_cooling_time_label.config(text=self.format_time(elapsed_time))
-                # Update average
-                if self.cooling_times:
-                    avg_time = sum(self.cooling_times) / len(self.cooling_times)
-                    self.avg_cooling_time_label.config(text=self.format_time(avg_time))
-            
-            self.log_message(f"Completed {self.current_transition_type} in {elapsed_minutes:.1f} minutes "
-                           f"(from {self.transition_start_temp:.1f}°F to {final_temp:.1f}°F)")
-            
-            # Log to CSV
-            self.log_event_to_csv(f"Completed {self.current_transition_type}: {self.transition_start_temp:.1f}°F -> {final_temp:.1f}°F in {elapsed_minutes:.1f} min")
-            
-            # Reset transition tracking
-            self.transition_start_time = None
-            self.transition_start_temp = None
-            self.current_transition_type = None
-            self.current_phase_label.config(text="Stabilizing")
-            self.transition_timer_label.config(text="--:--")
+    def show_timer(self, text):
+        self.ui.update(self.timer_label, text=text)
 
-    def increment_cycle_counter(self):
-        """Increment the cycle counter and update display"""
-        self.cycle_count += 1
-        self.cycle_count_label.config(text=str(self.cycle_count))
-        self.log_message(f"Completed cycle #{self.cycle_count}")
+    def show_transition_timer(self, text):
+        self.ui.update(self.transition_timer_label, text=text)
 
-    def read_temp(self, addr, extended_timeout=False):
-        """Read temperature wrapper method"""
-        return self.read_temp_with_retry(addr, extended_timeout)
+    def show_transition_time(self, kind, last, average):
+        last_label, avg_label = ((self.last_heating_time_label, self.avg_heating_time_label) if kind == "heating"
+                                 else (self.last_cooling_time_label, self.avg_cooling_time_label))
+        self.ui.update(last_label, text=self.format_time(last) if last is not None else "--:--")
+        self.ui.update(avg_label, text=self.format_time(average) if average is not None else "--:--")
 
-    def write_temp(self, addr, value):
-        """Write temperature setpoint to the chamber"""
-        set_cmd = "W " + str(addr) + ", " + str(int(value * (10 ** self.decimal)))
-        return self.gpib_wrt_with_retry(set_cmd)
+    def show_eta(self, text):
+        self.ui.update(self.transition_eta_label, text=text)
 
-    def gpib_rd(self, cmd):
-        """Single attempt GPIB read for backward compatibility"""
-        return self.gpib_rd_with_retry(cmd, 1)
+    def show_finish(self, text):
+        self.ui.update(self.projected_finish_label, text=text)
 
-    def gpib_wrt(self, cmd):
-        """Single attempt GPIB write for backward compatibility"""
-        return self.gpib_wrt_with_retry(cmd, 1)
+    def show_profile(self, text):
+        self.ui.update(self.profile_label, text=text)
 
-    def reconnect_device(self):
-        """Enhanced reconnection with power cycling capability"""
-        self.log_message("Attempting to reconnect to GPIB device...")
-        
-        # If we've had too many consecutive failures, try power cycling
-        if self.consecutive_comm_failures >= self.max_comm_failures:
-            self.log_message("Too many communication failures - attempting power cycle recovery")
-            
-            # Try power cycling first
-            if self.power_cycle_chamber():
-                # Reset failure counter after power cycle
-                self.consecutive_comm_failures = 0
-                # Reconnect to power supply in case we lost it
-                self.connect_to_power_supply()
-            else:
-                self.log_message("Power cycle failed - proceeding with software reset")
-            ''' 
-            # Perform hardware reset regardless
-            if not self.force_hardware_reset():
-                return False
-                '''  
-        try:
-            # Close existing connections
-            if self.ics_4899a:
-                try:
-                    self.ics_4899a.close()
-                except:
-                    pass
-            
-            if self.rm:
-                try:
-                    self.rm.close()
-                except:
-                    pass
-            
-            # Wait before reconnecting
-            time.sleep(3)  # Increased wait time
-            
-            # Reinitialize connection with fresh resource manager
-            self.rm = pyvisa.ResourceManager()
-            
-            # Try to open with more robust settings
-            self.ics_4899a = self.rm.open_resource("GPIB0::4::INSTR")
-            
-            # Configure with more conservative settings
-            self.ics_4899a.timeout = max(self.gpib_timeout, 10000)  # At least 10 seconds
-            self.ics_4899a.read_termination = '\n'
-            self.ics_4899a.write_termination = '\n'
-            
-            # Clear any pending operations
-            try:
-                self.ics_4899a.clear()
-                time.sleep(1)
-            except:
-                pass
-            
-            # Test connection with multiple attempts
-            connection_verified = False
-            for attempt in range(5):  # More attempts
-                try:
-                    time.sleep(2)  # Wait between attempts
-                    test_response = self.ics_4899a.query("*IDN?")
-                    if test_response and test_response.strip():
-                        # Verify we can read decimal configuration
-                        decimal_response = self.gpib_rd_with_retry("R? 606, 1")
-                        if decimal_response:
-                            self.decimal = int(decimal_response)
-                            # Verify we can read temperature
-                            temp = self.read_temp_with_retry(100)
-                            if temp is not None:
-                                connection_verified = True
-                                break
-                    time.sleep(2)  # Wait between attempts
-                except Exception as e:
-                    self.log_message(f"Connection verification attempt {attempt + 1} failed: {e}")
-                    continue
-            
-            if connection_verified:
-                self.is_connected = True
-                self.consecutive_comm_failures = 0  # Reset failure counter
-                self.last_successful_temp_read = time.time()
-                self.connection_label.config(text="Status: Reconnected", foreground="green")
-                self.log_message("Successfully reconnected to GPIB device")
-                # Reconnect to power supply if we lost it
-                if not self.power_supply:
-                    self.connect_to_power_supply()
-                return True
-            else:
-                raise Exception("Failed to verify stable connection after multiple attempts")
-                
-        except Exception as e:
-            self.is_connected = False
-            self.consecutive_comm_failures += 1
-            self.connection_label.config(text="Status: Connection Failed", foreground="red")
-            self.log_message(f"Reconnection failed: {e}")
-            return False
+    def show_ramp(self, text):
+        self.ui.update(self.last_ramp_label, text=text)
 
-    def cycling_worker(self):
-        try:
-            low_temp = self.current_low_temp if self.current_low_temp is not None else float(self.low_temp_var.get())
-            high_temp = self.current_high_temp if self.current_high_temp is not None else float(self.high_temp_var.get())
-            
-            self.log_message(f"Starting temperature cycling between {low_temp}°F and {high_temp}°F")
-            
-            # Reset communication failure counters at start
-            self.consecutive_comm_failures = 0
-            self.last_successful_temp_read = time.time()
-            
-            # Turn chamber on with enhanced error checking
-            chamber_on_attempts = 0
-            while chamber_on_attempts < 3:
-                if self.gpib_wrt_with_retry("W 2000, 1"):
-                    break
-                chamber_on_attempts += 1
-                self.log_message(f"Failed to turn chamber on, attempt {chamber_on_attempts}/3")
-                if chamber_on_attempts < 3:
-                    if not self.reconnect_device():
-                        self.log_message("Cannot establish connection. Stopping...")
-                        return
-                    time.sleep(2)
-                else:
-                    self.log_message("Failed to turn chamber on after 3 attempts. Stopping...")
-                    return
-            
-            time.sleep(3)  # Longer delay after turning on
-            
-            while not self.stop_cycling:
-                cycle_temps = [low_temp, high_temp]
-                for i, temp in enumerate(cycle_temps):
-                    if self.stop_cycling:
-                        break
-                        
-                    self.log_message(f"Setting Temperature to: {temp}°F")
-                    self.target_temp_label.config(text=f"{temp}°F")
-                    self.timer_label.config(text="--:--")
-                    
-                    # Enhanced temperature setting with multiple attempts
-                    temp_set_attempts = 0
-                    temp_set_success = False
-                    while temp_set_attempts < 3 and not temp_set_success:
-                        if self.write_temp(300, temp):
-                            temp_set_success = True
-                            break
-                        
-                        temp_set_attempts += 1
-                        self.log_message(f"Failed to set temperature, attempt {temp_set_attempts}/3")
-                        
-                        if temp_set_attempts < 3:
-                            if not self.reconnect_device():
-                                self.log_message("Cannot reconnect. Stopping cycling.")
-                                return
-                            time.sleep(2)
-                    
-                    if not temp_set_success:
-                        self.log_message("Failed to set temperature after 3 attempts. Stopping cycling.")
-                        break
-                    
-                    # Wait for temperature stabilization
-                    if not self.wait_for_temp_stabilization(temp):
-                        break  # Stop cycling was requested or error occurred
-                        
-                    if not self.stop_cycling:
-                        self.log_message(f"Temperature cycle at {temp}°F completed. Moving to next temperature...")
-                        
-                        # Increment cycle counter after completing high temperature (end of full cycle)
-                        if i == 1:  # High temperature is second in the cycle
-                            self.increment_cycle_counter()
-                            # Apply any pending temp updates at the cycle boundary
-                            if self.pending_update:
-                                low_temp = self.pending_low_temp
-                                high_temp = self.pending_high_temp
-                                self.current_low_temp = low_temp
-                                self.current_high_temp = high_temp
-                                self.pending_update = False
-                                # Reflect the new active temps in the UI
-                                try:
-                                    self.low_temp_var.set(str(low_temp))
-                                    self.high_temp_var.set(str(high_temp))
-                                except Exception:
-                                    pass
-                                self.log_message(f"Applied new temperatures for next cycle: Low={low_temp}°F, High={high_temp}°F")
-                        
-        except Exception as e:
-            self.log_message(f"An error occurred: {e}")
-        finally:
-            # Reset UI state after worker exits
-            try:
-                self.root.after(0, self._on_worker_exit_ui_reset)
-            except Exception:
-                pass
+    def show_temperatures(self, low, high):
+        self.ui.set_variable(self.low_temp_var, str(low))
+        self.ui.set_variable(self.high_temp_var, str(high))
+
+    def on_cycling_stopped(self):
+        self.ui.call(self._on_worker_exit_ui_reset)
+
+    def offer_resume(self):
+        """Ask whether to pick up a run that ended without a Stop (Tk thread)"""
+        saved = self.saved_checkpoint()
+        if saved is None:
+            return
+        checkpoint, where = saved
+        if messagebox.askyesno("Resume cycling",
+                               f"{self.chamber_name or self.chamber_resource} was cycling when the program "
+                               f"last stopped (checkpoint saved {checkpoint.get('saved_at', 'earlier')}).\n\n"
+                               f"Last position: {where}.\n\nResume from there?",
+                               parent=self.root):
+            self.resume_run(checkpoint)
+        else:
+            self.checkpoint_store.clear()
+            self.log_message("Previous run's checkpoint discarded")
+
+    def resume_run(self, checkpoint):
+        # start_cycling reads the entries, so they are set first
+        if not checkpoint.get("profile"):
+            self.low_temp_var.set(str(checkpoint["low_temp"]))
+            self.high_temp_var.set(str(checkpoint["high_temp"]))
+        if checkpoint.get("hold_seconds"):
+            self.hold_time_var.set(f"{checkpoint['hold_seconds'] / 60:g}")
+        return super().resume_run(checkpoint)
 
-            # Enhanced chamber shutdown
-            if self.is_connected:
-                shutdown_attempts = 0
-                while shutdown_attempts < 3:
-                    if self.gpib_wrt_with_retry("W 2000, 0"):
-                        self.log_message("Chamber turned off.")
-                        break
-                    shutdown_attempts += 1
-                    if shutdown_attempts < 3:
-                        self.log_message(f"Failed to turn off chamber, attempt {shutdown_attempts}/3")
-                        time.sleep(2)
-                    else:
-                        self.log_message("Warning: Could not confirm chamber was turned off after 3 attempts.")
-            
-            # Reset UI state
-            self.cycling_status_label.config(text="Stopped")
-            self.target_temp_label.config(text="--°F")
-            self.timer_label.config(text="--:--")
-            self.current_phase_label.config(text="--")
-            self.transition_timer_label.config(text="--:--")
-            self.start_button.config(state="normal")
-            self.stop_button.config(state="disabled")
-            self.stop_cycling = False
     # ===== Deferred Temperature Update Helpers =====
     def _set_temp_fields_state(self, editable: bool):
         state = "normal" if editable else "disabled"
@@ -1136,6 +417,11 @@ class TempCycleGUI:
         if low >= high:
             self.log_message("Low must be less than High.")
             return
+        try:
+            CycleProfile.two_point(low, high).validate(self.min_temp, self.max_temp)
+        except ProfileError as e:
+            self.log_message(str(e))
+            return
         self.pending_low_temp = low
         self.pending_high_temp = high
         self.pending_update = True
@@ -1159,37 +445,24 @@ class TempCycleGUI:
 
 
     def start_cycling(self):
-        if not self.is_connected:
-            self.log_message("Error: Not connected to device. Attempting reconnection...")
-            if not self.reconnect_device():
-                self.log_message("Cannot start cycling - no device connection")
-                return
-            
-        self.stop_cycling = False
-        self.cycling_status_label.config(text="Running")
-        self.start_button.config(state="disabled")
-        self.stop_button.config(state="normal")
         # Capture authoritative temps and lock fields; enable Update
         try:
             self.current_low_temp = float(self.low_temp_var.get())
             self.current_high_temp = float(self.high_temp_var.get())
         except ValueError:
             self.log_message("Invalid starting temperatures.")
-            return
+            return False
+        if not super().start_cycling():
+            return False
+        self.start_button.config(state="disabled")
+        self.stop_button.config(state="normal")
         self._set_temp_fields_state(False)
         self.update_btn.state(["!disabled"])
         self.apply_btn.grid_remove()
         self.cancel_btn.grid_remove()
         self.update_btn.grid()
-        
-        # Start cycling in a separate thread
-        self.cycling_thread = threading.Thread(target=self.cycling_worker, daemon=True)
-        self.cycling_thread.start()
-        
-    def stop_cycling_func(self):
-        self.stop_cycling = True
-        self.log_message("Stop signal sent. Waiting for current operation to complete...")
-        self.cycling_status_label.config(text="Stopping...")
+        return True
+
     def _on_worker_exit_ui_reset(self):
         try:
             self.start_button.config(state="normal")
@@ -1204,44 +477,172 @@ class TempCycleGUI:
 
         
     def on_closing(self):
-        self.stop_cycling = True
-        if self.cycling_thread and self.cycling_thread.is_alive():
-            self.log_message("Waiting for cycling to stop...")
-            self.cycling_thread.join(timeout=5)
-            
-        if self.is_connected and self.ics_4899a:
-            try:
-                self.gpib_wrt("W 2000, 0")  # Turn chamber off
-            except:
-                pass
-        
-        # Close power supply connection
-        if self.power_supply:
-            try:
-                self.power_supply.close()
-            except:
-                pass
-                
-        if self.ics_4899a:
-            try:
-                self.ics_4899a.close()
-            except:
-                pass
-                
-        if self.rm:
-            try:
-                self.rm.close()
-            except:
-                pass
-            
+        self.shutdown()
+        self.root.destroy()
+
+    def shutdown(self):
+        super().shutdown()
+        self.ui.stop()
+
+
+
+class MultiChamberApp:
+    """Several chambers in one process: one tab per chamber plus an overview tab
+
+    All chambers share one resource manager and one InstrumentBus, so their
+    transactions are scheduled on a single GPIB controller instead of being
+    fought over by separate processes.
+    """
+
+    STATUS_COLUMNS = ("chamber", "address", "connection", "status", "temperature",
+                      "target", "phase", "cycles")
+
+    def __init__(self, root, chamber_configs, resource_manager=None, clock=None, telemetry_options=None,
+                 sampler_options=None, stabilization_options=None, boost_options=None, cycle_profile=None,
+                 ramp_options=None, hub=None, metrics=None, tracer=None):
+        self.root = root
+        self.root.title("Temperature Cycling Control - Multiple Chambers")
+        self.root.geometry("720x720")
+        self.clock = clock if clock is not None else SystemClock()
+        self.rm = resource_manager if resource_manager is not None else pyvisa.ResourceManager()
+        self.bus = InstrumentBus("GPIB0", tracer=tracer, clock=self.clock)
+        self.bus.start()
+        self.chambers = []
+        
+        self.notebook = ttk.Notebook(root)
+        self.notebook.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        root.columnconfigure(0, weight=1)
+        root.rowconfigure(0, weight=1)
+        
+        overview = ttk.Frame(self.notebook, padding="10")
+        self.notebook.add(overview, text="Overview")
+        self.status_tree = ttk.Treeview(overview, columns=self.STATUS_COLUMNS, show="headings", height=12)
+        for column in self.STATUS_COLUMNS:
+            self.status_tree.heading(column, text=column.title())
+            self.status_tree.column(column, width=85, anchor=tk.W)
+        self.status_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        overview.columnconfigure(0, weight=1)
+        overview.rowconfigure(0, weight=1)
+        
+        for config in chamber_configs:
+            name = config["name"]
+            tab = ttk.Frame(self.notebook)
+            self.notebook.add(tab, text=name)
+            chamber = TempCycleGUI(
+                root, self.rm, self.clock, parent=tab, bus=self.bus, chamber_name=name,
+                resource_name=config["resource"],
+                power_supply_resource=config.get("power_supply"),
+                profile=config, telemetry_options=telemetry_options, sampler_options=sampler_options,
+                stabilization_options=stabilization_options, boost_options=boost_options,
+                cycle_profile=config.get("cycle_profile", cycle_profile), ramp_options=ramp_options, hub=hub,
+                metrics=metrics, tracer=tracer,
+            )
+            self.chambers.append(chamber)
+            self.status_tree.insert("", tk.END, iid=name, values=(name, config["resource"]))
+        
+        self.refresh_overview()
+
+    def refresh_overview(self):
+        """Copy each chamber's status into the overview table once a second"""
+        for chamber in self.chambers:
+            state = chamber.run_state.snapshot()
+            self.status_tree.item(chamber.chamber_name, values=(
+                chamber.chamber_name,
+                chamber.chamber_resource,
+                "Connected" if chamber.is_connected else "Disconnected",
+                state.status,
+                f"{state.current_temp}°F" if state.current_temp is not None else "--",
+                f"{state.target}°F" if state.target is not None else "--",
+                state.phase,
+                state.cycle_count,
+            ))
+        self.root.after(1000, self.refresh_overview)
+
+    def on_closing(self):
+        for chamber in self.chambers:
+            chamber.shutdown()
+        self.bus.stop()
+        try:
+            self.rm.close()
+        except:
+            pass
         self.root.destroy()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Temperature Cycling Control")
+    parser.add_argument("--chambers", help="JSON file listing several chambers to run from this process")
+    add_simulation_arguments(parser)
+    add_clock_arguments(parser)
+    add_telemetry_arguments(parser)
+    add_sampler_arguments(parser)
+    add_steady_state_arguments(parser)
+    add_boost_arguments(parser)
+    add_ramp_arguments(parser)
+    add_server_arguments(parser)
+    add_tracing_arguments(parser)
+    parser.add_argument("--profile", help="JSON cycling profile to run instead of the low/high cycle "
+                                           "(see profile.example.json)")
+    args = parser.parse_args()
+    clock = clock_from_args(args)
+    telemetry_options = telemetry_options_from_args(args)
+    sampler_options = sampler_options_from_args(args)
+    stabilization_options = steady_state_options_from_args(args)
+    boost_options = boost_options_from_args(args)
+    ramp_options = ramp_options_from_args(args)
+    cycle_profile = None
+    if args.profile:
+        try:
+            cycle_profile = load_profile(args.profile)
+            cycle_profile.validate()
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not load profile {args.profile}: {e}")
+    if not args.simulate and not isinstance(clock, SystemClock):
+        parser.error("--time-scale and --jump-time require --simulate")
+    if not args.simulate and pyvisa is None:
+        parser.error("pyvisa is not installed; install it or use --simulate")
+    tracer = tracer_from_args(args)
+    hub = server = metrics = None
+    server_options = server_options_from_args(args)
+    if server_options:
+        hub = TelemetryHub()
+        metrics = MetricsRegistry()
+        try:
+            server = TelemetryServer(hub, metrics=metrics, **server_options)
+        except OSError as e:
+            parser.error(f"Could not start the telemetry server: {e}")
+        server.start()
+        print(f"Serving live telemetry at {server.address}")
+    
+    if args.chambers:
+        try:
+            chamber_configs = load_chamber_configs(args.chambers)
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not load chamber list: {e}")
+        root = tk.Tk()
+        app = MultiChamberApp(root, chamber_configs, resource_manager_from_args(args, clock), clock,
+                              telemetry_options, sampler_options, stabilization_options, boost_options,
+                              cycle_profile, ramp_options, hub, metrics, tracer)
+        root.protocol("WM_DELETE_WINDOW", app.on_closing)
+        root.mainloop()
+        if server:
+            server.stop()
+        save_trace(tracer)
+        return
+    
     root = tk.Tk()
-    app = TempCycleGUI(root)
+    app = TempCycleGUI(root, resource_manager_from_args(args, clock), clock,
+                       telemetry_options=telemetry_options, sampler_options=sampler_options,
+                       stabilization_options=stabilization_options, boost_options=boost_options,
+                       cycle_profile=cycle_profile, ramp_options=ramp_options, hub=hub,
+                       metrics=metrics, tracer=tracer)
+    if args.simulate:
+        root.title("Temperature Cycling Control (Simulated Chamber)")
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
+    if server:
+        server.stop()
+    save_trace(tracer)
 
 if __name__ == "__main__":
     main()
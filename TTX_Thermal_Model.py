@@ -0,0 +1,156 @@
+import json
+import math
+import os
+import threading
+from datetime import datetime
+
+DEFAULT_MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thermal_models.json")
+
+HEATING = "heating"
+COOLING = "cooling"
+
+
+class ThermalModel:
+    """Heating and cooling behaviour of one chamber, learned from completed transitions
+
+    Each transition updates two estimates per direction: a first-order time
+    constant (from the log of the distance to the target) and the average
+    rate through each temperature band. Predictions walk the bands between
+    start and target using the learned rates and fall back to the time
+    constant where a band has not been seen yet.
+    """
+
+    def __init__(self, band_width=25.0, smoothing=0.3):
+        self.band_width = band_width  # °F
+        self.smoothing = smoothing    # Weight of the newest transition
+        self.tau = {HEATING: None, COOLING: None}          # seconds
+        self.band_rates = {HEATING: {}, COOLING: {}}       # band index -> °F per minute
+        self.transitions = {HEATING: 0, COOLING: 0}
+
+    def _blend(self, old, new):
+        return new if old is None else (1 - self.smoothing) * old + self.smoothing * new
+
+    def _band(self, temp):
+        return int(math.floor(temp / self.band_width))
+
+    def add_transition(self, direction, samples, target, tolerance=2.5):
+        """Learn from one finished transition; samples are (time, temperature) pairs"""
+        if len(samples) < 3:
+            return
+        self.transitions[direction] += 1
+
+        # First-order fit: ln|T - target| falls linearly with slope -1/tau
+        points = [(t, math.log(abs(v - target))) for t, v in samples if abs(v - target) > tolerance / 2]
+        if len(points) >= 5:
+            n = len(points)
+            mean_t = sum(t for t, _ in points) / n
+            mean_y = sum(y for _, y in points) / n
+            sxx = sum((t - mean_t) ** 2 for t, _ in points)
+            if sxx > 0:
+                slope = sum((t - mean_t) * (y - mean_y) for t, y in points) / sxx
+                if slope < 0:
+                    self.tau[direction] = self._blend(self.tau[direction], -1 / slope)
+
+        # Rate through each band the transition crossed
+        travel = {}
+        for (t1, v1), (t2, v2) in zip(samples, samples[1:]):
+            if t2 <= t1:
+                continue
+            band = self._band((v1 + v2) / 2)
+            degrees, seconds = travel.get(band, (0.0, 0.0))
+            travel[band] = (degrees + abs(v2 - v1), seconds + (t2 - t1))
+        for band, (degrees, seconds) in travel.items():
+            if seconds >= 30 and degrees > 0:
+                rates = self.band_rates[direction]
+                rates[band] = self._blend(rates.get(band), degrees / seconds * 60)
+
+    def predict(self, start, target, tolerance=2.5):
+        """Seconds to get from start to within tolerance of target, or None before any data"""
+        distance = abs(target - start)
+        if distance <= tolerance:
+            return 0.0
+        direction = HEATING if target > start else COOLING
+        stop = target - tolerance if direction == HEATING else target + tolerance
+        rates = self.band_rates[direction]
+        tau = self.tau[direction]
+        if not rates and tau is None:
+            return None
+
+        # Walk the bands from start to stop
+        seconds = 0.0
+        temp = start
+        while abs(stop - temp) > 1e-9:
+            if direction == HEATING:
+                band = self._band(temp)
+                next_temp = min((band + 1) * self.band_width, stop)
+            else:
+                band = math.ceil(temp / self.band_width) - 1
+                next_temp = max(band * self.band_width, stop)
+            rate = rates.get(band)
+            if rate:
+                seconds += abs(next_temp - temp) / rate * 60
+            elif tau is not None:
+                # Time for a first-order response to cover this stretch
+                seconds += tau * math.log(abs(temp - target) / abs(next_temp - target))
+            else:
+                return None
+            temp = next_temp
+        return seconds
+
+    def to_dict(self):
+        return {
+            "band_width": self.band_width,
+            "tau": {k: round(v, 2) if v is not None else None for k, v in self.tau.items()},
+            "band_rates": {d: {str(b): round(r, 4) for b, r in sorted(rates.items())}
+                           for d, rates in self.band_rates.items()},
+            "transitions": dict(self.transitions),
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def load_dict(self, data):
+        """Start from previously learned values"""
+        self.band_width = float(data.get("band_width", self.band_width))
+        for direction in (HEATING, COOLING):
+            tau = data.get("tau", {}).get(direction)
+            self.tau[direction] = float(tau) if tau is not None else None
+            self.band_rates[direction] = {int(b): float(r)
+                                          for b, r in data.get("band_rates", {}).get(direction, {}).items()}
+            self.transitions[direction] = int(data.get("transitions", {}).get(direction, 0))
+
+
+class ThermalModelStore:
+    """JSON file holding the learned thermal model of each chamber, keyed by resource name"""
+
+    # Shared by every store so chambers in one process never interleave read-modify-write
+    _lock = threading.Lock()
+
+    def __init__(self, path=DEFAULT_MODEL_FILE):
+        self.path = path
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, key, **model_options):
+        """Model for key, seeded from the last saved session"""
+        model = ThermalModel(**model_options)
+        with self._lock:
+            data = self._read().get(key)
+        if data:
+            try:
+                model.load_dict(data)
+            except (TypeError, ValueError, AttributeError):
+                pass
+        return model
+
+    def save(self, key, model):
+        with self._lock:
+            models = self._read()
+            models[key] = model.to_dict()
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(models, f, indent=2)
+            os.replace(tmp_path, self.path)
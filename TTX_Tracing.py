@@ -0,0 +1,175 @@
+import collections
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.category, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Timeline of bus transactions, sleeps, retries and UI updates, for a trace viewer
+
+    span() times a block on the calling thread and instant() marks a moment.
+    Timestamps are real time (perf_counter), even under a VirtualClock, so
+    the trace shows where the process actually spends its time. The newest
+    max_events are kept in memory; save() writes them in the Chrome trace
+    event format, which ui.perfetto.dev and chrome://tracing open directly.
+    A disabled tracer records nothing and costs one attribute check per span.
+    """
+
+    def __init__(self, path=None, enabled=True, max_events=200000):
+        self.path = path
+        self.enabled = enabled
+        self.events = collections.deque(maxlen=max_events)
+        self._thread_names = {}
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def span(self, name, category, **args):
+        """Context manager recording one complete event"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def instant(self, name, category, **args):
+        if self.enabled:
+            now = time.perf_counter()
+            self.record(name, category, now, None, args)
+
+    def record(self, name, category, start, end, args=None):
+        """Add an event from perf_counter() readings; end None marks an instant"""
+        thread = threading.current_thread()
+        tid = thread.ident
+        if tid not in self._thread_names:
+            self._thread_names[tid] = thread.name
+        event = {"name": name, "cat": category, "pid": self._pid, "tid": tid,
+                 "ts": round((start - self._origin) * 1e6, 3)}
+        if end is None:
+            event.update(ph="i", s="t")
+        else:
+            event.update(ph="X", dur=round((end - start) * 1e6, 3))
+        if args:
+            event["args"] = args
+        self.events.append(event)  # deque.append is atomic, so no lock on the hot path
+
+    def trace_events(self):
+        """Recorded events plus the thread names, as a list of Chrome trace events"""
+        events = list(self.events)
+        names = [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in list(self._thread_names.items())]
+        return names + events
+
+    def save(self, path=None):
+        """Write the trace as JSON; returns the path written, or None with nowhere to write"""
+        path = path or self.path
+        if not path:
+            return None
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+        os.replace(tmp_path, path)
+        return path
+
+
+NULL_TRACER = Tracer(enabled=False, max_events=1)
+
+
+def traced(category, name=None):
+    """Method decorator: record each call as a span on self.tracer
+
+    The first positional argument is added to the span when it is a short
+    value such as a GPIB command or a temperature.
+    """
+    def decorate(method):
+        span_name = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer = self.tracer
+            if not tracer.enabled:
+                return method(self, *args, **kwargs)
+            detail = {"arg": args[0]} if args and isinstance(args[0], (str, int, float)) else {}
+            with tracer.span(span_name, category, **detail):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class TracingClock:
+    """A clock whose sleeps are recorded as spans, named after the function that slept"""
+
+    def __init__(self, clock, tracer):
+        self.clock = clock
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        return getattr(self.clock, name)
+
+    def sleep(self, seconds):
+        code = sys._getframe(1).f_code
+        caller = getattr(code, "co_qualname", code.co_name)  # Qualified names need Python 3.11
+        with self.tracer.span("sleep", "sleep", seconds=seconds, caller=caller):
+            self.clock.sleep(seconds)
+
+
+def add_tracing_arguments(parser):
+    """Add tracing options to an argparse parser"""
+    group = parser.add_argument_group("tracing")
+    group.add_argument("--trace", metavar="FILE",
+                       help="Record bus transactions, sleeps, retries and UI updates and write them to FILE "
+                            "on exit (Chrome trace JSON: open in ui.perfetto.dev or chrome://tracing)")
+    group.add_argument("--trace-max-events", type=int, default=200000,
+                       help="Events kept in memory; the oldest are dropped first (default 200000)")
+    return group
+
+
+def save_trace(tracer):
+    """Write the trace at the end of a run and say where it went; tracer may be None"""
+    if tracer is None:
+        return
+    try:
+        path = tracer.save()
+        print(f"Trace written to {path} ({len(tracer.events)} events)")
+    except OSError as e:
+        print(f"Could not write trace: {e}")
+
+
+def tracer_from_args(args):
+    """A Tracer writing to --trace, or None when tracing is off"""
+    if not args.trace:
+        return None
+    return Tracer(args.trace, max_events=args.trace_max_events)
@@ -0,0 +1,87 @@
+import queue
+
+from TTX_Tracing import NULL_TRACER, traced
+
+
+class UIChannel:
+    """Widget updates published from any thread and applied on the Tk thread
+
+    update() and set_variable() only queue the change. Every interval_ms the
+    Tk thread drains the queue, keeps the latest value per widget option (or
+    variable), and applies only values that differ from what is showing, so
+    a chatty engine costs one redraw per widget per tick at most. call()
+    queues a function instead, run in order after that tick's updates.
+    """
+
+    def __init__(self, root, interval_ms=100, tracer=None):
+        self.root = root
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.interval_ms = interval_ms
+        self.applied = 0    # Option changes pushed to widgets
+        self.coalesced = 0  # Queued changes dropped as superseded or unchanged
+        self._queue = queue.SimpleQueue()
+        self._calls = queue.SimpleQueue()
+        self._after_id = None
+
+    def update(self, widget, **options):
+        """Queue widget.config(**options); safe from any thread"""
+        self._queue.put((widget, options, False))
+
+    def set_variable(self, variable, value):
+        """Queue variable.set(value); safe from any thread"""
+        self._queue.put((variable, {"value": value}, True))
+
+    def call(self, func):
+        """Queue func() to run on the Tk thread; safe from any thread"""
+        self._calls.put(func)
+
+    def start(self):
+        self._drain()
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    @traced("ui", "ui drain")
+    def _drain(self):
+        latest = {}
+        received = 0
+        while True:
+            try:
+                target, options, is_variable = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            received += 1
+            # Keyed by id(): Tk variables define __eq__ and are not hashable
+            latest.setdefault(id(target), (target, is_variable, {}))[2].update(options)
+        applied = 0
+        for target, is_variable, options in latest.values():
+            try:
+                if is_variable:
+                    if target.get() != options["value"]:
+                        target.set(options["value"])
+                        applied += 1
+                    continue
+                changes = {key: value for key, value in options.items()
+                           if str(target.cget(key)) != str(value)}
+                if changes:
+                    target.config(**changes)
+                    applied += len(changes)
+            except Exception:
+                pass  # Widget destroyed while closing
+        self.applied += applied
+        self.coalesced += max(0, received - applied)
+        while True:
+            try:
+                func = self._calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func()
+            except Exception:
+                pass  # Window destroyed while closing
+        self._after_id = self.root.after(self.interval_ms, self._drain)